@@ -0,0 +1,6 @@
+"""Benchmarks of the order DAOs, services and HTTP endpoints.
+
+Run them against a disposable database with::
+
+    PYTHONPATH=src python -m benchmarks.run --orders 10000
+"""
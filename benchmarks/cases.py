@@ -0,0 +1,337 @@
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+import httpx
+from fastapi import Request
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from .config import BenchmarkConfig
+from .harness import Operation
+from .seed import Dataset
+from layered_architecture.dao.concrete import SQLOrderDAO
+from layered_architecture.db.depends import get_db
+from layered_architecture.dto import (
+    OrderCreateInternalDTO,
+    OrderInputDTO,
+    OrderUpdateDTO,
+    OrderUpdateInternalDTO,
+)
+from layered_architecture.dto.order import OrderItemInputDTO
+from layered_architecture.enums import OrderStatus, ServiceType
+from layered_architecture.factories import OrderServiceFactory
+from layered_architecture.main import app
+from layered_architecture.services.concrete.fake_auth import FakeAuthService
+
+
+@dataclass
+class BenchmarkContext:
+    """Everything a benchmark case needs to build its operation."""
+
+    config: BenchmarkConfig
+    engine: AsyncEngine
+    sessions: async_sessionmaker[AsyncSession]
+    dataset: Dataset
+    rng: random.Random
+    client: Optional[httpx.AsyncClient] = None
+
+    def order_input(self, service_type: ServiceType) -> OrderInputDTO:
+        """Build a valid order input for a service type.
+
+        :param service_type: The service type of the order
+        :type service_type: ServiceType
+        :return: The order input
+        :rtype: OrderInputDTO
+        """
+        return OrderInputDTO(
+            service_type=service_type,
+            items=[
+                OrderItemInputDTO(**item)
+                for item in self.dataset.items(
+                    self.rng, self.config.items_per_order
+                )
+            ],
+            notes="Benchmark order",
+            delivery_address=(
+                "123 Main St" if service_type == ServiceType.DELIVERY else None
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A named operation to measure."""
+
+    name: str
+    group: str
+    build: Callable[[BenchmarkContext], Operation]
+    # Cap for operations too slow to repeat the configured number of times
+    max_iterations: Optional[int] = None
+
+
+@asynccontextmanager
+async def rolled_back(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    """Open a session whose writes are undone on exit.
+
+    The session joins an outer transaction and its commits only release
+    savepoints, so writes leave the data volumes as seeded and every case
+    measures the same dataset. The final COMMIT is not measured.
+
+    :param engine: The benchmark database engine
+    :type engine: AsyncEngine
+    :yield: The session
+    :rtype: AsyncIterator[AsyncSession]
+    """
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            async with AsyncSession(
+                bind=conn,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint",
+            ) as session:
+                yield session
+        finally:
+            await transaction.rollback()
+
+
+def _internal(
+    ctx: BenchmarkContext, service_type: ServiceType
+) -> OrderCreateInternalDTO:
+    order_input = ctx.order_input(service_type)
+    return OrderCreateInternalDTO(
+        **order_input.model_dump(),
+        customer_id=ctx.dataset.customer_id,
+        subtotal=Decimal("10.00"),
+        total=Decimal("10.00"),
+        customer_email="bench@example.com",
+    )
+
+
+def dao_create(ctx: BenchmarkContext) -> Operation:
+    async def operation() -> None:
+        async with rolled_back(ctx.engine) as session:
+            await SQLOrderDAO(session).create(
+                _internal(ctx, ServiceType.TAKEAWAY)
+            )
+
+    return operation
+
+
+def dao_get_by_id(ctx: BenchmarkContext) -> Operation:
+    async def operation() -> None:
+        order_id = ctx.dataset.pick_order(ctx.rng, ServiceType.DINE_IN)
+        async with ctx.sessions() as session:
+            await SQLOrderDAO(session).get_by_id(order_id)
+
+    return operation
+
+
+def dao_get_all(ctx: BenchmarkContext) -> Operation:
+    async def operation() -> None:
+        async with ctx.sessions() as session:
+            await SQLOrderDAO(session).get_all(status=OrderStatus.PENDING)
+
+    return operation
+
+
+def dao_update(ctx: BenchmarkContext) -> Operation:
+    async def operation() -> None:
+        order_id = ctx.dataset.pick_order(ctx.rng, ServiceType.TAKEAWAY)
+        created = _internal(ctx, ServiceType.TAKEAWAY)
+        update = OrderUpdateInternalDTO(
+            **created.model_dump(), status=OrderStatus.PENDING
+        )
+        async with rolled_back(ctx.engine) as session:
+            await SQLOrderDAO(session).update(order_id, update)
+
+    return operation
+
+
+def service_create(service_type: ServiceType) -> Callable[..., Operation]:
+    def build(ctx: BenchmarkContext) -> Operation:
+        async def operation() -> None:
+            user = await FakeAuthService.get_current_user()
+            async with rolled_back(ctx.engine) as session:
+                service = OrderServiceFactory(
+                    session
+                ).get_service_by_service_type(service_type)
+                await service.create_order(ctx.order_input(service_type), user)
+
+        return operation
+
+    return build
+
+
+def service_check_status(
+    service_type: ServiceType,
+) -> Callable[..., Operation]:
+    def build(ctx: BenchmarkContext) -> Operation:
+        async def operation() -> None:
+            user = await FakeAuthService.get_current_user()
+            order_id = ctx.dataset.pick_order(ctx.rng, service_type)
+            async with ctx.sessions() as session:
+                service = await OrderServiceFactory(
+                    session, read_only=True
+                ).get_service_by_order_id(order_id)
+                await service.check_status(order_id, user)
+
+        return operation
+
+    return build
+
+
+def _update_input(
+    ctx: BenchmarkContext, service_type: ServiceType
+) -> OrderUpdateDTO:
+    return OrderUpdateDTO(
+        **ctx.order_input(service_type).model_dump(),
+        status=OrderStatus.PENDING,
+    )
+
+
+def service_update(service_type: ServiceType) -> Callable[..., Operation]:
+    def build(ctx: BenchmarkContext) -> Operation:
+        async def operation() -> None:
+            user = await FakeAuthService.get_current_user()
+            order_id = ctx.dataset.pick_order(ctx.rng, service_type)
+            async with rolled_back(ctx.engine) as session:
+                service = await OrderServiceFactory(
+                    session
+                ).get_service_by_order_id(order_id)
+                await service.update_order(
+                    order_id, _update_input(ctx, service_type), user
+                )
+
+        return operation
+
+    return build
+
+
+def http_create(service_type: ServiceType) -> Callable[..., Operation]:
+    def build(ctx: BenchmarkContext) -> Operation:
+        async def operation() -> None:
+            assert ctx.client is not None
+            response = await ctx.client.post(
+                "/v1/orders/",
+                json=ctx.order_input(service_type).model_dump(mode="json"),
+            )
+            response.raise_for_status()
+
+        return operation
+
+    return build
+
+
+def http_check_status(ctx: BenchmarkContext) -> Operation:
+    async def operation() -> None:
+        assert ctx.client is not None
+        order_id = ctx.dataset.pick_order(ctx.rng, ServiceType.DELIVERY)
+        response = await ctx.client.get(f"/v1/orders/{order_id}/")
+        response.raise_for_status()
+
+    return operation
+
+
+def http_update(ctx: BenchmarkContext) -> Operation:
+    async def operation() -> None:
+        assert ctx.client is not None
+        order_id = ctx.dataset.pick_order(ctx.rng, ServiceType.DINE_IN)
+        response = await ctx.client.patch(
+            f"/v1/orders/{order_id}/",
+            json=_update_input(ctx, ServiceType.DINE_IN).model_dump(
+                mode="json"
+            ),
+        )
+        response.raise_for_status()
+
+    return operation
+
+
+def all_cases() -> List[BenchmarkCase]:
+    """Get every benchmark case.
+
+    :return: The cases, grouped by layer
+    :rtype: List[BenchmarkCase]
+    """
+    cases = [
+        BenchmarkCase("dao.order.create", "dao", dao_create),
+        BenchmarkCase("dao.order.get_by_id", "dao", dao_get_by_id),
+        # Loads every pending order, so a few runs are enough
+        BenchmarkCase("dao.order.get_all", "dao", dao_get_all, 5),
+        BenchmarkCase("dao.order.update", "dao", dao_update),
+    ]
+    for service_type in ServiceType:
+        prefix = f"service.{service_type.value}"
+        cases += [
+            BenchmarkCase(
+                f"{prefix}.create_order",
+                "service",
+                service_create(service_type),
+            ),
+            BenchmarkCase(
+                f"{prefix}.check_status",
+                "service",
+                service_check_status(service_type),
+            ),
+            BenchmarkCase(
+                f"{prefix}.update_order",
+                "service",
+                service_update(service_type),
+            ),
+        ]
+    cases += [
+        BenchmarkCase(
+            f"http.create_order.{service_type.value}",
+            "http",
+            http_create(service_type),
+        )
+        for service_type in ServiceType
+    ]
+    cases += [
+        BenchmarkCase("http.check_status", "http", http_check_status),
+        BenchmarkCase("http.update_order", "http", http_update),
+    ]
+    return cases
+
+
+@asynccontextmanager
+async def asgi_client(
+    engine: AsyncEngine, sessions: async_sessionmaker[AsyncSession]
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Serve the application in process, on the benchmark database.
+
+    Requests that write get sessions that are rolled back, like the other
+    cases. Reads get plain sessions: their read-only transactions cannot
+    join the outer transaction of a rolled back session.
+
+    :param engine: The benchmark database engine
+    :type engine: AsyncEngine
+    :param sessions: Factory of the sessions serving reads
+    :type sessions: async_sessionmaker[AsyncSession]
+    :yield: A client calling the application without a network hop
+    :rtype: AsyncIterator[httpx.AsyncClient]
+    """
+
+    async def benchmark_db(request: Request) -> AsyncIterator[Any]:
+        if request.method == "GET":
+            async with sessions() as session:
+                yield session
+            return
+        async with rolled_back(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = benchmark_db
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,279 @@
+import json
+import random
+import statistics
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import typer
+
+from .harness import percentile
+
+app = typer.Typer(
+    name="compare-benchmarks",
+    help="Compare benchmark results against a baseline",
+    add_completion=False,
+)
+
+Runs = Dict[str, List[Dict[str, Any]]]
+
+# Latency metrics are compared on the pooled samples, so they get a
+# bootstrap confidence interval; the others are compared by their median
+LATENCY_METRICS = {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+MEDIAN_METRICS: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    "queries": lambda result: result["queries_per_op"],
+    "allocations": lambda result: result["allocated_bytes_per_op"],
+    "mean": lambda result: result["latency_ms"]["mean"],
+}
+DEFAULT_METRICS = ["p50", "p95", "queries", "allocations"]
+
+
+@dataclass
+class Comparison:
+    """Change of one metric of one benchmark against its baseline."""
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    # Bounds of the confidence interval of current / baseline, if any
+    ci: Optional[Tuple[float, float]]
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        """Current value relative to the baseline."""
+        if self.baseline == 0:
+            return 1.0 if self.current == 0 else float("inf")
+        return self.current / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        """Whether the metric got worse by more than the threshold.
+
+        With a confidence interval, the whole interval must also be above
+        no change, so noise alone does not fail the comparison.
+        """
+        if self.ratio <= 1 + self.threshold:
+            return False
+        return self.ci is None or self.ci[0] > 1.0
+
+    @property
+    def improved(self) -> bool:
+        """Whether the metric got better by more than the threshold."""
+        if self.ratio >= 1 - self.threshold:
+            return False
+        return self.ci is None or self.ci[1] < 1.0
+
+
+def load_runs(paths: Sequence[str]) -> Runs:
+    """Load benchmark result files, grouping the runs of each benchmark.
+
+    :param paths: Result files written by ``benchmarks.run``
+    :type paths: Sequence[str]
+    :return: The results of every run, per benchmark name
+    :rtype: Runs
+    """
+    runs: Runs = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            document = json.load(file)
+        for result in document["results"]:
+            runs.setdefault(result["name"], []).append(result)
+    return runs
+
+
+def bootstrap_ratio_ci(
+    baseline: Sequence[float],
+    current: Sequence[float],
+    q: float,
+    confidence: float = 0.95,
+    resamples: int = 1000,
+    seed: int = 0,
+) -> Tuple[float, float]:
+    """Bootstrap a confidence interval of the ratio of two percentiles.
+
+    :param baseline: Baseline latency samples
+    :type baseline: Sequence[float]
+    :param current: Current latency samples
+    :type current: Sequence[float]
+    :param q: The percentile compared, between 0 and 100
+    :type q: float
+    :param confidence: The confidence level of the interval
+    :type confidence: float
+    :param resamples: How many bootstrap resamples to draw
+    :type resamples: int
+    :param seed: Seed of the resampling, for reproducible reports
+    :type seed: int
+    :return: Lower and upper bounds of current / baseline
+    :rtype: Tuple[float, float]
+    """
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        base = percentile(rng.choices(baseline, k=len(baseline)), q)
+        cur = percentile(rng.choices(current, k=len(current)), q)
+        ratios.append(cur / base if base else float("inf"))
+    alpha = (1 - confidence) / 2 * 100
+    return percentile(ratios, alpha), percentile(ratios, 100 - alpha)
+
+
+def compare(
+    baseline: Runs,
+    current: Runs,
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    threshold: float = 0.1,
+    confidence: float = 0.95,
+    resamples: int = 1000,
+) -> List[Comparison]:
+    """Compare the benchmarks present in both the baseline and the current.
+
+    :param baseline: Baseline runs, per benchmark
+    :type baseline: Runs
+    :param current: Current runs, per benchmark
+    :type current: Runs
+    :param metrics: The metrics to compare
+    :type metrics: Sequence[str]
+    :param threshold: Relative change tolerated, e.g. 0.1 for 10%
+    :type threshold: float
+    :param confidence: The confidence level of the latency intervals
+    :type confidence: float
+    :param resamples: How many bootstrap resamples to draw
+    :type resamples: int
+    :return: One comparison per benchmark and metric
+    :rtype: List[Comparison]
+    """
+    comparisons = []
+    for name in sorted(baseline.keys() & current.keys()):
+        for metric in metrics:
+            if metric in LATENCY_METRICS:
+                q = LATENCY_METRICS[metric]
+                base = [s for run in baseline[name] for s in run["samples_ms"]]
+                cur = [s for run in current[name] for s in run["samples_ms"]]
+                if not base or not cur:
+                    continue
+                comparisons.append(
+                    Comparison(
+                        name=name,
+                        metric=metric,
+                        baseline=statistics.median(
+                            run["latency_ms"][metric] for run in baseline[name]
+                        ),
+                        current=statistics.median(
+                            run["latency_ms"][metric] for run in current[name]
+                        ),
+                        ci=bootstrap_ratio_ci(
+                            base, cur, q, confidence, resamples
+                        ),
+                        threshold=threshold,
+                    )
+                )
+            elif metric in MEDIAN_METRICS:
+                value = MEDIAN_METRICS[metric]
+                comparisons.append(
+                    Comparison(
+                        name=name,
+                        metric=metric,
+                        baseline=statistics.median(map(value, baseline[name])),
+                        current=statistics.median(map(value, current[name])),
+                        ci=None,
+                        threshold=threshold,
+                    )
+                )
+            else:
+                raise ValueError(f"Unsupported metric: {metric}")
+    return comparisons
+
+
+def render(
+    comparisons: Sequence[Comparison], missing: Sequence[str] = ()
+) -> str:
+    """Render comparisons as a report, regressions first.
+
+    :param comparisons: The comparisons
+    :type comparisons: Sequence[Comparison]
+    :param missing: Baseline benchmarks absent from the current results
+    :type missing: Sequence[str]
+    :return: The report
+    :rtype: str
+    """
+    ordered = sorted(
+        comparisons, key=lambda c: (not c.regressed, -c.ratio, c.name)
+    )
+    width = max([len("benchmark")] + [len(c.name) for c in ordered])
+    lines = [
+        f"{'benchmark':<{width}}  {'metric':<11}  {'baseline':>11}  "
+        f"{'current':>11}  {'change':>8}  {'CI':>17}  verdict"
+    ]
+    for c in ordered:
+        ci = f"[{c.ci[0]:.2f}x, {c.ci[1]:.2f}x]" if c.ci else "-"
+        verdict = (
+            "REGRESSED" if c.regressed else "improved" if c.improved else "ok"
+        )
+        lines.append(
+            f"{c.name:<{width}}  {c.metric:<11}  {c.baseline:>11.3f}  "
+            f"{c.current:>11.3f}  {(c.ratio - 1) * 100:>+7.1f}%  "
+            f"{ci:>17}  {verdict}"
+        )
+    for name in missing:
+        lines.append(f"{name:<{width}}  missing from the current results")
+    regressions = sum(c.regressed for c in comparisons)
+    lines.append(
+        f"{regressions} regression(s) in {len(comparisons)} comparisons"
+    )
+    return "\n".join(lines)
+
+
+@app.command()
+def compare_benchmarks(
+    baseline: List[str] = typer.Option(
+        ..., "--baseline", "-b", help="Baseline result files, one per run"
+    ),
+    current: List[str] = typer.Option(
+        ..., "--current", "-c", help="Current result files, one per run"
+    ),
+    metric: List[str] = typer.Option(
+        DEFAULT_METRICS,
+        "--metric",
+        "-m",
+        help="Metrics to gate: p50, p95, p99, mean, queries, allocations",
+    ),
+    threshold: float = typer.Option(
+        10.0, "--threshold", "-t", help="Tolerated regression in percent"
+    ),
+    confidence: float = typer.Option(
+        0.95, help="Confidence level of the latency intervals"
+    ),
+    allow_missing: bool = typer.Option(
+        False, help="Pass when baseline benchmarks are missing from current"
+    ),
+) -> None:
+    """Fail when a benchmark regressed past the threshold.
+
+    Pass several result files per side to compare medians of N runs. A
+    baseline benchmark missing from the current results, because it
+    crashed or was renamed, also fails unless ``--allow-missing`` is set.
+    """
+    baseline_runs = load_runs(baseline)
+    current_runs = load_runs(current)
+    comparisons = compare(
+        baseline_runs,
+        current_runs,
+        metrics=metric,
+        threshold=threshold / 100,
+        confidence=confidence,
+    )
+    missing = sorted(baseline_runs.keys() - current_runs.keys())
+    typer.echo(render(comparisons, missing))
+    if any(c.regressed for c in comparisons):
+        sys.exit(1)
+    if missing and not allow_missing:
+        typer.echo(
+            f"{len(missing)} benchmark(s) missing from the current results",
+            err=True,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
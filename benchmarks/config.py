@@ -0,0 +1,23 @@
+import os
+from dataclasses import dataclass
+
+from layered_architecture.config.settings import settings
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """Data volumes and measurement parameters of a benchmark run."""
+
+    # The schema of this database is dropped and recreated
+    database_url: str = os.environ.get(
+        "BENCHMARK_DATABASE_URL", settings.TEST_DATABASE_URL
+    )
+    menu_size: int = 50
+    orders: int = 1000
+    items_per_order: int = 3
+    iterations: int = 200
+    warmup: int = 20
+    concurrency: int = 1
+    seed: int = 42
@@ -0,0 +1,144 @@
+import asyncio
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+from layered_architecture.observability import track_queries
+
+Operation = Callable[[], Awaitable[Any]]
+
+ALLOCATION_SAMPLES = 20
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Get a percentile of samples by the nearest-rank method.
+
+    :param samples: The samples
+    :type samples: Sequence[float]
+    :param q: The percentile, between 0 and 100
+    :type q: float
+    :return: The percentile, 0 without samples
+    :rtype: float
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput, latency, queries and allocations of one benchmark."""
+
+    name: str
+    group: str
+    iterations: int
+    concurrency: int
+    seconds: float
+    throughput: float
+    latency_ms: Dict[str, float]
+    queries_per_op: float
+    allocated_bytes_per_op: float
+    samples_ms: List[float] = field(repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to JSON-serializable data.
+
+        :return: The result
+        :rtype: Dict[str, Any]
+        """
+        return asdict(self)
+
+
+async def _timed(operation: Operation, samples: List[float]) -> None:
+    start = time.perf_counter()
+    await operation()
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+async def _allocated_bytes(operation: Operation, count: int) -> float:
+    # Peak traced memory of each operation, above what it started with
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(count):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks) if peaks else 0.0
+
+
+async def measure(
+    name: str,
+    group: str,
+    operation: Operation,
+    iterations: int,
+    warmup: int,
+    concurrency: int = 1,
+) -> BenchmarkResult:
+    """Run an operation repeatedly and measure it.
+
+    Latency is measured per operation. With ``concurrency`` above one, that
+    many workers share the iterations, so throughput includes contention
+    on the connection pool and the database.
+
+    :param name: The benchmark name
+    :type name: str
+    :param group: The layer benchmarked, such as ``dao`` or ``http``
+    :type group: str
+    :param operation: The operation to run
+    :type operation: Operation
+    :param iterations: How many measured operations to run
+    :type iterations: int
+    :param warmup: How many unmeasured operations to run first
+    :type warmup: int
+    :param concurrency: How many operations run at once
+    :type concurrency: int
+    :return: The measurements
+    :rtype: BenchmarkResult
+    """
+    for _ in range(warmup):
+        await operation()
+
+    samples: List[float] = []
+    remaining = iterations
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await _timed(operation, samples)
+
+    with track_queries(name) as stats:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+
+    allocated = await _allocated_bytes(
+        operation, min(iterations, ALLOCATION_SAMPLES)
+    )
+    return BenchmarkResult(
+        name=name,
+        group=group,
+        iterations=iterations,
+        concurrency=concurrency,
+        seconds=seconds,
+        throughput=iterations / seconds if seconds else 0.0,
+        latency_ms={
+            "mean": statistics.fmean(samples) if samples else 0.0,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+            "max": max(samples, default=0.0),
+        },
+        queries_per_op=stats.count / iterations if iterations else 0.0,
+        allocated_bytes_per_op=allocated,
+        samples_ms=[round(sample, 4) for sample in samples],
+    )
@@ -0,0 +1,537 @@
+import asyncio
+import json
+import logging
+import logging.config
+import math
+import os
+import random
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import httpx
+import typer
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from .config import RESULTS_DIR, BenchmarkConfig
+from .harness import percentile
+from .seed import Dataset, load_dataset, seed
+from layered_architecture.config.settings import settings
+from layered_architecture.enums import OrderStatus, ServiceType
+from layered_architecture.observability import Histogram
+from layered_architecture.observability.metrics import LATENCY_BUCKETS
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="load",
+    help="Generate open-loop load against a running instance",
+    add_completion=False,
+)
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+@dataclass
+class Request:
+    """An HTTP request to issue."""
+
+    method: str
+    path: str
+    json: Optional[Dict[str, Any]] = None
+
+
+# An order id and its service type
+OrderRef = Tuple[str, ServiceType]
+
+# Fields each service type requires on top of the items
+EXTRA_FIELDS: Dict[ServiceType, Dict[str, Any]] = {
+    ServiceType.DELIVERY: {"delivery_address": "221B Baker Street"},
+}
+
+
+@dataclass
+class LoadState:
+    """Data the scenarios draw their requests from.
+
+    Orders created during the run join the polled orders, as customers
+    poll the orders they just placed. Only those orders are updated, so
+    the seeded dataset stays the same from one run to the next.
+    """
+
+    dataset: Dataset
+    rng: random.Random
+    orders: List[OrderRef] = field(default_factory=list)
+    created: List[OrderRef] = field(default_factory=list)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Build the items of a new order.
+
+        :return: Between one and six items from the menu
+        :rtype: List[Dict[str, Any]]
+        """
+        return self.dataset.items(self.rng, self.rng.randint(1, 6))
+
+    def hot_order(self, orders: Optional[List[OrderRef]] = None) -> OrderRef:
+        """Pick an order, favouring the most recent ones.
+
+        :param orders: The orders to pick from, all of them by default
+        :type orders: Optional[List[OrderRef]]
+        :return: The order id and service type
+        :rtype: OrderRef
+        """
+        orders = self.orders if orders is None else orders
+        # Cubing a uniform draw makes a few recent orders take most polls
+        rank = int(len(orders) * self.rng.random() ** 3)
+        return orders[len(orders) - 1 - rank]
+
+    def add_created(self, order_id: str, service_type: ServiceType) -> None:
+        """Record an order created during the run.
+
+        :param order_id: The order id
+        :type order_id: str
+        :param service_type: The order's service type
+        :type service_type: ServiceType
+        """
+        self.orders.append((order_id, service_type))
+        self.created.append((order_id, service_type))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A kind of traffic, as a share of the arrivals."""
+
+    name: str
+    weight: float
+    # Builds the request of an arrival, None to skip it
+    build: Callable[[LoadState], Optional[Request]]
+    # Requests sent together on each arrival, such as a table ordering
+    burst: int = 1
+    expected: FrozenSet[int] = frozenset({200, 201})
+
+
+def _create(service_type: ServiceType) -> Callable[..., Request]:
+    def build(state: LoadState) -> Request:
+        return Request(
+            "POST",
+            "/v1/orders/",
+            {
+                "service_type": service_type.value,
+                "items": state.items(),
+                "notes": None,
+                **EXTRA_FIELDS.get(service_type, {}),
+            },
+        )
+
+    return build
+
+
+def _poll(state: LoadState) -> Request:
+    return Request("GET", f"/v1/orders/{state.hot_order()[0]}/")
+
+
+def _update(state: LoadState) -> Optional[Request]:
+    if not state.created:
+        return None
+    order_id, service_type = state.hot_order(state.created)
+    return Request(
+        "PATCH",
+        f"/v1/orders/{order_id}/",
+        {
+            "service_type": service_type.value,
+            "items": state.items(),
+            "notes": "Extra napkins",
+            "status": OrderStatus.PENDING.value,
+            **EXTRA_FIELDS.get(service_type, {}),
+        },
+    )
+
+
+# The production traffic mix, by share of arrivals
+SCENARIOS = [
+    Scenario("dine_in_burst", 0.1, _create(ServiceType.DINE_IN), burst=4),
+    Scenario("takeaway", 0.1, _create(ServiceType.TAKEAWAY)),
+    Scenario("delivery", 0.15, _create(ServiceType.DELIVERY)),
+    # Refused with a 400 outside of late night hours
+    Scenario(
+        "late_night",
+        0.05,
+        _create(ServiceType.LATE_NIGHT),
+        expected=frozenset({201, 400}),
+    ),
+    Scenario("poll_status", 0.5, _poll),
+    # Refused once the kitchen finished or cancelled the order, and late
+    # night orders outside of late night hours
+    Scenario("update", 0.1, _update, expected=frozenset({200, 400})),
+]
+
+
+def arrival_times(
+    rate: float, duration: float, ramp_up: float, rng: random.Random
+) -> List[float]:
+    """Draw Poisson arrivals whose rate ramps up linearly, then holds.
+
+    :param rate: Arrivals per second once ramped up
+    :type rate: float
+    :param duration: Seconds of load, ramp-up included
+    :type duration: float
+    :param ramp_up: Seconds to ramp the rate up from 0
+    :type ramp_up: float
+    :param rng: The random generator to use
+    :type rng: random.Random
+    :return: Seconds from the start of each arrival, in order
+    :rtype: List[float]
+    """
+    times: List[float] = []
+    # Invert the cumulative arrival rate at unit-rate exponential steps
+    ramp_arrivals = rate * ramp_up / 2
+    cumulative = 0.0
+    while True:
+        cumulative += rng.expovariate(1.0)
+        if cumulative < ramp_arrivals:
+            at = math.sqrt(2 * ramp_up * cumulative / rate)
+        else:
+            at = ramp_up + (cumulative - ramp_arrivals) / rate
+        if at >= duration:
+            return times
+        times.append(at)
+
+
+@dataclass
+class ScenarioStats:
+    """Outcomes and latencies of one scenario."""
+
+    # Seconds from the scheduled start, correcting coordinated omission
+    latencies: List[float] = field(default_factory=list)
+    # Seconds from the actual send, as a closed-loop client would see them
+    service_times: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    unexpected: int = 0
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """Summarize the scenario.
+
+        :param elapsed: Seconds the run lasted
+        :type elapsed: float
+        :return: Counts, rates, latency percentiles and histogram
+        :rtype: Dict[str, Any]
+        """
+        histogram = Histogram(LATENCY_BUCKETS)
+        for latency in self.latencies:
+            histogram.observe(latency)
+        return {
+            "requests": len(self.latencies),
+            "rate": len(self.latencies) / elapsed if elapsed else 0.0,
+            "statuses": {
+                str(status): count for status, count in self.statuses.items()
+            },
+            "unexpected": self.unexpected,
+            "latency_ms": _percentiles(self.latencies),
+            "service_time_ms": _percentiles(self.service_times),
+            "histogram_seconds": {
+                str(bound): count
+                for bound, count in zip(
+                    [*histogram.buckets, "+Inf"], histogram.counts
+                )
+            },
+        }
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    summary = {f"p{q:g}": percentile(ordered, q) * 1000 for q in PERCENTILES}
+    summary["max"] = ordered[-1] * 1000 if ordered else 0.0
+    return summary
+
+
+class LoadGenerator:
+    """Issue scheduled requests without waiting for earlier responses.
+
+    Arrivals follow their schedule whatever the server does, so a slow
+    server builds a queue as it would in production. Latency is measured
+    from the scheduled start of each request, so time spent waiting for a
+    connection or for a late scheduler counts against the server.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        state: LoadState,
+        scenarios: List[Scenario] = SCENARIOS,
+    ) -> None:
+        """Initialize the generator.
+
+        :param client: Client of the target instance
+        :type client: httpx.AsyncClient
+        :param state: Data the scenarios draw their requests from
+        :type state: LoadState
+        :param scenarios: The traffic mix
+        :type scenarios: List[Scenario]
+        """
+        self.client = client
+        self.state = state
+        self.scenarios = scenarios
+        self.stats: Dict[str, ScenarioStats] = {
+            scenario.name: ScenarioStats() for scenario in scenarios
+        }
+
+    def schedule(
+        self, rate: float, duration: float, ramp_up: float
+    ) -> List[Tuple[float, Scenario]]:
+        """Draw the arrivals and their scenarios.
+
+        :param rate: Arrivals per second once ramped up
+        :type rate: float
+        :param duration: Seconds of load, ramp-up included
+        :type duration: float
+        :param ramp_up: Seconds to ramp the rate up from 0
+        :type ramp_up: float
+        :return: Seconds from the start and scenario of each arrival
+        :rtype: List[Tuple[float, Scenario]]
+        """
+        rng = self.state.rng
+        times = arrival_times(rate, duration, ramp_up, rng)
+        weights = [scenario.weight for scenario in self.scenarios]
+        chosen = rng.choices(self.scenarios, weights, k=len(times))
+        return list(zip(times, chosen))
+
+    async def run(
+        self, rate: float, duration: float, ramp_up: float = 0.0
+    ) -> float:
+        """Generate load until the schedule is exhausted and answered.
+
+        :param rate: Arrivals per second once ramped up
+        :type rate: float
+        :param duration: Seconds of load, ramp-up included
+        :type duration: float
+        :param ramp_up: Seconds to ramp the rate up from 0
+        :type ramp_up: float
+        :return: Seconds elapsed
+        :rtype: float
+        """
+        loop = asyncio.get_running_loop()
+        tasks = []
+        start = loop.time()
+        for at, scenario in self.schedule(rate, duration, ramp_up):
+            delay = start + at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            for _ in range(scenario.burst):
+                request = scenario.build(self.state)
+                if request is None:
+                    continue
+                tasks.append(
+                    asyncio.create_task(
+                        self._issue(scenario, request, start + at)
+                    )
+                )
+        await asyncio.gather(*tasks)
+        return loop.time() - start
+
+    async def _issue(
+        self, scenario: Scenario, request: Request, scheduled: float
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        stats = self.stats[scenario.name]
+        sent = loop.time()
+        status: int | str
+        try:
+            response = await self.client.request(
+                request.method, request.path, json=request.json
+            )
+            status = response.status_code
+            if status == 201:
+                order = response.json()
+                self.state.add_created(
+                    order["id"], ServiceType(order["service_type"])
+                )
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finished = loop.time()
+        stats.latencies.append(finished - scheduled)
+        stats.service_times.append(finished - sent)
+        stats.statuses[status] += 1
+        stats.unexpected += status not in scenario.expected
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """Summarize every scenario.
+
+        :param elapsed: Seconds the run lasted
+        :type elapsed: float
+        :return: The summary of each scenario
+        :rtype: Dict[str, Any]
+        """
+        return {
+            name: stats.summary(elapsed) for name, stats in self.stats.items()
+        }
+
+
+def render(report: Dict[str, Any]) -> str:
+    """Render a load or replay report as a table.
+
+    :param report: The summary of each scenario or route
+    :type report: Dict[str, Any]
+    :return: The table
+    :rtype: str
+    """
+    width = max([len("scenario")] + [len(name) for name in report])
+    lines = [
+        f"{'scenario':<{width}} {'requests':>8} {'rate/s':>8} {'bad':>5} "
+        f"{'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8} "
+        f"{'svc p99':>8}"
+    ]
+    for name, summary in report.items():
+        latency = summary["latency_ms"]
+        lines.append(
+            f"{name:<{width}} {summary['requests']:>8} {summary['rate']:>8.1f} "
+            f"{summary['unexpected']:>5} {latency['p50']:>8.1f} "
+            f"{latency['p90']:>8.1f} {latency['p99']:>8.1f} "
+            f"{latency['p99.9']:>8.1f} {latency['max']:>8.1f} "
+            f"{summary['service_time_ms']['p99']:>8.1f}"
+        )
+    lines.append(
+        "Latencies in ms from the scheduled start; svc p99 is measured "
+        "from the actual send"
+    )
+    return "\n".join(lines)
+
+
+async def run_load(
+    target: str,
+    database_url: str,
+    rate: float,
+    duration: float,
+    ramp_up: float,
+    reseed: bool,
+    max_connections: int,
+    timeout: float,
+    random_seed: int,
+) -> Tuple[Dict[str, Any], float]:
+    """Load the dataset and generate load against the target.
+
+    :param target: Base URL of the running instance
+    :type target: str
+    :param database_url: URL of the database the instance serves
+    :type database_url: str
+    :param rate: Arrivals per second once ramped up
+    :type rate: float
+    :param duration: Seconds of load, ramp-up included
+    :type duration: float
+    :param ramp_up: Seconds to ramp the rate up from 0
+    :type ramp_up: float
+    :param reseed: Whether to recreate and seed the database first
+    :type reseed: bool
+    :param max_connections: Connections the client opens at most
+    :type max_connections: int
+    :param timeout: Seconds to wait for a response
+    :type timeout: float
+    :param random_seed: Seed of the arrivals and of the requests
+    :type random_seed: int
+    :return: The report and the seconds elapsed
+    :rtype: Tuple[Dict[str, Any], float]
+    """
+    engine = create_async_engine(database_url)
+    try:
+        if reseed:
+            dataset = await seed(engine, BenchmarkConfig(seed=random_seed))
+        else:
+            dataset = await load_dataset(engine)
+    finally:
+        await engine.dispose()
+    rng = random.Random(random_seed)
+    state = LoadState(
+        dataset=dataset,
+        rng=rng,
+        orders=[
+            (order, service_type)
+            for service_type, orders in dataset.orders.items()
+            for order in orders
+        ],
+    )
+    if not state.orders or not dataset.pizzas or not dataset.beers:
+        raise ValueError("The database has no menu or orders, use --reseed")
+    async with httpx.AsyncClient(
+        base_url=target,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    ) as client:
+        generator = LoadGenerator(client, state)
+        elapsed = await generator.run(rate, duration, ramp_up)
+    return generator.report(elapsed), elapsed
+
+
+@app.command()
+def load(
+    target: str = typer.Option(
+        "http://127.0.0.1:8000", help="Base URL of the running instance"
+    ),
+    database_url: str = typer.Option(
+        settings.DATABASE_URL, help="Database the instance serves"
+    ),
+    rate: float = typer.Option(50.0, help="Arrivals per second"),
+    duration: float = typer.Option(60.0, help="Seconds of load"),
+    ramp_up: float = typer.Option(10.0, help="Seconds to reach the rate"),
+    reseed: bool = typer.Option(
+        False, help="Drop, recreate and seed the database first"
+    ),
+    max_connections: int = typer.Option(100, help="Client connections"),
+    timeout: float = typer.Option(30.0, help="Seconds to wait for a reply"),
+    random_seed: int = typer.Option(42, "--seed", help="Random seed"),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Report file, timestamped by default"
+    ),
+) -> None:
+    """Replay the production traffic mix at an open-loop arrival rate."""
+    if ramp_up >= duration:
+        typer.echo("Error: the ramp-up must be shorter than the run")
+        sys.exit(1)
+    try:
+        report, elapsed = asyncio.run(
+            run_load(
+                target,
+                database_url,
+                rate,
+                duration,
+                ramp_up,
+                reseed,
+                max_connections,
+                timeout,
+                random_seed,
+            )
+        )
+    except KeyboardInterrupt:
+        typer.echo("\nLoad test cancelled by user.")
+        sys.exit(1)
+    typer.echo(render(report))
+    path = output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "meta": {
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "target": target,
+                    "rate": rate,
+                    "duration": duration,
+                    "ramp_up": ramp_up,
+                    "elapsed": elapsed,
+                },
+                "scenarios": report,
+            },
+            file,
+            indent=2,
+        )
+    typer.echo(f"Saved the report to {path}")
+
+
+if __name__ == "__main__":
+    app()
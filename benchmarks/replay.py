@@ -0,0 +1,349 @@
+import asyncio
+import json
+import logging
+import logging.config
+import os
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import typer
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from .config import RESULTS_DIR
+from .load import ScenarioStats, render
+from .seed import Dataset, load_dataset
+from layered_architecture.api.middlewares.profiling import ProfilingMiddleware
+from layered_architecture.config.settings import settings
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="replay",
+    help="Replay captured traffic against a running instance",
+    add_completion=False,
+)
+
+# Placeholders for the strings stripped from captured bodies
+PLACEHOLDERS = {
+    "notes": "Replayed order",
+    "delivery_address": "221B Baker Street",
+}
+
+# Placeholders for the query parameters, only their names being captured
+QUERY_PLACEHOLDERS = {
+    "reason": "Replayed cancellation",
+    "period": "day",
+    "since": "2024-01-01T00:00:00",
+    "until": "2024-01-08T00:00:00",
+    "service_type": "delivery",
+    "product_type": "pizza",
+}
+
+
+def read_capture(path: str) -> List[Dict[str, Any]]:
+    """Read a traffic capture, in order of arrival.
+
+    :param path: The file written by ``TrafficCaptureMiddleware``
+    :type path: str
+    :return: The captured requests
+    :rtype: List[Dict[str, Any]]
+    """
+    with open(path, encoding="utf-8") as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+    return sorted(entries, key=lambda entry: entry["t"])
+
+
+class Replayer:
+    """Re-issue captured requests, keeping their inter-arrival gaps.
+
+    Captured order ids are mapped to orders of the target: orders created
+    during the capture map to the orders their replayed creation returns,
+    the others to orders of the target's dataset, always the same one for
+    a given captured id. Hot orders therefore stay hot.
+    """
+
+    def __init__(
+        self, client: httpx.AsyncClient, dataset: Dataset, rng: random.Random
+    ) -> None:
+        """Initialize the replayer.
+
+        :param client: Client of the target instance
+        :type client: httpx.AsyncClient
+        :param dataset: Menu and orders of the target database
+        :type dataset: Dataset
+        :param rng: The random generator to use
+        :type rng: random.Random
+        """
+        self.client = client
+        self.dataset = dataset
+        self.rng = rng
+        self.known = [
+            order for orders in dataset.orders.values() for order in orders
+        ]
+        self.order_ids: Dict[str, str] = {}
+        self.stats: Dict[str, ScenarioStats] = {}
+
+    def target_order(self, captured: str) -> str:
+        """Map a captured order id to an order of the target.
+
+        :param captured: The captured order id
+        :type captured: str
+        :return: The order id in the target
+        :rtype: str
+        """
+        if captured not in self.order_ids:
+            self.order_ids[captured] = self.rng.choice(self.known)
+        return self.order_ids[captured]
+
+    def fill(self, shape: Any, key: Optional[str] = None) -> Any:
+        """Rebuild a body from its captured shape.
+
+        :param shape: The captured body shape
+        :type shape: Any
+        :param key: The field holding the value, if any
+        :type key: Optional[str]
+        :return: A body of that shape
+        :rtype: Any
+        """
+        if isinstance(shape, dict):
+            body = {k: self.fill(v, k) for k, v in shape.items()}
+            if body.get("product_name") is not None:
+                menu = (
+                    self.dataset.pizzas
+                    if body.get("type") == "pizza"
+                    else self.dataset.beers
+                )
+                body["product_name"] = self.rng.choice(menu)
+            return body
+        if isinstance(shape, list):
+            return [self.fill(value) for value in shape]
+        match shape:
+            case "str":
+                return PLACEHOLDERS.get(key or "", "replayed")
+            case "int":
+                return 1
+            case "float":
+                return 1.0
+            case "bool":
+                return False
+        return shape
+
+    def request(
+        self, entry: Dict[str, Any]
+    ) -> Tuple[str, str, Dict[str, str], Any]:
+        """Build the request replaying a captured entry.
+
+        :param entry: The captured request
+        :type entry: Dict[str, Any]
+        :return: The method, path, query parameters and JSON body
+        :rtype: Tuple[str, str, Dict[str, str], Any]
+        """
+        path = entry["r"]
+        if "o" in entry:
+            path = path.replace("{order_id}", self.target_order(entry["o"]))
+        # Replays are profiled only when asked to, with --profile-token
+        params = {
+            name: QUERY_PLACEHOLDERS.get(name, "replayed")
+            for name in entry.get("q", [])
+            if name != ProfilingMiddleware.QUERY_PARAM
+        }
+        body = self.fill(entry["b"]) if "b" in entry else None
+        return entry["m"], path, params, body
+
+    async def run(
+        self, entries: List[Dict[str, Any]], speed: float = 1.0
+    ) -> float:
+        """Replay the entries, ``speed`` times faster than captured.
+
+        :param entries: The captured requests, in order of arrival
+        :type entries: List[Dict[str, Any]]
+        :param speed: How much to compress the inter-arrival gaps
+        :type speed: float
+        :return: Seconds elapsed
+        :rtype: float
+        """
+        loop = asyncio.get_running_loop()
+        tasks = []
+        start = loop.time()
+        first = entries[0]["t"] if entries else 0.0
+        for entry in entries:
+            scheduled = start + (entry["t"] - first) / speed
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._issue(entry, scheduled)))
+        await asyncio.gather(*tasks)
+        return loop.time() - start
+
+    async def _issue(self, entry: Dict[str, Any], scheduled: float) -> None:
+        loop = asyncio.get_running_loop()
+        name = f"{entry['m']} {entry['r']}"
+        stats = self.stats.setdefault(name, ScenarioStats())
+        method, path, params, body = self.request(entry)
+        sent = loop.time()
+        status: int | str
+        try:
+            response = await self.client.request(
+                method, path, params=params, json=body
+            )
+            status = response.status_code
+            if status == 201 and "c" in entry:
+                self.order_ids[entry["c"]] = response.json()["id"]
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finished = loop.time()
+        stats.latencies.append(finished - scheduled)
+        stats.service_times.append(finished - sent)
+        stats.statuses[status] += 1
+        # A replay is faithful when the target answers as it did then
+        stats.unexpected += status != entry["s"]
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """Summarize every replayed route.
+
+        :param elapsed: Seconds the replay lasted
+        :type elapsed: float
+        :return: The summary of each method and route
+        :rtype: Dict[str, Any]
+        """
+        return {
+            name: stats.summary(elapsed)
+            for name, stats in sorted(self.stats.items())
+        }
+
+
+async def run_replay(
+    capture: str,
+    target: str,
+    database_url: str,
+    speed: float,
+    max_connections: int,
+    timeout: float,
+    random_seed: int,
+    profile_token: Optional[str] = None,
+) -> Tuple[Dict[str, Any], float]:
+    """Load the target's dataset and replay a capture against it.
+
+    :param capture: The capture file
+    :type capture: str
+    :param target: Base URL of the running instance
+    :type target: str
+    :param database_url: URL of the database the instance serves
+    :type database_url: str
+    :param speed: How much to compress the inter-arrival gaps
+    :type speed: float
+    :param max_connections: Connections the client opens at most
+    :type max_connections: int
+    :param timeout: Seconds to wait for a response
+    :type timeout: float
+    :param random_seed: Seed of the order id mapping and of the bodies
+    :type random_seed: int
+    :param profile_token: Token to profile every replayed request with
+    :type profile_token: Optional[str]
+    :return: The report and the seconds elapsed
+    :rtype: Tuple[Dict[str, Any], float]
+    """
+    entries = read_capture(capture)
+    engine = create_async_engine(database_url)
+    try:
+        dataset = await load_dataset(engine)
+    finally:
+        await engine.dispose()
+    if not dataset.orders or not dataset.pizzas or not dataset.beers:
+        raise ValueError("The target database has no menu or orders")
+    headers = (
+        {ProfilingMiddleware.HEADER_NAME: profile_token}
+        if profile_token
+        else None
+    )
+    async with httpx.AsyncClient(
+        base_url=target,
+        headers=headers,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    ) as client:
+        replayer = Replayer(client, dataset, random.Random(random_seed))
+        elapsed = await replayer.run(entries, speed)
+    return replayer.report(elapsed), elapsed
+
+
+@app.command()
+def replay(
+    capture: str = typer.Argument(
+        settings.TRAFFIC_CAPTURE_PATH, help="The traffic capture to replay"
+    ),
+    target: str = typer.Option(
+        "http://127.0.0.1:8000", help="Base URL of the running instance"
+    ),
+    database_url: str = typer.Option(
+        settings.DATABASE_URL, help="Database the instance serves"
+    ),
+    speed: float = typer.Option(
+        1.0, help="Replay speed, e.g. 2 for twice as fast"
+    ),
+    max_connections: int = typer.Option(100, help="Client connections"),
+    timeout: float = typer.Option(30.0, help="Seconds to wait for a reply"),
+    random_seed: int = typer.Option(42, "--seed", help="Random seed"),
+    profile_token: Optional[str] = typer.Option(
+        None,
+        "--profile-token",
+        help="PROFILING_TOKEN of the target, to profile every request",
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Report file, timestamped by default"
+    ),
+) -> None:
+    """Replay captured traffic, keeping its inter-arrival gaps."""
+    if speed <= 0:
+        typer.echo("Error: the speed must be positive")
+        sys.exit(1)
+    try:
+        report, elapsed = asyncio.run(
+            run_replay(
+                capture,
+                target,
+                database_url,
+                speed,
+                max_connections,
+                timeout,
+                random_seed,
+                profile_token,
+            )
+        )
+    except KeyboardInterrupt:
+        typer.echo("\nReplay cancelled by user.")
+        sys.exit(1)
+    typer.echo(render(report))
+    path = output or os.path.join(
+        RESULTS_DIR, f"replay-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "meta": {
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "capture": capture,
+                    "target": target,
+                    "speed": speed,
+                    "profiled": bool(profile_token),
+                    "elapsed": elapsed,
+                },
+                "routes": report,
+            },
+            file,
+            indent=2,
+        )
+    typer.echo(f"Saved the report to {path}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import logging
+import logging.config
+import os
+import platform
+import random
+import subprocess
+import sys
+from contextlib import AsyncExitStack
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+import typer
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from .cases import BenchmarkContext, all_cases, asgi_client
+from .config import RESULTS_DIR, BenchmarkConfig
+from .harness import BenchmarkResult, measure
+from .seed import seed
+from layered_architecture.config.settings import settings
+from layered_architecture.observability import instrument_engine
+from layered_architecture.services.concrete.late_night import (
+    LateNightOrderService,
+)
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="benchmarks",
+    help="Benchmark the order DAOs, services and endpoints",
+    add_completion=False,
+)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(
+    config: BenchmarkConfig, only: Optional[str] = None
+) -> List[BenchmarkResult]:
+    """Seed the benchmark database and measure every selected case.
+
+    :param config: Data volumes and measurement parameters
+    :type config: BenchmarkConfig
+    :param only: Substring the case names must contain, if any
+    :type only: Optional[str]
+    :return: The measurements
+    :rtype: List[BenchmarkResult]
+    """
+    engine = create_async_engine(
+        config.database_url,
+        pool_size=max(5, config.concurrency),
+        max_overflow=0,
+    )
+    instrument_engine(engine)
+    sessions = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    cases = [case for case in all_cases() if not only or only in case.name]
+    results = []
+    try:
+        dataset = await seed(engine, config)
+        async with AsyncExitStack() as stack:
+            # Late night orders are otherwise refused outside 10 PM to 4 AM
+            stack.enter_context(
+                patch.object(
+                    LateNightOrderService, "_is_late_night", return_value=True
+                )
+            )
+            client = await stack.enter_async_context(
+                asgi_client(engine, sessions)
+            )
+            ctx = BenchmarkContext(
+                config=config,
+                engine=engine,
+                sessions=sessions,
+                dataset=dataset,
+                rng=random.Random(config.seed),
+                client=client,
+            )
+            for case in cases:
+                iterations = min(
+                    config.iterations, case.max_iterations or sys.maxsize
+                )
+                result = await measure(
+                    case.name,
+                    case.group,
+                    case.build(ctx),
+                    iterations=iterations,
+                    warmup=min(config.warmup, iterations),
+                    concurrency=config.concurrency,
+                )
+                logger.info(
+                    f"{case.name}: {result.throughput:.1f} ops/s, "
+                    f"p50 {result.latency_ms['p50']:.2f}ms, "
+                    f"p95 {result.latency_ms['p95']:.2f}ms, "
+                    f"{result.queries_per_op:.1f} queries/op"
+                )
+                results.append(result)
+    finally:
+        await engine.dispose()
+    return results
+
+
+def write_results(
+    path: str, config: BenchmarkConfig, results: List[BenchmarkResult]
+) -> None:
+    """Save results with the configuration and environment they ran in.
+
+    :param path: The JSON file to write
+    :type path: str
+    :param config: The configuration of the run
+    :type config: BenchmarkConfig
+    :param results: The measurements
+    :type results: List[BenchmarkResult]
+    """
+    meta_config: Dict[str, Any] = asdict(config)
+    # Never store credentials along with the results
+    meta_config.pop("database_url")
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": meta_config,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2)
+
+
+@app.command()
+def benchmark(
+    menu_size: int = typer.Option(50, help="Pizzas and beers on the menu"),
+    orders: int = typer.Option(1000, help="Orders to seed"),
+    items_per_order: int = typer.Option(3, help="Items per order"),
+    iterations: int = typer.Option(200, help="Measured runs per case"),
+    warmup: int = typer.Option(20, help="Unmeasured runs per case"),
+    concurrency: int = typer.Option(1, help="Concurrent runs per case"),
+    only: Optional[str] = typer.Option(
+        None, help="Only run cases whose name contains this"
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Results file, timestamped by default"
+    ),
+) -> None:
+    """Seed the benchmark database, run the benchmarks and save results."""
+    config = replace(
+        BenchmarkConfig(),
+        menu_size=menu_size,
+        orders=orders,
+        items_per_order=items_per_order,
+        iterations=iterations,
+        warmup=warmup,
+        concurrency=concurrency,
+    )
+    path = output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    try:
+        results = asyncio.run(run_benchmarks(config, only))
+    except KeyboardInterrupt:
+        typer.echo("\nBenchmarks cancelled by user.")
+        sys.exit(1)
+    write_results(path, config, results)
+    typer.echo(f"Saved {len(results)} results to {path}")
+
+
+if __name__ == "__main__":
+    app()
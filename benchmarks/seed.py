@@ -0,0 +1,220 @@
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from logging import getLogger
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import BenchmarkConfig
+from layered_architecture.db.models import (
+    Beer,
+    Order,
+    OrderBeer,
+    OrderPizza,
+    Pizza,
+)
+from layered_architecture.db.models.base import Base
+from layered_architecture.db.models.mixins import uuid7
+from layered_architecture.enums import OrderStatus, ServiceType
+from layered_architecture.services.concrete.fake_auth import FakeAuthService
+
+logger = getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+
+@dataclass
+class Dataset:
+    """What was seeded, for benchmarks to pick inputs from."""
+
+    customer_id: uuid.UUID
+    pizzas: List[str] = field(default_factory=list)
+    beers: List[str] = field(default_factory=list)
+    orders: Dict[ServiceType, List[str]] = field(default_factory=dict)
+
+    def pick_order(self, rng: random.Random, service_type: ServiceType) -> str:
+        """Pick a seeded order of a service type.
+
+        :param rng: The random generator to use
+        :type rng: random.Random
+        :param service_type: The service type of the order
+        :type service_type: ServiceType
+        :return: The order id
+        :rtype: str
+        """
+        return rng.choice(self.orders[service_type])
+
+    def items(self, rng: random.Random, count: int) -> List[Dict[str, Any]]:
+        """Build order input items from the seeded menu.
+
+        :param rng: The random generator to use
+        :type rng: random.Random
+        :param count: The number of items
+        :type count: int
+        :return: Items as accepted by ``OrderInputDTO``
+        :rtype: List[Dict[str, Any]]
+        """
+        items = []
+        for index in range(count):
+            # Alternate pizzas and beers, as most orders mix them
+            kind, names = (
+                ("pizza", self.pizzas)
+                if index % 2 == 0
+                else ("beer", self.beers)
+            )
+            items.append(
+                {
+                    "type": kind,
+                    "product_name": rng.choice(names),
+                    "quantity": rng.randint(1, 3),
+                }
+            )
+        return items
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _price(rng: random.Random, low: int, high: int) -> Decimal:
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+async def _insert(
+    engine: AsyncEngine, model: Any, rows: List[Dict[str, Any]]
+) -> None:
+    async with engine.begin() as conn:
+        for start in range(0, len(rows), BATCH_SIZE):
+            await conn.execute(insert(model), rows[start : start + BATCH_SIZE])
+
+
+async def seed(engine: AsyncEngine, config: BenchmarkConfig) -> Dataset:
+    """Recreate the schema and seed the configured data volumes.
+
+    The data only depends on the configuration, so runs with the same
+    configuration measure the same database.
+
+    :param engine: The engine of the benchmark database
+    :type engine: AsyncEngine
+    :param config: The data volumes to seed
+    :type config: BenchmarkConfig
+    :return: The seeded dataset
+    :rtype: Dataset
+    """
+    rng = random.Random(config.seed)
+    user = await FakeAuthService.get_current_user()
+    dataset = Dataset(customer_id=user.id)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    pizzas: List[Dict[str, Any]] = [
+        {
+            "id": _uuid(rng),
+            "name": f"Pizza {index:04d}",
+            "description": "Benchmark pizza",
+            "price": _price(rng, 9, 20),
+        }
+        for index in range(config.menu_size)
+    ]
+    beers: List[Dict[str, Any]] = [
+        {
+            "id": _uuid(rng),
+            "name": f"Beer {index:04d}",
+            "brand": "Benchmark",
+            "price": _price(rng, 4, 10),
+            "is_tap": index % 3 == 0,
+        }
+        for index in range(config.menu_size)
+    ]
+    dataset.pizzas = [pizza["name"] for pizza in pizzas]
+    dataset.beers = [beer["name"] for beer in beers]
+
+    orders: List[Dict[str, Any]] = []
+    order_pizzas: List[Dict[str, Any]] = []
+    order_beers: List[Dict[str, Any]] = []
+    service_types = list(ServiceType)
+    # Items carry their order's creation time, their partition key
+    created_at = datetime.now(timezone.utc)
+    for index in range(config.orders):
+        order_id = uuid7(at=created_at, random=rng.getrandbits(62))
+        service_type = service_types[index % len(service_types)]
+        subtotal = Decimal("0")
+        for item in range(config.items_per_order):
+            is_pizza = item % 2 == 0
+            product = rng.choice(pizzas if is_pizza else beers)
+            quantity = rng.randint(1, 3)
+            subtotal += product["price"] * quantity
+            (order_pizzas if is_pizza else order_beers).append(
+                {
+                    "id": uuid7(at=created_at, random=rng.getrandbits(62)),
+                    "order_id": order_id,
+                    "order_created_at": created_at,
+                    f"{'pizza' if is_pizza else 'beer'}_id": product["id"],
+                    "quantity": quantity,
+                    "price": product["price"],
+                }
+            )
+        orders.append(
+            {
+                "id": order_id,
+                "service_type": service_type,
+                "customer_id": user.id,
+                "status": OrderStatus.PENDING,
+                "created_at": created_at,
+                "subtotal": subtotal,
+                "total": subtotal,
+                "notes": None,
+                "delivery_address": (
+                    "123 Main St"
+                    if service_type == ServiceType.DELIVERY
+                    else None
+                ),
+            }
+        )
+        dataset.orders.setdefault(service_type, []).append(str(order_id))
+
+    await _insert(engine, Pizza, pizzas)
+    await _insert(engine, Beer, beers)
+    await _insert(engine, Order, orders)
+    await _insert(engine, OrderPizza, order_pizzas)
+    await _insert(engine, OrderBeer, order_beers)
+    logger.info(
+        f"Seeded {config.menu_size} pizzas and beers and {config.orders} "
+        f"orders of {config.items_per_order} items"
+    )
+    return dataset
+
+
+async def load_dataset(engine: AsyncEngine) -> Dataset:
+    """Read the menu and orders of an already seeded database.
+
+    :param engine: The engine of the seeded database
+    :type engine: AsyncEngine
+    :return: The dataset
+    :rtype: Dataset
+    """
+    user = await FakeAuthService.get_current_user()
+    dataset = Dataset(customer_id=user.id)
+    async with engine.connect() as conn:
+        dataset.pizzas = list(
+            (await conn.execute(select(Pizza.name).order_by(Pizza.name)))
+            .scalars()
+            .all()
+        )
+        dataset.beers = list(
+            (await conn.execute(select(Beer.name).order_by(Beer.name)))
+            .scalars()
+            .all()
+        )
+        rows = await conn.execute(
+            select(Order.id, Order.service_type).order_by(Order.id)
+        )
+        for order_id, service_type in rows:
+            dataset.orders.setdefault(service_type, []).append(str(order_id))
+    return dataset
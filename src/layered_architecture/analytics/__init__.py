@@ -0,0 +1,10 @@
+try:
+    import numpy  # noqa: F401
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "Analytics need numpy, install the analytics extra: "
+        "pip install 'layered-architecture[analytics]'"
+    ) from e
+
+from .reports import build_report
+from .snapshot import Snapshot, write_snapshot
@@ -0,0 +1,239 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .snapshot import PRODUCT_TYPES, SERVICE_TYPES, STATUS_CODES, Snapshot
+from layered_architecture.enums import OrderStatus
+
+PERIODS = {"hour": "h", "day": "D", "month": "M"}
+
+
+def _money(cents: Any) -> float:
+    return round(float(cents) / 100, 2)
+
+
+def order_mask(
+    snapshot: Snapshot,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_cancelled: bool = False,
+) -> np.ndarray:
+    """Select the orders a report covers.
+
+    :param snapshot: The snapshot
+    :type snapshot: Snapshot
+    :param since: Only orders created at or after this time
+    :type since: Optional[datetime]
+    :param until: Only orders created before this time
+    :type until: Optional[datetime]
+    :param include_cancelled: Whether to count cancelled orders
+    :type include_cancelled: bool
+    :return: One flag per order
+    :rtype: np.ndarray
+    """
+    created = snapshot.orders["created_at"]
+    mask = np.ones(len(created), dtype=bool)
+    # Orders are sorted by creation time, so the range is a slice
+    if since is not None:
+        start = np.searchsorted(created, np.datetime64(_naive(since), "s"))
+        mask[:start] = False
+    if until is not None:
+        end = np.searchsorted(created, np.datetime64(_naive(until), "s"))
+        mask[end:] = False
+    if not include_cancelled:
+        mask &= (
+            snapshot.orders["status"] != STATUS_CODES[OrderStatus.CANCELLED]
+        )
+    return mask
+
+
+def _naive(value: datetime) -> datetime:
+    # Columns hold UTC times without a timezone
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def revenue(
+    snapshot: Snapshot, mask: np.ndarray, period: str = "day"
+) -> Dict[str, Any]:
+    """Sum the revenue of the selected orders, in total and per period.
+
+    :param snapshot: The snapshot
+    :type snapshot: Snapshot
+    :param mask: The selected orders
+    :type mask: np.ndarray
+    :param period: ``hour``, ``day`` or ``month``
+    :type period: str
+    :return: The total revenue and the revenue and orders per period
+    :rtype: Dict[str, Any]
+    """
+    totals = snapshot.orders["total_cents"][mask]
+    buckets = snapshot.orders["created_at"][mask].astype(
+        f"datetime64[{PERIODS[period]}]"
+    )
+    labels, inverse = np.unique(buckets, return_inverse=True)
+    per_period = np.bincount(inverse, weights=totals, minlength=len(labels))
+    counts = np.bincount(inverse, minlength=len(labels))
+    return {
+        "total": _money(totals.sum()),
+        "orders": int(mask.sum()),
+        "by_period": [
+            {
+                "period": str(label),
+                "revenue": _money(amount),
+                "orders": int(count),
+            }
+            for label, amount, count in zip(labels, per_period, counts)
+        ],
+    }
+
+
+def _item_mask(snapshot: Snapshot, mask: np.ndarray) -> np.ndarray:
+    items: np.ndarray = mask[snapshot.items["order_index"]]
+    return items
+
+
+def basket(snapshot: Snapshot, mask: np.ndarray) -> Dict[str, float]:
+    """Average the size and value of the selected orders.
+
+    :param snapshot: The snapshot
+    :type snapshot: Snapshot
+    :param mask: The selected orders
+    :type mask: np.ndarray
+    :return: Average lines, quantity and total per order
+    :rtype: Dict[str, float]
+    """
+    orders = int(mask.sum())
+    if not orders:
+        return {"avg_lines": 0.0, "avg_quantity": 0.0, "avg_total": 0.0}
+    items = _item_mask(snapshot, mask)
+    return {
+        "avg_lines": round(int(items.sum()) / orders, 3),
+        "avg_quantity": round(
+            int(snapshot.items["quantity"][items].sum()) / orders, 3
+        ),
+        "avg_total": _money(
+            snapshot.orders["total_cents"][mask].sum() / orders
+        ),
+    }
+
+
+def popularity(
+    snapshot: Snapshot, mask: np.ndarray, top: int = 10
+) -> List[Dict[str, Any]]:
+    """Rank products by the quantity sold in the selected orders.
+
+    :param snapshot: The snapshot
+    :type snapshot: Snapshot
+    :param mask: The selected orders
+    :type mask: np.ndarray
+    :param top: How many products to return
+    :type top: int
+    :return: The best sellers, best first
+    :rtype: List[Dict[str, Any]]
+    """
+    products = [
+        (kind, product)
+        for kind in PRODUCT_TYPES
+        for product in snapshot.products[kind]
+    ]
+    if not products:
+        return []
+    # Pizzas come first in the flattened product list, then beers
+    offsets = np.array(
+        [0, len(snapshot.products[PRODUCT_TYPES[0]])], dtype=np.int64
+    )
+    items = _item_mask(snapshot, mask)
+    keys = (
+        offsets[snapshot.items["product_type"][items]]
+        + snapshot.items["product_index"][items]
+    )
+    sold = snapshot.items["quantity"][items]
+    quantities = np.bincount(keys, weights=sold, minlength=len(products))
+    # Valued at the unit prices the items were sold at
+    revenues = np.bincount(
+        keys,
+        weights=sold * snapshot.items["price_cents"][items],
+        minlength=len(products),
+    )
+    ranked = np.argsort(-quantities, kind="stable")[:top]
+    return [
+        {
+            "type": products[index][0],
+            "name": products[index][1]["name"],
+            "quantity": int(quantities[index]),
+            "revenue": _money(revenues[index]),
+        }
+        for index in ranked
+        if quantities[index] > 0
+    ]
+
+
+def service_types(
+    snapshot: Snapshot, mask: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Break the selected orders down by service type.
+
+    :param snapshot: The snapshot
+    :type snapshot: Snapshot
+    :param mask: The selected orders
+    :type mask: np.ndarray
+    :return: Orders, revenue, average total and share of each service type
+    :rtype: List[Dict[str, Any]]
+    """
+    codes = snapshot.orders["service_type"][mask]
+    counts = np.bincount(codes, minlength=len(SERVICE_TYPES))
+    revenues = np.bincount(
+        codes,
+        weights=snapshot.orders["total_cents"][mask],
+        minlength=len(SERVICE_TYPES),
+    )
+    orders = max(int(counts.sum()), 1)
+    return [
+        {
+            "service_type": service_type.value,
+            "orders": int(count),
+            "revenue": _money(amount),
+            "avg_total": _money(amount / count) if count else 0.0,
+            "share": round(int(count) / orders, 4),
+        }
+        for service_type, count, amount in zip(SERVICE_TYPES, counts, revenues)
+    ]
+
+
+def build_report(
+    snapshot: Snapshot,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_cancelled: bool = False,
+    period: str = "day",
+    top: int = 10,
+) -> Dict[str, Any]:
+    """Compute every report over the selected orders.
+
+    :param snapshot: The snapshot
+    :type snapshot: Snapshot
+    :param since: Only orders created at or after this time
+    :type since: Optional[datetime]
+    :param until: Only orders created before this time
+    :type until: Optional[datetime]
+    :param include_cancelled: Whether to count cancelled orders
+    :type include_cancelled: bool
+    :param period: Revenue bucket, ``hour``, ``day`` or ``month``
+    :type period: str
+    :param top: How many products to rank
+    :type top: int
+    :return: Revenue, basket, popularity and service type reports
+    :rtype: Dict[str, Any]
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unsupported period: {period}")
+    mask = order_mask(snapshot, since, until, include_cancelled)
+    return {
+        "revenue": revenue(snapshot, mask, period),
+        "basket": basket(snapshot, mask),
+        "popularity": popularity(snapshot, mask, top),
+        "service_types": service_types(snapshot, mask),
+    }
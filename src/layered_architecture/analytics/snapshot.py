@@ -0,0 +1,310 @@
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from layered_architecture.db.models import (
+    ArchivedOrder,
+    ArchivedOrderBeer,
+    ArchivedOrderPizza,
+    Beer,
+    Order,
+    OrderBeer,
+    OrderPizza,
+    Pizza,
+)
+from layered_architecture.enums import OrderStatus, ServiceType
+
+logger = getLogger(__name__)
+
+SCHEMA_VERSION = 2
+SERVICE_TYPES = list(ServiceType)
+STATUSES = list(OrderStatus)
+PRODUCT_TYPES = ("pizza", "beer")
+SERVICE_TYPE_CODES = {value: code for code, value in enumerate(SERVICE_TYPES)}
+STATUS_CODES = {value: code for code, value in enumerate(STATUSES)}
+# One .npy file per column; enums are stored as their index in the lists
+# above, products as their index in products.json and money in cents
+ORDER_COLUMNS = {
+    "created_at": "datetime64[s]",
+    "service_type": "int8",
+    "status": "int8",
+    "subtotal_cents": "int64",
+    "total_cents": "int64",
+}
+ITEM_COLUMNS = {
+    "order_index": "int64",
+    "product_type": "int8",
+    "product_index": "int32",
+    "quantity": "int32",
+    "price_cents": "int64",
+}
+BATCH_SIZE = 50000
+# Item tables, hot and archived, with their product type, product id and
+# product table
+ITEM_TABLES = (
+    (0, OrderPizza, OrderPizza.pizza_id, Pizza),
+    (0, ArchivedOrderPizza, ArchivedOrderPizza.pizza_id, Pizza),
+    (1, OrderBeer, OrderBeer.beer_id, Beer),
+    (1, ArchivedOrderBeer, ArchivedOrderBeer.beer_id, Beer),
+)
+
+
+@dataclass
+class Snapshot:
+    """Columns of the orders and their items, usually memory-mapped.
+
+    Item ``order_index`` values are positions in the order columns, so
+    joins are array indexing.
+    """
+
+    orders: Dict[str, np.ndarray]
+    items: Dict[str, np.ndarray]
+    products: Dict[str, List[Dict[str, Any]]]
+    meta: Dict[str, Any]
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "Snapshot":
+        """Load a snapshot written by ``write_snapshot``.
+
+        :param directory: The snapshot directory
+        :type directory: str
+        :param mmap: Whether to map the columns instead of reading them
+        :type mmap: bool
+        :return: The snapshot
+        :rtype: Snapshot
+        """
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("schema_version") != SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version: {meta.get('schema_version')}"
+            )
+        with open(
+            os.path.join(directory, "products.json"), encoding="utf-8"
+        ) as f:
+            products = json.load(f)
+        mode: Optional[Literal["r"]] = "r" if mmap else None
+
+        def column(table: str, name: str) -> np.ndarray:
+            path = os.path.join(directory, f"{table}.{name}.npy")
+            array: np.ndarray = np.load(path, mmap_mode=mode)
+            return array
+
+        return cls(
+            orders={name: column("orders", name) for name in ORDER_COLUMNS},
+            items={name: column("items", name) for name in ITEM_COLUMNS},
+            products=products,
+            meta=meta,
+        )
+
+
+def _cents(value: Any) -> int:
+    return int(value * 100)
+
+
+async def _products(conn: AsyncConnection) -> Dict[str, List[Dict[str, Any]]]:
+    products: Dict[str, List[Dict[str, Any]]] = {}
+    for kind, model in zip(PRODUCT_TYPES, (Pizza, Beer)):
+        rows = await conn.execute(
+            select(model.id, model.name, model.price).order_by(
+                model.name, model.id
+            )
+        )
+        products[kind] = [
+            {
+                "id": str(product_id),
+                "name": name,
+                "price_cents": _cents(price),
+            }
+            for product_id, name, price in rows
+        ]
+    return products
+
+
+def _open_columns(
+    directory: str, table: str, columns: Dict[str, str], length: int
+) -> Dict[str, np.memmap]:
+    return {
+        name: np.lib.format.open_memmap(
+            os.path.join(directory, f"{table}.{name}.npy"),
+            mode="w+",
+            dtype=np.dtype(dtype),
+            shape=(length,),
+        )
+        for name, dtype in columns.items()
+    }
+
+
+async def write_snapshot(engine: AsyncEngine, directory: str) -> Snapshot:
+    """Export the orders and their items into memory-mappable columns.
+
+    Everything is read in one repeatable read transaction, so the columns
+    are consistent with each other, and streamed into memory-mapped files,
+    so memory use does not grow with the number of orders. Archived orders
+    are included. ``meta.json`` is written last and marks the snapshot
+    complete.
+
+    :param engine: The engine of the source database
+    :type engine: AsyncEngine
+    :param directory: Where to write the snapshot
+    :type directory: str
+    :return: The written snapshot
+    :rtype: Snapshot
+    """
+    os.makedirs(directory, exist_ok=True)
+    meta_path = os.path.join(directory, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="REPEATABLE READ")
+        async with conn.begin():
+            products = await _products(conn)
+            positions = [
+                {product["id"]: index for index, product in enumerate(items)}
+                for items in products.values()
+            ]
+            all_orders = union_all(
+                *(
+                    select(
+                        model.id,
+                        model.created_at,
+                        model.service_type,
+                        model.status,
+                        model.subtotal,
+                        model.total,
+                    )
+                    for model in (Order, ArchivedOrder)
+                )
+            ).subquery("all_orders")
+            order_count = (
+                await conn.scalar(select(func.count()).select_from(all_orders))
+                or 0
+            )
+            # Archived items may name products removed from the menu since,
+            # those are left out
+            item_count = 0
+            for _, model, product_id, product in ITEM_TABLES:
+                item_count += (
+                    await conn.scalar(
+                        select(func.count(model.id)).join(
+                            product, product.id == product_id
+                        )
+                    )
+                    or 0
+                )
+            orders = _open_columns(
+                directory, "orders", ORDER_COLUMNS, order_count
+            )
+            items = _open_columns(directory, "items", ITEM_COLUMNS, item_count)
+
+            start = 0
+            result = await conn.stream(
+                select(
+                    all_orders.c.created_at,
+                    all_orders.c.service_type,
+                    all_orders.c.status,
+                    all_orders.c.subtotal,
+                    all_orders.c.total,
+                ).order_by(all_orders.c.created_at, all_orders.c.id),
+                execution_options={"yield_per": BATCH_SIZE},
+            )
+            async for rows in result.partitions():
+                end = start + len(rows)
+                orders["created_at"][start:end] = [
+                    int(row.created_at.timestamp()) for row in rows
+                ]
+                orders["service_type"][start:end] = [
+                    SERVICE_TYPE_CODES[row.service_type] for row in rows
+                ]
+                orders["status"][start:end] = [
+                    STATUS_CODES[row.status] for row in rows
+                ]
+                orders["subtotal_cents"][start:end] = [
+                    _cents(row.subtotal) for row in rows
+                ]
+                orders["total_cents"][start:end] = [
+                    _cents(row.total) for row in rows
+                ]
+                start = end
+
+            # Number the orders as above, so items point at their position
+            numbered = select(
+                all_orders.c.id,
+                all_orders.c.created_at,
+                (
+                    func.row_number().over(
+                        order_by=(all_orders.c.created_at, all_orders.c.id)
+                    )
+                    - 1
+                ).label("position"),
+            ).cte("numbered")
+            item_queries = [
+                select(
+                    numbered.c.position,
+                    literal(kind_index).label("product_type"),
+                    product_id.label("product_id"),
+                    model.quantity,
+                    model.price,
+                )
+                .select_from(model)
+                .join(product, product.id == product_id)
+                # Matching the creation time too, the items' partition key
+                .join(
+                    numbered,
+                    (numbered.c.id == model.order_id)
+                    & (numbered.c.created_at == model.order_created_at),
+                )
+                for kind_index, model, product_id, product in ITEM_TABLES
+            ]
+            start = 0
+            result = await conn.stream(
+                union_all(*item_queries),
+                execution_options={"yield_per": BATCH_SIZE},
+            )
+            async for rows in result.partitions():
+                end = start + len(rows)
+                items["order_index"][start:end] = [row[0] for row in rows]
+                items["product_type"][start:end] = [row[1] for row in rows]
+                items["product_index"][start:end] = [
+                    positions[row[1]][str(row[2])] for row in rows
+                ]
+                items["quantity"][start:end] = [row[3] for row in rows]
+                items["price_cents"][start:end] = [
+                    _cents(row[4]) for row in rows
+                ]
+                start = end
+
+    for column in [*orders.values(), *items.values()]:
+        column.flush()
+    meta = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "orders": order_count,
+        "items": item_count,
+        "service_types": [
+            service_type.value for service_type in SERVICE_TYPES
+        ],
+        "statuses": [status.value for status in STATUSES],
+        "product_types": list(PRODUCT_TYPES),
+    }
+    with open(
+        os.path.join(directory, "products.json"), "w", encoding="utf-8"
+    ) as f:
+        json.dump(products, f)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    logger.info(
+        f"Wrote a snapshot of {order_count} orders and {item_count} items "
+        f"to {directory}"
+    )
+    return Snapshot(
+        orders=dict(orders), items=dict(items), products=products, meta=meta
+    )
@@ -2,3 +2,4 @@ from .error import configure_exception_handlers
 from .logging import configure_logging
 from .middlewares import configure_middlewares
 from .routers import configure_routers
+from .tracing import configure_tracing
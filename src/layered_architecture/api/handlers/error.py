@@ -19,9 +19,17 @@ logger = logging.getLogger(__name__)
 
 
 def generate_response(
-    status_code: int, errors: list[ErrorResponse]
+    status_code: int,
+    errors: list[ErrorResponse],
+    request: Optional[Request] = None,
 ) -> JSONResponse:
-    """Generate a JSON response for the error."""
+    """Generate a JSON response for the error.
+
+    The first error's code is kept on the request state so middlewares can
+    categorize the failure.
+    """
+    if request is not None and errors:
+        request.state.error_code = errors[0].code
     return JSONResponse(
         status_code=status_code,
         content=ErrorEnvelope(errors=errors).model_dump(exclude_none=True),
@@ -58,6 +66,7 @@ class ErrorHandler:
                     key=exc.key,
                 )
             ],
+            request=request,
         )
 
     @classmethod
@@ -80,6 +89,7 @@ class ErrorHandler:
                     key=exc.key,
                 )
             ],
+            request=request,
         )
 
     @classmethod
@@ -103,6 +113,7 @@ class ErrorHandler:
                     key=key,
                 )
             ],
+            request=request,
         )
 
     @classmethod
@@ -123,6 +134,7 @@ class ErrorHandler:
                     details=str(exc),
                 )
             ],
+            request=request,
         )
 
     @classmethod
@@ -143,6 +155,7 @@ class ErrorHandler:
                     details=str(exc),
                 )
             ],
+            request=request,
         )
 
     @classmethod
@@ -160,6 +173,7 @@ class ErrorHandler:
                     details=error_msg,
                 )
             ],
+            request=request,
         )
 
 
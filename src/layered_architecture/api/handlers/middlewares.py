@@ -2,7 +2,20 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
+from layered_architecture.api.middlewares import (
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+    TracingMiddleware,
+    TrafficCaptureMiddleware,
+)
 from layered_architecture.config.settings import settings
+from layered_architecture.observability import (
+    http_metrics,
+    tracer,
+    traffic_recorder,
+)
 
 
 def configure_middlewares(app: FastAPI) -> None:
@@ -19,3 +32,27 @@ def configure_middlewares(app: FastAPI) -> None:
     app.add_middleware(
         TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS
     )
+    if settings.DATABASE_REPLICA_URLS:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            window=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+        )
+    app.add_middleware(
+        QueryStatsMiddleware,
+        budget=settings.QUERY_BUDGET,
+        enforce=settings.QUERY_BUDGET_ENFORCE,
+        repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+    )
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=settings.PROFILING_DIR,
+            token=settings.PROFILING_TOKEN,
+        )
+    if settings.TRAFFIC_CAPTURE_ENABLED:
+        traffic_recorder.configure(settings.TRAFFIC_CAPTURE_PATH)
+        app.add_middleware(TrafficCaptureMiddleware, recorder=traffic_recorder)
+    if settings.TRACING_EXPORTER:
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+    # Added last so it wraps, and times, every other middleware
+    app.add_middleware(MetricsMiddleware, metrics=http_metrics)
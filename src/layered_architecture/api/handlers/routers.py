@@ -1,8 +1,20 @@
-from fastapi import FastAPI
-from starlette.responses import RedirectResponse
+from fastapi import FastAPI, Request, Response
+from starlette import status
+from starlette.responses import PlainTextResponse, RedirectResponse
 
 from layered_architecture.api.routers.api_router import api_router
-from layered_architecture.dto import HealthResponse
+from layered_architecture.dto import (
+    HealthResponse,
+    MethodTimingDTO,
+    MethodTimingsResponse,
+    PoolStatsDTO,
+    PoolStatusResponse,
+)
+from layered_architecture.observability import (
+    http_metrics,
+    method_timings,
+    pool_stats,
+)
 
 
 def configure_routers(app: FastAPI) -> None:
@@ -29,6 +41,76 @@ def configure_routers(app: FastAPI) -> None:
         """
         return HealthResponse(status="UP")
 
+    @app.get(
+        "/ht/ready/",
+        description="Readiness endpoint, ready once warm-up has finished",
+        tags=["health"],
+        response_model=HealthResponse,
+        responses={
+            503: {
+                "description": "Service is still warming up",
+                "content": {
+                    "application/json": {"example": {"status": "STARTING"}}
+                },
+            }
+        },
+    )
+    async def readiness_check(
+        request: Request, response: Response
+    ) -> HealthResponse:
+        """
+        Readiness endpoint to hold traffic until the pools are warm.
+        """
+        if not getattr(request.app.state, "ready", False):
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            return HealthResponse(status="STARTING")
+        return HealthResponse(status="READY")
+
+    @app.get(
+        "/ht/pool/",
+        description="Connection pool gauges and checkout statistics",
+        tags=["health"],
+        response_model=PoolStatusResponse,
+    )
+    async def pool_status() -> PoolStatusResponse:
+        """
+        Report connection pool usage to diagnose pool starvation.
+        """
+        return PoolStatusResponse(
+            pools=[PoolStatsDTO(**stats) for stats in pool_stats()]
+        )
+
+    @app.get(
+        "/ht/timings/",
+        description="Latency of DAO and service methods per service type",
+        tags=["health"],
+        response_model=MethodTimingsResponse,
+    )
+    async def method_timings_status() -> MethodTimingsResponse:
+        """
+        Report which layer is spending the request latency.
+        """
+        return MethodTimingsResponse(
+            methods=[
+                MethodTimingDTO(**entry) for entry in method_timings.snapshot()
+            ]
+        )
+
+    @app.get(
+        "/metrics",
+        description="HTTP request metrics in the Prometheus text format",
+        tags=["health"],
+        response_class=PlainTextResponse,
+    )
+    async def metrics() -> PlainTextResponse:
+        """
+        Expose request rates, errors, latencies and in-flight requests.
+        """
+        return PlainTextResponse(
+            http_metrics.render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
     @app.get("/", include_in_schema=False)
     async def docs_redirect() -> RedirectResponse:
         """
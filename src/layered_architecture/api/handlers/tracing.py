@@ -0,0 +1,49 @@
+from typing import Optional
+
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+    OTLPSpanExporter,
+)
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from layered_architecture.config.settings import settings
+from layered_architecture.observability import (
+    FileSpanExporter,
+    create_tracer_provider,
+)
+
+
+def configure_tracing() -> Optional[TracerProvider]:
+    """
+    Configures the tracer provider using settings from config.
+
+    :return: The provider to shut down on exit, None if tracing is disabled
+    :rtype: Optional[TracerProvider]
+    """
+    exporter: SpanExporter
+    match settings.TRACING_EXPORTER.lower():
+        case "otlp":
+            endpoint = settings.TRACING_OTLP_ENDPOINT.rstrip("/")
+            exporter = OTLPSpanExporter(endpoint=f"{endpoint}/v1/traces")
+        case "file":
+            exporter = FileSpanExporter(settings.TRACING_FILE_PATH)
+        case "memory":
+            exporter = InMemorySpanExporter()
+        case "":
+            return None
+        case _:
+            raise ValueError(
+                f"Unsupported span exporter: {settings.TRACING_EXPORTER}"
+            )
+    provider: TracerProvider = create_tracer_provider(
+        exporter,
+        settings.TRACING_SERVICE_NAME,
+        sample_ratio=settings.TRACING_SAMPLE_RATIO,
+        flush_seconds=settings.TRACING_FLUSH_SECONDS,
+    )
+    trace.set_tracer_provider(provider)
+    return provider
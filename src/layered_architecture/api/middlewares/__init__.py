@@ -0,0 +1,6 @@
+from .capture import TrafficCaptureMiddleware
+from .consistency import ReadYourWritesMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .queries import QueryStatsMiddleware
+from .tracing import TracingMiddleware
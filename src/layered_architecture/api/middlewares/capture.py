@@ -0,0 +1,126 @@
+import json
+import time
+from typing import Any, Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from layered_architecture.observability.capture import (
+    TrafficRecorder,
+    body_shape,
+)
+
+
+class TrafficCaptureMiddleware:
+    """Record sanitized metadata of each request for later replay.
+
+    Each entry holds the start time (``t``), method (``m``), route template
+    (``r``), order id (``o``), query parameter names (``q``), body shape
+    (``b``), status (``s``), duration (``d``) and, for creations, the id of
+    the created order (``c``). Bodies are reduced to their shape, so no
+    customer data is stored.
+    """
+
+    MAX_BODY = 64 * 1024
+
+    def __init__(self, app: ASGIApp, recorder: TrafficRecorder) -> None:
+        """Initialize the middleware.
+
+        :param app: The ASGI application to wrap
+        :type app: ASGIApp
+        :param recorder: Where to record the requests
+        :type recorder: TrafficRecorder
+        """
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_body = bytearray()
+        response_body = bytearray()
+        status = 500
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                self._collect(request_body, message)
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and status == 201:
+                self._collect(response_body, message)
+            await send(message)
+
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                self.recorder.record(
+                    self._entry(
+                        scope,
+                        route.path,
+                        started,
+                        time.perf_counter() - start,
+                        status,
+                        bytes(request_body),
+                        bytes(response_body),
+                    )
+                )
+
+    def _collect(self, body: bytearray, message: Message) -> None:
+        # Bodies too large to decode are not kept in memory either
+        if len(body) <= self.MAX_BODY:
+            body.extend(message.get("body", b""))
+
+    def _entry(
+        self,
+        scope: Scope,
+        route: str,
+        started: float,
+        duration: float,
+        status: int,
+        request_body: bytes,
+        response_body: bytes,
+    ) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "t": round(started, 6),
+            "m": scope["method"],
+            "r": route,
+            "s": status,
+            "d": round(duration, 6),
+        }
+        order_id = scope.get("path_params", {}).get("order_id")
+        if order_id is not None:
+            entry["o"] = str(order_id)
+        if scope.get("query_string"):
+            entry["q"] = sorted(
+                {
+                    pair.split(b"=")[0].decode("latin-1")
+                    for pair in scope["query_string"].split(b"&")
+                }
+            )
+        body = self._decode(request_body)
+        if body is not None:
+            entry["b"] = body_shape(body)
+        created = self._decode(response_body)
+        if isinstance(created, dict) and "id" in created:
+            entry["c"] = str(created["id"])
+        return entry
+
+    def _decode(self, body: bytes) -> Optional[Any]:
+        if not body or len(body) > self.MAX_BODY:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
@@ -0,0 +1,64 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from layered_architecture.db.routing import ConsistencyState, consistency_scope
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client's reads to the primary shortly after its own writes.
+
+    A request that commits a write gets a cookie with the write time. Reads
+    carrying a recent cookie, or an ``X-Consistency: strong`` header, skip
+    the replicas.
+    """
+
+    COOKIE_NAME = "last_write"
+    HEADER_NAME = "x-consistency"
+
+    def __init__(self, app: ASGIApp, window: float) -> None:
+        """Initialize the middleware.
+
+        :param app: The ASGI application to wrap
+        :type app: ASGIApp
+        :param window: Seconds a client reads from the primary after a write
+        :type window: float
+        """
+        self.app = app
+        self.window = window
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = ConsistencyState(
+            force_primary=self._requires_primary(HTTPConnection(scope))
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.wrote:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{self.COOKIE_NAME}={time.time():.3f}; "
+                    f"Max-Age={int(self.window) or 1}; Path=/; HttpOnly; "
+                    "SameSite=lax",
+                )
+            await send(message)
+
+        with consistency_scope(state):
+            await self.app(scope, receive, send_wrapper)
+
+    def _requires_primary(self, connection: HTTPConnection) -> bool:
+        if connection.headers.get(self.HEADER_NAME, "").lower() == "strong":
+            return True
+        try:
+            last_write = float(connection.cookies.get(self.COOKIE_NAME, ""))
+        except ValueError:
+            return False
+        return time.time() - last_write < self.window
@@ -0,0 +1,68 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from layered_architecture.observability.metrics import HTTPMetrics
+
+CLIENT_ERROR = "client_error"
+SERVER_ERROR = "server_error"
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Record rate, errors and duration of every HTTP request.
+
+    Requests are labelled by route template rather than path, so order ids
+    do not multiply the series. Error responses are counted under the code
+    the error handler set on ``request.state``, and exceptions escaping the
+    application as server errors.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HTTPMetrics) -> None:
+        """Initialize the middleware.
+
+        :param app: The ASGI application to wrap
+        :type app: ASGIApp
+        :param metrics: The metrics to record into
+        :type metrics: HTTPMetrics
+        """
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        self.metrics.in_flight += 1
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status_code = 500
+            error = SERVER_ERROR
+            raise
+        finally:
+            self.metrics.in_flight -= 1
+            if error is None and status_code >= 400:
+                default = CLIENT_ERROR if status_code < 500 else SERVER_ERROR
+                error = scope.get("state", {}).get("error_code", default)
+            route = scope.get("route")
+            self.metrics.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - start,
+                error,
+            )
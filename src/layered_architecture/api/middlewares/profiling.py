@@ -0,0 +1,99 @@
+import asyncio
+import cProfile
+import hmac
+import os
+import re
+import time
+import uuid
+from logging import getLogger
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """Profile single requests on demand with ``cProfile``.
+
+    A request carrying the profiling token in an ``X-Profile`` header or a
+    ``profile`` query parameter runs under the profiler. The profile is
+    stored in ``directory`` as ``<id>-<method>-<route>.prof`` and its id is
+    returned in an ``X-Profile-Id`` header.
+
+    The profiler sees everything the event loop runs while the request is
+    in flight, other requests included, so only one request is profiled at
+    a time and profiles are best taken at low concurrency.
+    """
+
+    HEADER_NAME = "x-profile"
+    QUERY_PARAM = "profile"
+    RESPONSE_HEADER = "x-profile-id"
+
+    def __init__(self, app: ASGIApp, directory: str, token: str) -> None:
+        """Initialize the middleware.
+
+        :param app: The ASGI application to wrap
+        :type app: ASGIApp
+        :param directory: Where to store the profiles
+        :type directory: str
+        :param token: Secret a request must present to be profiled
+        :type token: str
+        """
+        self.app = app
+        self.directory = directory
+        self.token = token
+        self._active = False
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if (
+            scope["type"] != "http"
+            or self._active
+            or not self._requested(HTTPConnection(scope))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(self.RESPONSE_HEADER, profile_id)
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self._active = False
+            path = self._path(profile_id, scope)
+            await asyncio.to_thread(self._dump, profiler, path)
+            logger.info(f"Stored profile of {scope['path']} in {path}")
+
+    def _requested(self, connection: HTTPConnection) -> bool:
+        presented: Optional[str] = connection.headers.get(
+            self.HEADER_NAME
+        ) or connection.query_params.get(self.QUERY_PARAM)
+        if not presented or not self.token:
+            return False
+        # compare_digest only takes ASCII strings, bytes take anything
+        return hmac.compare_digest(presented.encode(), self.token.encode())
+
+    def _path(self, profile_id: str, scope: Scope) -> str:
+        route = scope.get("route")
+        path: str = scope["path"] if route is None else route.path
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+        name = f"{profile_id}-{scope['method']}-{slug}.prof"
+        return os.path.join(self.directory, name)
+
+    def _dump(self, profiler: cProfile.Profile, path: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(path)
@@ -0,0 +1,81 @@
+from logging import getLogger
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from layered_architecture.observability import track_queries
+
+logger = getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Count the queries each request runs and report them.
+
+    The count and the time spent in the database are sent back in a
+    ``Server-Timing`` header and logged. Requests over the query budget and
+    statements repeated within one request, the signature of an N+1
+    pattern, are logged as warnings. With ``enforce`` the statement that
+    would exceed the budget fails instead.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budget: int = 0,
+        enforce: bool = False,
+        repeat_threshold: int = 5,
+    ) -> None:
+        """Initialize the middleware.
+
+        :param app: The ASGI application to wrap
+        :type app: ASGIApp
+        :param budget: Queries a request may run, 0 for no budget
+        :type budget: int
+        :param enforce: Whether to fail requests exceeding the budget
+        :type enforce: bool
+        :param repeat_threshold: Repetitions of a statement reported as N+1
+        :type repeat_threshold: int
+        """
+        self.app = app
+        self.budget = budget
+        self.enforce = enforce
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = f"{scope['method']} {scope['path']}"
+        enforced = self.budget if self.enforce and self.budget else None
+        with track_queries(request, budget=enforced) as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "server-timing",
+                        f"db;dur={stats.duration * 1000:.2f};"
+                        f'desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                logger.debug(
+                    f"{request} ran {stats.count} queries in "
+                    f"{stats.duration * 1000:.2f}ms"
+                )
+                if self.budget and stats.count > self.budget:
+                    logger.warning(
+                        f"{request} ran {stats.count} queries, over its "
+                        f"budget of {self.budget}"
+                    )
+                for statement, count in stats.repeated(self.repeat_threshold):
+                    logger.warning(
+                        f"Possible N+1 in {request}: statement ran {count} "
+                        f"times: {statement}"
+                    )
@@ -0,0 +1,56 @@
+from opentelemetry.propagate import extract
+from opentelemetry.trace import SpanKind, Tracer
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class TracingMiddleware:
+    """Run each request in a server span, the root of its trace.
+
+    A W3C ``traceparent`` header continues the caller's trace. The span is
+    named after the route template once the request has been routed.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        """Initialize the middleware.
+
+        :param app: The ASGI application to wrap
+        :type app: ASGIApp
+        :param tracer: The tracer creating the spans
+        :type tracer: Tracer
+        """
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with self.tracer.start_as_current_span(
+            method,
+            context=extract(HTTPConnection(scope).headers),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": method,
+                "url.path": scope["path"],
+            },
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute(
+                        "http.response.status_code", message["status"]
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
 from .orders import router as order_router
+from .reports import router as report_router
 
 router = APIRouter()
 
 router.include_router(order_router, prefix="/orders", tags=["orders"])
+router.include_router(report_router, prefix="/reports", tags=["reports"])
@@ -57,7 +57,7 @@ async def check_order_status(
     :raises ValueError: If the order is not found
     """
     order_service = await DependencyService.get_order_service_by_id(
-        order_id, db
+        order_id, db, read_only=True
     )
     return await order_service.check_status(order_id, current_user)
 
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends
+
+from layered_architecture.dto.report import (
+    ProductSalesDTO,
+    ServiceTypeSalesDTO,
+)
+from layered_architecture.dto.user import UserReadDTO
+from layered_architecture.enums import ReportPeriod, ServiceType
+from layered_architecture.services.concrete.fake_auth import FakeAuthService
+from layered_architecture.services.dependency import DependencyService
+from layered_architecture.services.interfaces.report import (
+    ReportServiceInterface,
+)
+
+router = APIRouter()
+
+
+@router.get("/sales/service-types/", response_model=List[ServiceTypeSalesDTO])
+async def service_type_sales(
+    period: ReportPeriod = ReportPeriod.DAY,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    service_type: ServiceType | None = None,
+    report_service: ReportServiceInterface = Depends(
+        DependencyService.get_report_service
+    ),
+    current_user: UserReadDTO = Depends(FakeAuthService.get_current_user),
+) -> List[ServiceTypeSalesDTO]:
+    """Report the sales per service type and hour or day.
+
+    :param period: Hourly or daily buckets
+    :type period: ReportPeriod
+    :param since: Start of the range, inclusive, naive times being UTC
+    :type since: datetime | None
+    :param until: End of the range, exclusive, defaults to now
+    :type until: datetime | None
+    :param service_type: Optional service type to filter by
+    :type service_type: ServiceType | None
+    :param report_service: The report service
+    :type report_service: ReportServiceInterface
+    :param current_user: The current authenticated user
+    :type current_user: UserReadDTO
+    :return: The sales, by bucket then service type
+    :rtype: List[ServiceTypeSalesDTO]
+    """
+    sales: List[ServiceTypeSalesDTO] = await report_service.service_type_sales(
+        period, since, until, service_type
+    )
+    return sales
+
+
+@router.get("/sales/products/", response_model=List[ProductSalesDTO])
+async def product_sales(
+    period: ReportPeriod = ReportPeriod.DAY,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    product_type: Literal["pizza", "beer"] | None = None,
+    report_service: ReportServiceInterface = Depends(
+        DependencyService.get_report_service
+    ),
+    current_user: UserReadDTO = Depends(FakeAuthService.get_current_user),
+) -> List[ProductSalesDTO]:
+    """Report the sales per product and hour or day.
+
+    :param period: Hourly or daily buckets
+    :type period: ReportPeriod
+    :param since: Start of the range, inclusive, naive times being UTC
+    :type since: datetime | None
+    :param until: End of the range, exclusive, defaults to now
+    :type until: datetime | None
+    :param product_type: Optional product type to filter by
+    :type product_type: Literal["pizza", "beer"] | None
+    :param report_service: The report service
+    :type report_service: ReportServiceInterface
+    :param current_user: The current authenticated user
+    :type current_user: UserReadDTO
+    :return: The sales, by bucket then revenue, highest first
+    :rtype: List[ProductSalesDTO]
+    """
+    sales: List[ProductSalesDTO] = await report_service.product_sales(
+        period, since, until, product_type
+    )
+    return sales
@@ -0,0 +1,111 @@
+import glob
+import io
+import logging
+import logging.config
+import os
+import pstats
+import sys
+from typing import List, Optional
+
+import typer
+
+from layered_architecture.config.settings import settings
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="aggregate-profiles",
+    help="Aggregate stored request profiles",
+    add_completion=False,
+)
+
+SORT_KEYS = ["cumulative", "tottime", "calls", "ncalls", "time"]
+
+
+def find_profiles(directory: str, pattern: str) -> List[str]:
+    """Find stored profiles matching a file name pattern.
+
+    :param directory: The directory holding the profiles
+    :type directory: str
+    :param pattern: Glob the profile file names must match
+    :type pattern: str
+    :return: The matching profile paths, oldest first
+    :rtype: List[str]
+    """
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+def aggregate(
+    paths: List[str],
+    sort: str = "cumulative",
+    limit: int = 30,
+    output: Optional[str] = None,
+) -> str:
+    """Merge profiles and render their hottest functions.
+
+    :param paths: The profiles to merge
+    :type paths: List[str]
+    :param sort: The ``pstats`` key to sort by
+    :type sort: str
+    :param limit: How many functions to show
+    :type limit: int
+    :param output: Where to store the merged profile, if anywhere
+    :type output: Optional[str]
+    :return: The report
+    :rtype: str
+    """
+    stream = io.StringIO()
+    stats = pstats.Stats(*paths, stream=stream)
+    if output:
+        stats.dump_stats(output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+@app.command()
+def aggregate_profiles(
+    directory: str = typer.Option(
+        settings.PROFILING_DIR,
+        "--directory",
+        "-d",
+        help="Directory holding the stored profiles",
+    ),
+    pattern: str = typer.Option(
+        "*.prof",
+        "--pattern",
+        "-p",
+        help="Glob of the profiles to merge, e.g. '*-POST-v1_orders.prof'",
+    ),
+    sort: str = typer.Option(
+        "cumulative",
+        "--sort",
+        "-s",
+        help=f"Sort key, one of {', '.join(SORT_KEYS)}",
+    ),
+    limit: int = typer.Option(
+        30, "--limit", "-n", help="Number of functions to show"
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Store the merged profile, e.g. for snakeviz",
+    ),
+) -> None:
+    """Merge stored request profiles and print the hottest functions."""
+    if sort not in SORT_KEYS:
+        typer.echo(f"Error: unsupported sort key {sort}", err=True)
+        sys.exit(1)
+    paths = find_profiles(directory, pattern)
+    if not paths:
+        typer.echo(f"No profiles matching {pattern} in {directory}.")
+        return
+    logger.info(f"Aggregating {len(paths)} profiles from {directory}")
+    typer.echo(f"Merged {len(paths)} profiles:")
+    typer.echo(aggregate(paths, sort, limit, output))
+
+
+if __name__ == "__main__":
+    app()
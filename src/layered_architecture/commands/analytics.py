@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import logging.config
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import typer
+
+from layered_architecture.config.settings import settings
+from layered_architecture.db.session import BATCH_PROFILE, engines
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="analytics",
+    help="Snapshot orders into columns and report on them",
+    add_completion=False,
+)
+
+
+def _table(
+    headers: Sequence[str],
+    rows: List[Sequence[Any]],
+    title: str,
+    labels: int = 1,
+) -> str:
+    # The first ``labels`` columns are text, aligned left; numbers right
+    cells = [[str(value) for value in row] for row in rows]
+    widths = [
+        max([len(header), *(len(row[index]) for row in cells)])
+        for index, header in enumerate(headers)
+    ]
+    lines = [
+        title,
+        "  ".join(
+            header.ljust(width) for header, width in zip(headers, widths)
+        ),
+    ]
+    for row in cells:
+        lines.append(
+            "  ".join(
+                cell.ljust(width) if index < labels else cell.rjust(width)
+                for index, (cell, width) in enumerate(zip(row, widths))
+            )
+        )
+    return "\n".join(lines)
+
+
+def render(report: Dict[str, Any]) -> str:
+    """Render a report as text tables.
+
+    :param report: The report from ``build_report``
+    :type report: Dict[str, Any]
+    :return: The tables
+    :rtype: str
+    """
+    revenue = report["revenue"]
+    basket = report["basket"]
+    return "\n\n".join(
+        [
+            f"Revenue {revenue['total']:.2f} over {revenue['orders']} orders, "
+            f"{basket['avg_total']:.2f} per order, "
+            f"{basket['avg_lines']} lines and "
+            f"{basket['avg_quantity']} products per order",
+            _table(
+                ("period", "orders", "revenue"),
+                [
+                    (row["period"], row["orders"], f"{row['revenue']:.2f}")
+                    for row in revenue["by_period"]
+                ],
+                "Revenue by period",
+            ),
+            _table(
+                ("service type", "orders", "revenue", "avg total", "share"),
+                [
+                    (
+                        row["service_type"],
+                        row["orders"],
+                        f"{row['revenue']:.2f}",
+                        f"{row['avg_total']:.2f}",
+                        f"{row['share']:.1%}",
+                    )
+                    for row in report["service_types"]
+                ],
+                "Service types",
+            ),
+            _table(
+                ("type", "product", "quantity", "revenue"),
+                [
+                    (
+                        row["type"],
+                        row["name"],
+                        row["quantity"],
+                        f"{row['revenue']:.2f}",
+                    )
+                    for row in report["popularity"]
+                ],
+                "Best sellers",
+                labels=2,
+            ),
+        ]
+    )
+
+
+async def _snapshot(directory: str) -> int:
+    """Write a snapshot of a replica, of the primary if there is none.
+
+    :param directory: Where to write the snapshot
+    :type directory: str
+    :return: The number of orders in the snapshot
+    :rtype: int
+    """
+    from layered_architecture.analytics import write_snapshot
+
+    try:
+        async with engines.lifespan():
+            # The long scan of every order is kept off the primary
+            engine = engines.replicas(
+                BATCH_PROFILE
+            ).choose() or engines.primary(BATCH_PROFILE)
+            snapshot = await write_snapshot(engine, directory)
+            return int(snapshot.meta["orders"])
+    except Exception as e:
+        logger.error(f"Error writing snapshot: {str(e)}", exc_info=True)
+        raise
+
+
+@app.command()
+def snapshot(
+    directory: str = typer.Argument(..., help="Directory to write to"),
+) -> None:
+    """Export orders and items into memory-mappable NumPy columns."""
+    try:
+        logger.info("Starting analytics snapshot command")
+        orders = asyncio.run(_snapshot(directory))
+        logger.info("Successfully completed analytics snapshot command")
+        typer.echo(f"Wrote a snapshot of {orders} orders to {directory}.")
+    except KeyboardInterrupt:
+        logger.warning("Operation cancelled by user")
+        typer.echo("\nOperation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(
+            f"Error in analytics snapshot command: {str(e)}", exc_info=True
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+@app.command()
+def report(
+    directory: str = typer.Argument(..., help="Snapshot directory"),
+    since: Optional[datetime] = typer.Option(
+        None, help="Only orders created at or after this time, UTC"
+    ),
+    until: Optional[datetime] = typer.Option(
+        None, help="Only orders created before this time, UTC"
+    ),
+    period: str = typer.Option(
+        "day", "--period", "-p", help="Revenue bucket: hour, day or month"
+    ),
+    top: int = typer.Option(10, "--top", "-n", help="Best sellers to list"),
+    include_cancelled: bool = typer.Option(
+        False, help="Count cancelled orders"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print JSON"),
+) -> None:
+    """Report revenue, baskets, best sellers and service types.
+
+    Reports run over a snapshot, not the database, so they never load the
+    primary.
+    """
+    try:
+        from layered_architecture.analytics import Snapshot, build_report
+
+        result = build_report(
+            Snapshot.load(directory),
+            since=since,
+            until=until,
+            include_cancelled=include_cancelled,
+            period=period,
+            top=top,
+        )
+        typer.echo(json.dumps(result, indent=2) if as_json else render(result))
+    except Exception as e:
+        logger.error(
+            f"Error in analytics report command: {str(e)}", exc_info=True
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
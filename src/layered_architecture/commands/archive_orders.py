@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import logging.config
+import sys
+from datetime import datetime, timedelta, timezone
+
+import typer
+
+from layered_architecture.config.settings import settings
+from layered_architecture.dao.concrete.order_archive import (
+    archive_orders as archive,
+)
+from layered_architecture.db.session import BATCH_PROFILE, engines
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="archive-orders",
+    help="Move old finished orders to the archive tables",
+    add_completion=False,
+)
+
+
+async def _archive_orders(before: datetime, batch_size: int) -> int:
+    """Archive the finished orders of the primary database.
+
+    :param before: Only orders created before this time
+    :type before: datetime
+    :param batch_size: Orders moved per transaction
+    :type batch_size: int
+    :return: The number of orders archived
+    :rtype: int
+    """
+    try:
+        async with engines.lifespan():
+            archived: int = await archive(
+                engines.primary(BATCH_PROFILE), before, batch_size
+            )
+            return archived
+    except Exception as e:
+        logger.error(f"Error archiving orders: {str(e)}", exc_info=True)
+        raise
+
+
+@app.command()
+def archive_orders(
+    days: int = typer.Option(
+        settings.ARCHIVE_AFTER_DAYS,
+        "--days",
+        "-d",
+        help="Archive orders created more than this many days ago",
+    ),
+    batch_size: int = typer.Option(
+        settings.ARCHIVE_BATCH_SIZE, help="Orders moved per transaction"
+    ),
+) -> None:
+    """Move delivered and cancelled orders, with their items, to the
+    archive tables.
+
+    Archived orders are still found by id, but no longer weigh on the
+    order tables and their indexes. Safe to run next to the application.
+    """
+    try:
+        logger.info("Starting archive_orders command")
+        before = datetime.now(timezone.utc) - timedelta(days=days)
+        archived = asyncio.run(_archive_orders(before, batch_size))
+        logger.info("Successfully completed archive_orders command")
+        typer.echo(f"Archived {archived} orders created before {before}.")
+    except KeyboardInterrupt:
+        logger.warning("Operation cancelled by user")
+        typer.echo("\nOperation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(
+            f"Error in archive_orders command: {str(e)}", exc_info=True
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -8,7 +8,7 @@ import typer
 
 from layered_architecture.config.settings import settings
 from layered_architecture.db.models.order import ServiceType
-from layered_architecture.db.session import AsyncDBContextManager
+from layered_architecture.db.session import AsyncDBContextManager, engines
 from layered_architecture.services.dependency import DependencyService
 
 # Configure logging
@@ -31,7 +31,7 @@ async def _cancel_pending_orders(
     :type reason: Optional[str]
     """
     try:
-        async with AsyncDBContextManager() as db:
+        async with engines.lifespan(), AsyncDBContextManager() as db:
             logger.info("Starting cancellation of pending orders")
             auth_service = await DependencyService.get_auth_service()
             system_user = await auth_service.get_system_user()
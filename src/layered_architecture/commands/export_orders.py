@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import logging.config
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import typer
+from sqlalchemy import Row, Select, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from layered_architecture.commands.order_records import (
+    FIELDS,
+    RecordWriter,
+    detect_format,
+)
+from layered_architecture.config.settings import settings
+from layered_architecture.db.models import (
+    ArchivedOrder,
+    ArchivedOrderBeer,
+    ArchivedOrderPizza,
+    Beer,
+    Order,
+    OrderBeer,
+    OrderPizza,
+    Pizza,
+)
+from layered_architecture.db.session import BATCH_PROFILE, engines
+from layered_architecture.enums import OrderStatus, ServiceType
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="export-orders",
+    help="Export orders to NDJSON or CSV",
+    add_completion=False,
+)
+
+BATCH_SIZE = 5000
+ORDER_FIELDS = [name for name in FIELDS if name != "items"]
+# Item tables, hot and archived, with their product id and product table
+ITEM_TABLES = (
+    ("pizza", OrderPizza, OrderPizza.pizza_id, Pizza),
+    ("pizza", ArchivedOrderPizza, ArchivedOrderPizza.pizza_id, Pizza),
+    ("beer", OrderBeer, OrderBeer.beer_id, Beer),
+    ("beer", ArchivedOrderBeer, ArchivedOrderBeer.beer_id, Beer),
+)
+
+
+def orders_query(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    statuses: Sequence[OrderStatus] = (),
+    service_types: Sequence[ServiceType] = (),
+) -> Select:
+    """Build the query of the orders to export, oldest first.
+
+    Archived orders are exported along with the others.
+
+    :param since: Only orders created at or after this time
+    :type since: Optional[datetime]
+    :param until: Only orders created before this time
+    :type until: Optional[datetime]
+    :param statuses: Only orders in these statuses, all if empty
+    :type statuses: Sequence[OrderStatus]
+    :param service_types: Only orders of these service types, all if empty
+    :type service_types: Sequence[ServiceType]
+    :return: The query
+    :rtype: Select
+    """
+    queries = []
+    for model in (Order, ArchivedOrder):
+        query = select(*(getattr(model, name) for name in ORDER_FIELDS))
+        if since is not None:
+            query = query.where(model.created_at >= since)
+        if until is not None:
+            query = query.where(model.created_at < until)
+        if statuses:
+            query = query.where(model.status.in_(statuses))
+        if service_types:
+            query = query.where(model.service_type.in_(service_types))
+        queries.append(query)
+    orders = union_all(*queries).subquery("orders")
+    return select(orders).order_by(orders.c.created_at, orders.c.id)
+
+
+async def _items(
+    conn: AsyncConnection, orders: Sequence[Row]
+) -> Dict[UUID, List[Dict[str, Any]]]:
+    # The batch's creation times bound the item partitions to read
+    order_ids = [order.id for order in orders]
+    first = min(order.created_at for order in orders)
+    last = max(order.created_at for order in orders)
+    queries = [
+        select(
+            model.order_id,
+            literal(kind).label("type"),
+            product.name,
+            model.quantity,
+            model.price,
+        )
+        .join(product, product.id == product_id)
+        .where(
+            model.order_id.in_(order_ids),
+            model.order_created_at.between(first, last),
+        )
+        for kind, model, product_id, product in ITEM_TABLES
+    ]
+    items: Dict[UUID, List[Dict[str, Any]]] = defaultdict(list)
+    for order_id, kind, name, quantity, price in await conn.execute(
+        union_all(*queries)
+    ):
+        items[order_id].append(
+            {
+                "type": kind,
+                "product_name": name,
+                "quantity": quantity,
+                "price": price,
+            }
+        )
+    return items
+
+
+async def export(
+    engine: AsyncEngine, query: Select, writer: RecordWriter
+) -> int:
+    """Stream the orders of a query to a writer.
+
+    Orders are read through a server-side cursor and their items fetched
+    per batch, so memory use does not grow with the number of orders.
+
+    :param engine: The engine of the source database
+    :type engine: AsyncEngine
+    :param query: The orders to export
+    :type query: Select
+    :param writer: Where to write the records
+    :type writer: RecordWriter
+    :return: The number of exported orders
+    :rtype: int
+    """
+    exported = 0
+    async with engine.connect() as conn:
+        result = await conn.stream(
+            query, execution_options={"yield_per": BATCH_SIZE}
+        )
+        async for rows in result.partitions():
+            items = await _items(conn, rows)
+            for row in rows:
+                record = dict(row._mapping)
+                record["service_type"] = row.service_type.value
+                record["status"] = row.status.value
+                record["items"] = items.get(row.id, [])
+                writer.write(record)
+            exported += len(rows)
+            logger.info(f"Exported {exported} orders")
+    return exported
+
+
+async def _export_orders(
+    output: str,
+    format: str,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    statuses: List[OrderStatus],
+    service_types: List[ServiceType],
+) -> int:
+    """Export the matching orders to a file.
+
+    :param output: The file to write
+    :type output: str
+    :param format: ``ndjson`` or ``csv``
+    :type format: str
+    :param since: Only orders created at or after this time
+    :type since: Optional[datetime]
+    :param until: Only orders created before this time
+    :type until: Optional[datetime]
+    :param statuses: Only orders in these statuses, all if empty
+    :type statuses: List[OrderStatus]
+    :param service_types: Only orders of these service types, all if empty
+    :type service_types: List[ServiceType]
+    :return: The number of exported orders
+    :rtype: int
+    """
+    try:
+        async with engines.lifespan():
+            query = orders_query(since, until, statuses, service_types)
+            with open(output, "w", encoding="utf-8", newline="") as file:
+                return await export(
+                    engines.primary(BATCH_PROFILE),
+                    query,
+                    RecordWriter(file, format),
+                )
+    except Exception as e:
+        logger.error(f"Error exporting orders: {str(e)}", exc_info=True)
+        raise
+
+
+@app.command()
+def export_orders(
+    output: str = typer.Argument(..., help="File to write, .csv or .ndjson"),
+    format: Optional[str] = typer.Option(
+        None, "--format", "-f", help="ndjson or csv, from the extension"
+    ),
+    since: Optional[datetime] = typer.Option(
+        None, help="Only orders created at or after this time"
+    ),
+    until: Optional[datetime] = typer.Option(
+        None, help="Only orders created before this time"
+    ),
+    status: List[OrderStatus] = typer.Option(
+        [], "--status", "-s", help="Only orders in this status, repeatable"
+    ),
+    service_type: List[ServiceType] = typer.Option(
+        [], "--service-type", "-t", help="Only orders of this type, repeatable"
+    ),
+) -> None:
+    """Export orders to NDJSON or CSV, one record per order."""
+    try:
+        logger.info("Starting export_orders command")
+        exported = asyncio.run(
+            _export_orders(
+                output,
+                detect_format(output, format),
+                since,
+                until,
+                status,
+                service_type,
+            )
+        )
+        logger.info("Successfully completed export_orders command")
+        typer.echo(f"Exported {exported} orders to {output}.")
+    except KeyboardInterrupt:
+        logger.warning("Operation cancelled by user")
+        typer.echo("\nOperation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(
+            f"Error in export_orders command: {str(e)}", exc_info=True
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,500 @@
+import asyncio
+import logging
+import logging.config
+import math
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+import typer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from layered_architecture.config.settings import settings
+from layered_architecture.dao.concrete.sales_rollup import (
+    rebuild_sales_rollups,
+)
+from layered_architecture.db.copy import copy_records, driver_connection
+from layered_architecture.db.models import (
+    Beer,
+    Order,
+    OrderBeer,
+    OrderPizza,
+    Pizza,
+)
+from layered_architecture.db.models.mixins import uuid7
+from layered_architecture.db.partitions import ensure_partitions
+from layered_architecture.db.session import BATCH_PROFILE, engines
+from layered_architecture.enums import OrderStatus, ServiceType
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="generate-data",
+    help="Generate synthetic orders in bulk",
+    add_completion=False,
+)
+
+# Share of orders per service type
+SERVICE_TYPE_MIX = {
+    ServiceType.DINE_IN: 0.35,
+    ServiceType.TAKEAWAY: 0.25,
+    ServiceType.DELIVERY: 0.30,
+    ServiceType.LATE_NIGHT: 0.10,
+}
+# Relative frequency of orders of 1 to 8 items
+ITEMS_PER_ORDER = (15, 30, 22, 14, 8, 5, 4, 2)
+# Relative frequency of orders per hour of the day, peaking at lunch and
+# dinner; from 10 PM to 4 AM only late night orders are taken
+DAY_HOURS = (0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 2, 5, 9, 8, 4, 2, 2, 4, 8, 10, 9, 6)
+LATE_NIGHT_HOURS = (22, 23, 0, 1, 2, 3)
+# Minutes an order spends in each status before moving on
+STATUS_MINUTES = (
+    (OrderStatus.PENDING, 5),
+    (OrderStatus.CONFIRMED, 10),
+    (OrderStatus.PREPARING, 25),
+    (OrderStatus.READY, 30),
+)
+CANCELLED_SHARE = 0.04
+NOTES_SHARE = 0.1
+NOTES = ("No onions", "Extra cheese", "Ring twice", "Well done", "Gluten free")
+STREETS = ("Main St", "High St", "Baker St", "Elm Ave", "Harbour Rd")
+DELIVERY_FEE = Decimal("5.00")
+LATE_NIGHT_SURCHARGE = Decimal("0.20")
+CENT = Decimal("0.01")
+
+ORDER_COLUMNS = (
+    "id",
+    "service_type",
+    "customer_id",
+    "status",
+    "subtotal",
+    "total",
+    "notes",
+    "delivery_address",
+    "created_at",
+    "updated_at",
+)
+PIZZA_COLUMNS = (
+    "id",
+    "order_id",
+    "order_created_at",
+    "pizza_id",
+    "quantity",
+    "price",
+)
+BEER_COLUMNS = (
+    "id",
+    "order_id",
+    "order_created_at",
+    "beer_id",
+    "quantity",
+    "price",
+)
+
+Product = Tuple[uuid.UUID, Decimal]
+
+
+@dataclass(frozen=True)
+class GenerationSpec:
+    """Everything the data depends on, shipped to the worker processes."""
+
+    seed: int
+    orders: int
+    chunk_size: int
+    customers: int
+    days: int
+    end: datetime
+    pizzas: Tuple[Product, ...]
+    beers: Tuple[Product, ...]
+
+    @property
+    def chunks(self) -> int:
+        """Number of chunks the orders are generated in."""
+        return math.ceil(self.orders / self.chunk_size)
+
+
+@dataclass
+class Chunk:
+    """Rows of a chunk of orders, ready to copy."""
+
+    orders: List[Tuple[Any, ...]] = field(default_factory=list)
+    order_pizzas: List[Tuple[Any, ...]] = field(default_factory=list)
+    order_beers: List[Tuple[Any, ...]] = field(default_factory=list)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _popularity(size: int) -> List[float]:
+    # Zipf-like: the n-th product sells 1/n as much as the first
+    cumulative, total = [], 0.0
+    for rank in range(1, size + 1):
+        total += 1 / rank
+        cumulative.append(total)
+    return cumulative
+
+
+def _created_at(
+    rng: random.Random, spec: GenerationSpec, service_type: ServiceType
+) -> datetime:
+    while True:
+        day = spec.end.date() - timedelta(days=rng.randrange(spec.days))
+        if service_type == ServiceType.LATE_NIGHT:
+            hour = rng.choice(LATE_NIGHT_HOURS)
+        else:
+            hour = rng.choices(range(len(DAY_HOURS)), weights=DAY_HOURS)[0]
+        created = datetime.combine(
+            day, dt_time(hour), tzinfo=spec.end.tzinfo
+        ) + timedelta(seconds=rng.randrange(3600))
+        # Draw again rather than generate orders from the future
+        if created <= spec.end:
+            return created
+
+
+def _status(
+    rng: random.Random, age: timedelta
+) -> Tuple[OrderStatus, timedelta]:
+    if rng.random() < CANCELLED_SHARE:
+        return OrderStatus.CANCELLED, min(age, timedelta(minutes=3))
+    elapsed = timedelta()
+    for status, minutes in STATUS_MINUTES:
+        if age < elapsed + timedelta(minutes=minutes):
+            return status, elapsed
+        elapsed += timedelta(minutes=minutes)
+    return OrderStatus.DELIVERED, elapsed
+
+
+def generate_chunk(spec: GenerationSpec, index: int) -> Chunk:
+    """Generate one chunk of orders with their items.
+
+    The rows only depend on the specification and the chunk index, so the
+    data is the same whatever the number of workers.
+
+    :param spec: The generation parameters
+    :type spec: GenerationSpec
+    :param index: The chunk to generate
+    :type index: int
+    :return: The rows of the chunk
+    :rtype: Chunk
+    """
+    rng = random.Random(f"{spec.seed}:{index}")
+    pizza_weights = _popularity(len(spec.pizzas))
+    beer_weights = _popularity(len(spec.beers))
+    service_types = list(SERVICE_TYPE_MIX)
+    mix = list(SERVICE_TYPE_MIX.values())
+    chunk = Chunk()
+    count = min(spec.chunk_size, spec.orders - index * spec.chunk_size)
+    for _ in range(count):
+        order_id = _uuid(rng)
+        service_type = rng.choices(service_types, weights=mix)[0]
+        subtotal = Decimal("0")
+        items = rng.choices(
+            range(1, len(ITEMS_PER_ORDER) + 1), weights=ITEMS_PER_ORDER
+        )[0]
+        lines = []
+        for item in range(items):
+            # Most orders start with pizzas and add a beer or two
+            is_pizza = item == 0 or rng.random() < 0.6
+            menu, weights = (
+                (spec.pizzas, pizza_weights)
+                if is_pizza
+                else (spec.beers, beer_weights)
+            )
+            product_id, price = rng.choices(menu, cum_weights=weights)[0]
+            quantity = rng.choices((1, 2, 3, 4), weights=(70, 20, 7, 3))[0]
+            subtotal += price * quantity
+            lines.append((is_pizza, _uuid(rng), product_id, quantity, price))
+        total = subtotal
+        if service_type == ServiceType.DELIVERY:
+            total += DELIVERY_FEE
+        elif service_type == ServiceType.LATE_NIGHT:
+            total += (subtotal * LATE_NIGHT_SURCHARGE).quantize(CENT)
+        created_at = _created_at(rng, spec, service_type)
+        # Time-ordered ids, like the ones the application generates
+        order_id = uuid7(at=created_at, random=order_id.int)
+        # Items carry their order's creation time, their partition key
+        for is_pizza, line_id, product_id, quantity, price in lines:
+            (chunk.order_pizzas if is_pizza else chunk.order_beers).append(
+                (
+                    uuid7(at=created_at, random=line_id.int),
+                    order_id,
+                    created_at,
+                    product_id,
+                    quantity,
+                    price,
+                )
+            )
+        status, updated_after = _status(rng, spec.end - created_at)
+        customer = int(spec.customers * rng.random() ** 2)
+        chunk.orders.append(
+            (
+                order_id,
+                service_type.name,
+                uuid.uuid5(uuid.NAMESPACE_OID, f"{spec.seed}:{customer}"),
+                status.name,
+                subtotal,
+                total,
+                rng.choice(NOTES) if rng.random() < NOTES_SHARE else None,
+                (
+                    f"{rng.randint(1, 999)} {rng.choice(STREETS)}"
+                    if service_type == ServiceType.DELIVERY
+                    else None
+                ),
+                created_at,
+                created_at + updated_after,
+            )
+        )
+    return chunk
+
+
+def _menu_rows(
+    rng: random.Random, size: int, kind: str, low: int, high: int
+) -> List[Tuple[Any, ...]]:
+    return [
+        (
+            _uuid(rng),
+            f"{kind} {index:04d}",
+            Decimal(rng.randint(low * 100, high * 100)) / 100,
+        )
+        for index in range(size)
+    ]
+
+
+async def load_menu(
+    engine: AsyncEngine, size: int, seed: int
+) -> Tuple[Tuple[Product, ...], Tuple[Product, ...]]:
+    """Get the menu, creating one if the database has none.
+
+    :param engine: The engine of the target database
+    :type engine: AsyncEngine
+    :param size: Pizzas and beers to create on an empty menu
+    :type size: int
+    :param seed: Seed of the created menu
+    :type seed: int
+    :return: Id and price of the pizzas and of the beers
+    :rtype: Tuple[Tuple[Product, ...], Tuple[Product, ...]]
+    """
+    async with engine.connect() as conn:
+        pizzas = tuple(
+            (row.id, row.price)
+            for row in await conn.execute(
+                select(Pizza.id, Pizza.price).order_by(Pizza.name)
+            )
+        )
+        beers = tuple(
+            (row.id, row.price)
+            for row in await conn.execute(
+                select(Beer.id, Beer.price).order_by(Beer.name)
+            )
+        )
+    if pizzas and beers:
+        return pizzas, beers
+
+    rng = random.Random(f"{seed}:menu")
+    pizza_rows = _menu_rows(rng, size, "Pizza", 9, 20)
+    beer_rows = _menu_rows(rng, size, "Beer", 4, 10)
+    async with driver_connection(engine) as driver, driver.transaction():
+        await copy_records(
+            driver,
+            Pizza.__table__,
+            ("id", "name", "price"),
+            pizza_rows,
+        )
+        await copy_records(
+            driver,
+            Beer.__table__,
+            ("id", "name", "price", "brand", "is_tap"),
+            [
+                row + ("Generated", index % 3 == 0)
+                for index, row in enumerate(beer_rows)
+            ],
+        )
+    logger.info(f"Created a menu of {size} pizzas and {size} beers")
+    return (
+        tuple((row[0], row[2]) for row in pizza_rows),
+        tuple((row[0], row[2]) for row in beer_rows),
+    )
+
+
+async def _copy_chunk(engine: AsyncEngine, chunk: Chunk) -> None:
+    # Each chunk commits on its own, so an interrupted run keeps whole orders
+    async with driver_connection(engine) as driver, driver.transaction():
+        await copy_records(
+            driver, Order.__table__, ORDER_COLUMNS, chunk.orders
+        )
+        await copy_records(
+            driver, OrderPizza.__table__, PIZZA_COLUMNS, chunk.order_pizzas
+        )
+        await copy_records(
+            driver, OrderBeer.__table__, BEER_COLUMNS, chunk.order_beers
+        )
+
+
+async def generate(
+    spec: GenerationSpec, engine: AsyncEngine, workers: int
+) -> None:
+    """Generate the chunks in worker processes and copy them in parallel.
+
+    :param spec: The generation parameters
+    :type spec: GenerationSpec
+    :param engine: The engine of the target database
+    :type engine: AsyncEngine
+    :param workers: Processes generating rows, and connections copying them
+    :type workers: int
+    """
+    loop = asyncio.get_running_loop()
+    indices = iter(range(spec.chunks))
+    done = 0
+    start = time.perf_counter()
+
+    async def stream(pool: ProcessPoolExecutor) -> None:
+        nonlocal done
+        # The streams share the iterator, each taking the next chunk
+        for index in indices:
+            chunk = await loop.run_in_executor(
+                pool, generate_chunk, spec, index
+            )
+            await _copy_chunk(engine, chunk)
+            done += 1
+            logger.info(
+                f"Copied chunk {done}/{spec.chunks} "
+                f"({len(chunk.orders)} orders) after "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+
+    with ProcessPoolExecutor(workers) as pool:
+        await asyncio.gather(*(stream(pool) for _ in range(workers)))
+
+
+async def _generate_data(
+    orders: int,
+    seed: int,
+    chunk_size: int,
+    workers: int,
+    customers: int,
+    days: int,
+    menu_size: int,
+    end: datetime,
+) -> None:
+    """Generate synthetic orders into the configured database.
+
+    :param orders: Orders to generate
+    :type orders: int
+    :param seed: Seed the data is derived from
+    :type seed: int
+    :param chunk_size: Orders per chunk, copied in one transaction
+    :type chunk_size: int
+    :param workers: Parallel generation processes and copy streams
+    :type workers: int
+    :param customers: Distinct customers placing the orders
+    :type customers: int
+    :param days: Days back from ``end`` the orders spread over
+    :type days: int
+    :param menu_size: Pizzas and beers to create on an empty menu
+    :type menu_size: int
+    :param end: Time of the most recent order
+    :type end: datetime
+    """
+    try:
+        async with engines.lifespan():
+            engine = engines.primary(BATCH_PROFILE)
+            pizzas, beers = await load_menu(engine, menu_size, seed)
+            spec = GenerationSpec(
+                seed=seed,
+                orders=orders,
+                chunk_size=chunk_size,
+                customers=customers,
+                days=days,
+                end=end,
+                pizzas=pizzas,
+                beers=beers,
+            )
+            logger.info(
+                f"Generating {orders} orders in {spec.chunks} chunks "
+                f"with {workers} workers"
+            )
+            # Copies only land in existing partitions
+            await ensure_partitions(
+                engine, since=end - timedelta(days=days + 1), until=end
+            )
+            await generate(spec, engine, workers)
+            # Copied orders bypass the DAO that keeps the rollups current
+            await rebuild_sales_rollups(engine)
+    except Exception as e:
+        logger.error(f"Error generating data: {str(e)}", exc_info=True)
+        raise
+
+
+@app.command()
+def generate_data(
+    orders: int = typer.Option(
+        1_000_000, "--orders", "-n", help="Orders to generate"
+    ),
+    seed: int = typer.Option(42, "--seed", "-s", help="Random seed"),
+    chunk_size: int = typer.Option(
+        10_000, help="Orders per chunk, copied in one transaction"
+    ),
+    workers: int = typer.Option(
+        settings.DATABASE_BATCH_POOL_SIZE,
+        "--workers",
+        "-w",
+        help="Parallel streams, at most DATABASE_BATCH_POOL_SIZE + "
+        "DATABASE_BATCH_MAX_OVERFLOW connect at once",
+    ),
+    customers: int = typer.Option(100_000, help="Distinct customers"),
+    days: int = typer.Option(365, help="Days of history"),
+    menu_size: int = typer.Option(
+        50, help="Pizzas and beers to create if the menu is empty"
+    ),
+    end: Optional[datetime] = typer.Option(
+        None,
+        help="Time of the most recent order, midnight UTC today by default",
+    ),
+) -> None:
+    """Generate synthetic orders in bulk with COPY.
+
+    The same seed, volumes and end time always generate the same data.
+    """
+    end = end or datetime.combine(datetime.now(timezone.utc).date(), dt_time())
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    try:
+        logger.info("Starting generate_data command")
+        asyncio.run(
+            _generate_data(
+                orders,
+                seed,
+                chunk_size,
+                workers,
+                customers,
+                days,
+                menu_size,
+                end,
+            )
+        )
+        logger.info("Successfully completed generate_data command")
+        typer.echo(f"Generated {orders} orders.")
+    except KeyboardInterrupt:
+        logger.warning("Operation cancelled by user")
+        typer.echo("\nOperation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(
+            f"Error in generate_data command: {str(e)}", exc_info=True
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,379 @@
+import asyncio
+import itertools
+import logging
+import logging.config
+import sys
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import typer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from layered_architecture.commands.generate_data import (
+    BEER_COLUMNS,
+    ORDER_COLUMNS,
+    PIZZA_COLUMNS,
+    Product,
+)
+from layered_architecture.commands.order_records import (
+    InvalidRecord,
+    detect_format,
+    parse_datetime,
+    read_records,
+)
+from layered_architecture.config.settings import settings
+from layered_architecture.dao.concrete.sales_rollup import (
+    rebuild_sales_rollups,
+)
+from layered_architecture.db.copy import (
+    copy_new_records,
+    copy_records,
+    driver_connection,
+)
+from layered_architecture.db.models import (
+    Beer,
+    Order,
+    OrderBeer,
+    OrderPizza,
+    Pizza,
+)
+from layered_architecture.db.models.mixins import uuid7
+from layered_architecture.db.partitions import ensure_partitions
+from layered_architecture.db.session import BATCH_PROFILE, engines
+from layered_architecture.dto.order import (
+    MAX_ADDRESS_LENGTH,
+    MAX_AMOUNT,
+    MAX_NOTES_LENGTH,
+    MAX_QUANTITY,
+)
+from layered_architecture.enums import OrderStatus, ServiceType
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="import-orders",
+    help="Import orders from NDJSON or CSV",
+    add_completion=False,
+)
+
+PRODUCTS = {"pizza": Pizza, "beer": Beer}
+
+
+class ProductResolver:
+    """Resolve product names, querying unknown names per batch."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        """Initialize the resolver.
+
+        :param engine: The engine of the target database
+        :type engine: AsyncEngine
+        """
+        self.engine = engine
+        # None marks names known to be missing, so they are not queried again
+        self.products: Dict[str, Dict[str, Optional[Product]]] = {
+            kind: {} for kind in PRODUCTS
+        }
+
+    async def load(self, records: List[Any]) -> None:
+        """Look up the products of a batch not resolved yet.
+
+        Malformed records and items are ignored, ``to_rows`` rejects them.
+
+        :param records: The batch of order records
+        :type records: List[Any]
+        """
+        wanted: Dict[str, set] = {kind: set() for kind in PRODUCTS}
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            items = record.get("items")
+            for item in items if isinstance(items, list) else []:
+                if not isinstance(item, dict):
+                    continue
+                kind, name = item.get("type"), item.get("product_name")
+                if (
+                    kind in PRODUCTS
+                    and isinstance(name, str)
+                    and name not in self.products[kind]
+                ):
+                    wanted[kind].add(name)
+        async with self.engine.connect() as conn:
+            for kind, names in wanted.items():
+                if not names:
+                    continue
+                model = PRODUCTS[kind]
+                found: Dict[str, Optional[Product]] = dict.fromkeys(names)
+                rows = await conn.execute(
+                    select(model.name, model.id, model.price)
+                    .where(model.name.in_(names))
+                    .order_by(model.name, model.id)
+                )
+                for name, product_id, price in rows:
+                    # Duplicate names resolve to the same, first product
+                    if found[name] is None:
+                        found[name] = (product_id, price)
+                self.products[kind].update(found)
+
+    def get(self, kind: str, name: str) -> Optional[Product]:
+        """Get the id and menu price of a product loaded before.
+
+        :param kind: ``pizza`` or ``beer``
+        :type kind: str
+        :param name: The product name
+        :type name: str
+        :return: The product id and price, None if there is no such product
+        :rtype: Optional[Product]
+        """
+        return self.products.get(kind, {}).get(name)
+
+
+@dataclass
+class Rows:
+    """Rows of a batch of orders, ready to copy."""
+
+    orders: List[Tuple[Any, ...]] = field(default_factory=list)
+    order_pizzas: List[Tuple[Any, ...]] = field(default_factory=list)
+    order_beers: List[Tuple[Any, ...]] = field(default_factory=list)
+
+
+def _amount(value: Any, name: str) -> Decimal:
+    try:
+        amount = Decimal(str(value))
+    except ArithmeticError as e:
+        raise ValueError(f"Invalid {name}: {e!r}") from e
+    if not amount.is_finite() or abs(amount) > MAX_AMOUNT:
+        raise ValueError(f"{name} out of bounds: {value}")
+    return amount
+
+
+def to_rows(record: Any, resolver: ProductResolver, rows: Rows) -> None:
+    """Convert an order record into rows.
+
+    :param record: The order record, as read
+    :type record: Any
+    :param resolver: Resolver the record's products were loaded into
+    :type resolver: ProductResolver
+    :param rows: Rows to add the order and its items to
+    :type rows: Rows
+    :raises ValueError: If the record is invalid or names unknown products
+    """
+    if isinstance(record, InvalidRecord):
+        raise ValueError(f"Line {record.line}: {record.error}")
+    if not isinstance(record, dict):
+        raise ValueError(f"Invalid order: {record!r}")
+    try:
+        order_id = uuid.UUID(str(record["id"])) if record.get("id") else None
+        service_type = ServiceType[str(record["service_type"]).upper()]
+        status = OrderStatus[str(record.get("status") or "pending").upper()]
+        customer_id = uuid.UUID(str(record["customer_id"]))
+        subtotal = _amount(record["subtotal"], "subtotal")
+        total = _amount(record["total"], "total")
+    except (KeyError, ValueError, ArithmeticError) as e:
+        raise ValueError(f"Invalid order: {e!r}") from e
+    # Rejected here, a value out of bounds would fail the whole batch
+    for field_name, limit in (
+        ("notes", MAX_NOTES_LENGTH),
+        ("delivery_address", MAX_ADDRESS_LENGTH),
+    ):
+        if len(record.get(field_name) or "") > limit:
+            raise ValueError(f"{field_name} longer than {limit} characters")
+    created_at = parse_datetime(record.get("created_at"))
+    order_id = order_id or uuid7(at=created_at)
+    pizzas: List[Tuple[Any, ...]] = []
+    beers: List[Tuple[Any, ...]] = []
+    items = record.get("items") or []
+    if not isinstance(items, list):
+        raise ValueError(f"Invalid items: {items!r}")
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid item: {item!r}")
+        kind, name = item.get("type"), item.get("product_name")
+        if not isinstance(kind, str) or not isinstance(name, str):
+            raise ValueError(f"Invalid item: {item!r}")
+        product = resolver.get(kind, name)
+        if product is None:
+            raise ValueError(f"Unknown {kind}: {name}")
+        product_id, price = product
+        quantity = int(item["quantity"])
+        if not 1 <= quantity <= MAX_QUANTITY:
+            raise ValueError(f"Invalid quantity of {name}: {quantity}")
+        # Records without prices are valued at today's menu
+        if item.get("price") is not None:
+            price = _amount(item["price"], f"price of {name}")
+        row = (
+            uuid7(at=created_at),
+            order_id,
+            created_at,
+            product_id,
+            quantity,
+            price,
+        )
+        (pizzas if kind == "pizza" else beers).append(row)
+    rows.orders.append(
+        (
+            order_id,
+            service_type.name,
+            customer_id,
+            status.name,
+            subtotal,
+            total,
+            record.get("notes"),
+            record.get("delivery_address"),
+            created_at,
+            (
+                parse_datetime(record["updated_at"])
+                if record.get("updated_at")
+                else created_at
+            ),
+        )
+    )
+    rows.order_pizzas += pizzas
+    rows.order_beers += beers
+
+
+def _batches(records: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    iterator = iter(records)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+async def import_records(
+    engine: AsyncEngine,
+    records: Iterable[Any],
+    batch_size: int = 5000,
+) -> Tuple[int, int]:
+    """Import order records in batches, each copied in one transaction.
+
+    Invalid records and orders already in the database are skipped, along
+    with their items.
+
+    :param engine: The engine of the target database
+    :type engine: AsyncEngine
+    :param records: The order records, read lazily
+    :type records: Iterable[Any]
+    :param batch_size: Orders per batch
+    :type batch_size: int
+    :return: The numbers of imported and of skipped orders
+    :rtype: Tuple[int, int]
+    """
+    resolver = ProductResolver(engine)
+    imported = skipped = 0
+    for batch in _batches(records, batch_size):
+        await resolver.load(batch)
+        rows = Rows()
+        for record in batch:
+            try:
+                to_rows(record, resolver, rows)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                skipped += 1
+                order_id = (
+                    record.get("id") if isinstance(record, dict) else None
+                )
+                logger.warning(f"Skipping order {order_id}: {e}")
+        if rows.orders:
+            # Copies only land in existing partitions
+            created = [
+                row[ORDER_COLUMNS.index("created_at")] for row in rows.orders
+            ]
+            await ensure_partitions(
+                engine, since=min(created), until=max(created)
+            )
+        async with driver_connection(engine) as driver, driver.transaction():
+            inserted = set(
+                await copy_new_records(
+                    driver, Order.__table__, ORDER_COLUMNS, rows.orders
+                )
+            )
+            for table, columns, items in (
+                (OrderPizza.__table__, PIZZA_COLUMNS, rows.order_pizzas),
+                (OrderBeer.__table__, BEER_COLUMNS, rows.order_beers),
+            ):
+                order_index = columns.index("order_id")
+                await copy_records(
+                    driver,
+                    table,
+                    columns,
+                    [item for item in items if item[order_index] in inserted],
+                )
+        if len(inserted) < len(rows.orders):
+            duplicates = len(rows.orders) - len(inserted)
+            skipped += duplicates
+            logger.warning(f"Skipping {duplicates} orders already imported")
+        imported += len(inserted)
+        logger.info(f"Imported {imported} orders, skipped {skipped}")
+    return imported, skipped
+
+
+async def _import_orders(
+    path: str, format: str, batch_size: int
+) -> Tuple[int, int]:
+    """Import the orders of a file.
+
+    :param path: The file to read
+    :type path: str
+    :param format: ``ndjson`` or ``csv``
+    :type format: str
+    :param batch_size: Orders per batch
+    :type batch_size: int
+    :return: The numbers of imported and of skipped orders
+    :rtype: Tuple[int, int]
+    """
+    try:
+        async with engines.lifespan():
+            engine = engines.primary(BATCH_PROFILE)
+            with open(path, encoding="utf-8", newline="") as file:
+                imported, skipped = await import_records(
+                    engine, read_records(file, format), batch_size
+                )
+            # Copied orders bypass the DAO that keeps the rollups current
+            if imported:
+                await rebuild_sales_rollups(engine)
+            return imported, skipped
+    except Exception as e:
+        logger.error(f"Error importing orders: {str(e)}", exc_info=True)
+        raise
+
+
+@app.command()
+def import_orders(
+    path: str = typer.Argument(..., help="File to read, .csv or .ndjson"),
+    format: Optional[str] = typer.Option(
+        None, "--format", "-f", help="ndjson or csv, from the extension"
+    ),
+    batch_size: int = typer.Option(
+        5000, "--batch-size", "-b", help="Orders per COPY transaction"
+    ),
+) -> None:
+    """Import orders from NDJSON or CSV, as written by export-orders.
+
+    Products are matched by name; orders naming unknown products,
+    missing required fields or already imported are skipped and logged.
+    """
+    try:
+        logger.info("Starting import_orders command")
+        imported, skipped = asyncio.run(
+            _import_orders(path, detect_format(path, format), batch_size)
+        )
+        logger.info("Successfully completed import_orders command")
+        typer.echo(f"Imported {imported} orders, skipped {skipped}.")
+        if skipped:
+            sys.exit(1)
+    except KeyboardInterrupt:
+        logger.warning("Operation cancelled by user")
+        typer.echo("\nOperation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(
+            f"Error in import_orders command: {str(e)}", exc_info=True
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
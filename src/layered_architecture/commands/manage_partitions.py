@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import logging.config
+import sys
+from datetime import datetime
+from typing import Any, Coroutine, List, Optional, Tuple
+
+import typer
+
+from layered_architecture.config.settings import settings
+from layered_architecture.db.partitions import (
+    detach_partitions,
+    ensure_partitions,
+    list_partitions,
+)
+from layered_architecture.db.session import BATCH_PROFILE, engines
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="manage-partitions",
+    help="Create, list and detach the monthly order partitions",
+    add_completion=False,
+)
+
+
+async def _ensure(months_ahead: Optional[int]) -> List[str]:
+    """Create the missing partitions of the primary database.
+
+    :param months_ahead: Months to create in advance
+    :type months_ahead: Optional[int]
+    :return: The names of the partitions created
+    :rtype: List[str]
+    """
+    try:
+        async with engines.lifespan():
+            created: List[str] = await ensure_partitions(
+                engines.primary(BATCH_PROFILE), months_ahead=months_ahead
+            )
+            return created
+    except Exception as e:
+        logger.error(f"Error creating partitions: {str(e)}", exc_info=True)
+        raise
+
+
+async def _detach(before: datetime, concurrently: bool) -> List[str]:
+    """Detach the old partitions of the primary database.
+
+    :param before: Partitions of months starting before this go
+    :type before: datetime
+    :param concurrently: Detach without blocking queries
+    :type concurrently: bool
+    :return: The names of the partitions detached
+    :rtype: List[str]
+    """
+    try:
+        async with engines.lifespan():
+            detached: List[str] = await detach_partitions(
+                engines.primary(BATCH_PROFILE), before, concurrently
+            )
+            return detached
+    except Exception as e:
+        logger.error(f"Error detaching partitions: {str(e)}", exc_info=True)
+        raise
+
+
+async def _list() -> List[Tuple[str, str, str]]:
+    """List the partitions of the primary database.
+
+    :return: Table, partition and bounds of each partition
+    :rtype: List[Tuple[str, str, str]]
+    """
+    try:
+        async with engines.lifespan():
+            partitions: List[Tuple[str, str, str]] = await list_partitions(
+                engines.primary(BATCH_PROFILE)
+            )
+            return partitions
+    except Exception as e:
+        logger.error(f"Error listing partitions: {str(e)}", exc_info=True)
+        raise
+
+
+def _run(name: str, command: Coroutine[Any, Any, List[Any]]) -> List[Any]:
+    try:
+        logger.info(f"Starting manage_partitions {name} command")
+        result = asyncio.run(command)
+        logger.info(f"Successfully completed manage_partitions {name} command")
+        return result
+    except KeyboardInterrupt:
+        logger.warning("Operation cancelled by user")
+        typer.echo("\nOperation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(
+            f"Error in manage_partitions {name} command: {str(e)}",
+            exc_info=True,
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+@app.command()
+def ensure(
+    months_ahead: Optional[int] = typer.Option(
+        None,
+        help="Months to create ahead, defaults to PARTITION_MONTHS_AHEAD",
+    ),
+) -> None:
+    """Create the partitions of this month and the coming ones.
+
+    The application does this itself every PARTITION_MAINTENANCE_SECONDS;
+    run it where that is disabled.
+    """
+    created = _run("ensure", _ensure(months_ahead))
+    typer.echo(f"Created {len(created)} partitions.")
+    for name in created:
+        typer.echo(name)
+
+
+@app.command()
+def detach(
+    before: datetime = typer.Option(
+        ...,
+        formats=["%Y-%m"],
+        help="Detach the partitions of months before this one, YYYY-MM",
+    ),
+    concurrently: bool = typer.Option(
+        True, help="Detach without blocking queries on the orders"
+    ),
+) -> None:
+    """Detach the partitions of old months.
+
+    Detached partitions keep their data as plain tables, which order
+    queries no longer read; archive or drop them afterwards. The sales
+    rollups keep counting their orders until rebuilt.
+    """
+    detached = _run("detach", _detach(before, concurrently))
+    typer.echo(f"Detached {len(detached)} partitions.")
+    for name in detached:
+        typer.echo(name)
+
+
+@app.command(name="list")
+def list_() -> None:
+    """List the partitions of the order tables and their bounds."""
+    for table, name, bound in _run("list", _list()):
+        typer.echo(f"{table}\t{name}\t{bound}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,163 @@
+import csv
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, Optional, TextIO, Union
+from uuid import UUID
+
+# Format of orders exchanged by the import and export commands: one record
+# per order, its items nested as a list of type, product name, quantity and
+# unit price
+FORMATS = ("ndjson", "csv")
+FIELDS = (
+    "id",
+    "service_type",
+    "customer_id",
+    "status",
+    "subtotal",
+    "total",
+    "notes",
+    "delivery_address",
+    "created_at",
+    "updated_at",
+    "items",
+)
+
+
+def detect_format(path: str, format: Optional[str] = None) -> str:
+    """Get the format of a file, from its extension unless given.
+
+    :param path: The file path
+    :type path: str
+    :param format: The format, if given explicitly
+    :type format: Optional[str]
+    :return: ``csv`` for ``.csv`` files, ``ndjson`` otherwise
+    :rtype: str
+    """
+    if format:
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        return format
+    return "csv" if os.path.splitext(path)[1].lower() == ".csv" else "ndjson"
+
+
+@dataclass
+class InvalidRecord:
+    """A record that could not be decoded, read in place of the order."""
+
+    line: int
+    error: str
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def read_records(
+    file: TextIO, format: str
+) -> Iterator[Union[Any, InvalidRecord]]:
+    """Read order records one at a time.
+
+    A record that cannot be decoded is read as an ``InvalidRecord``, so a
+    bad line is skipped like any invalid order instead of ending the read.
+    Decoded records are not validated and may not even be objects.
+
+    :param file: The file to read
+    :type file: TextIO
+    :param format: ``ndjson`` or ``csv``
+    :type format: str
+    :yield: The records, items decoded
+    :rtype: Iterator[Union[Any, InvalidRecord]]
+    """
+    if format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            record: Dict[str, Any] = {
+                key: value if value != "" else None
+                for key, value in row.items()
+            }
+            try:
+                record["items"] = json.loads(record.get("items") or "[]")
+            except ValueError as e:
+                yield InvalidRecord(reader.line_num, f"Invalid items: {e}")
+                continue
+            yield record
+        return
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield InvalidRecord(number, f"Invalid JSON: {e}")
+
+
+class RecordWriter:
+    """Write order records one at a time."""
+
+    def __init__(self, file: TextIO, format: str) -> None:
+        """Initialize the writer.
+
+        :param file: The file to write to
+        :type file: TextIO
+        :param format: ``ndjson`` or ``csv``
+        :type format: str
+        """
+        self.file = file
+        self.format = format
+        self._csv: Optional[csv.DictWriter] = None
+        if format == "csv":
+            self._csv = csv.DictWriter(file, fieldnames=FIELDS)
+            self._csv.writeheader()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write a record.
+
+        :param record: The order, with the fields in ``FIELDS``
+        :type record: Dict[str, Any]
+        """
+        if self._csv is None:
+            self.file.write(
+                json.dumps(record, default=_default, separators=(",", ":"))
+                + "\n"
+            )
+            return
+        row = {
+            key: (
+                ""
+                if value is None
+                else (
+                    _default(value)
+                    if isinstance(value, (Decimal, UUID, datetime))
+                    else value
+                )
+            )
+            for key, value in record.items()
+            if key != "items"
+        }
+        row["items"] = json.dumps(
+            record["items"], default=_default, separators=(",", ":")
+        )
+        self._csv.writerow(row)
+
+
+def parse_datetime(value: Optional[str]) -> datetime:
+    """Parse an ISO 8601 timestamp, naive ones being UTC.
+
+    :param value: The timestamp, None for now
+    :type value: Optional[str]
+    :return: The timezone-aware datetime
+    :rtype: datetime
+    """
+    if not value:
+        return datetime.now(timezone.utc)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import logging.config
+import sys
+
+import typer
+
+from layered_architecture.config.settings import settings
+from layered_architecture.dao.concrete.sales_rollup import (
+    rebuild_sales_rollups as rebuild,
+)
+from layered_architecture.db.session import BATCH_PROFILE, engines
+
+# Configure logging
+logging.config.dictConfig(settings.LOGGING_CONFIG)
+logger = logging.getLogger("layered_architecture")
+
+app = typer.Typer(
+    name="rebuild-sales-rollups",
+    help="Recompute the sales rollups from the orders",
+    add_completion=False,
+)
+
+
+async def _rebuild_sales_rollups() -> None:
+    """Recompute the sales rollups of the primary database."""
+    try:
+        async with engines.lifespan():
+            await rebuild(engines.primary(BATCH_PROFILE))
+    except Exception as e:
+        logger.error(f"Error rebuilding rollups: {str(e)}", exc_info=True)
+        raise
+
+
+@app.command()
+def rebuild_sales_rollups() -> None:
+    """Recompute the hourly and daily sales rollups from the orders.
+
+    Order writes through the API keep the rollups current; run this after
+    writing orders any other way, such as with SQL.
+    """
+    try:
+        logger.info("Starting rebuild_sales_rollups command")
+        asyncio.run(_rebuild_sales_rollups())
+        logger.info("Successfully completed rebuild_sales_rollups command")
+        typer.echo("Rebuilt the sales rollups.")
+    except KeyboardInterrupt:
+        logger.warning("Operation cancelled by user")
+        typer.echo("\nOperation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(
+            f"Error in rebuild_sales_rollups command: {str(e)}", exc_info=True
+        )
+        typer.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -1,2 +1,7 @@
-from .concrete import SQLBeerDAO, SQLOrderDAO, SQLPizzaDAO
-from .interfaces import BeerDAOInterface, OrderDAOInterface, PizzaDAOInterface
+from .concrete import SQLBeerDAO, SQLOrderDAO, SQLPizzaDAO, SQLReportDAO
+from .interfaces import (
+    BeerDAOInterface,
+    OrderDAOInterface,
+    PizzaDAOInterface,
+    ReportDAOInterface,
+)
@@ -1,3 +1,4 @@
 from .sqla_beer import SQLBeerDAO
 from .sqla_order import SQLOrderDAO
 from .sqla_pizza import SQLPizzaDAO
+from .sqla_report import SQLReportDAO
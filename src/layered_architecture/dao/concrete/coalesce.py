@@ -0,0 +1,82 @@
+from copy import deepcopy
+from functools import wraps
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+from layered_architecture.config.settings import settings
+from layered_architecture.db.routing import READ_ONLY_KEY, primary_required
+from layered_architecture.singleflight import single_flight
+
+T = TypeVar("T")
+
+WRITES_PENDING_KEY = "writes_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context: Any) -> None:
+    session.info[WRITES_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[WRITES_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_writes(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(WRITES_PENDING_KEY, None)
+
+
+def coalesced(
+    method: Callable[..., Awaitable[T]],
+) -> Callable[..., Awaitable[T]]:
+    """Share identical in-flight DAO reads across concurrent sessions.
+
+    Calls are keyed by DAO class, method, arguments and whether the read
+    may be served by a replica. A session that has written in its current
+    transaction always runs its own query, so a caller never observes
+    another transaction's view of its own writes. Followers get their own
+    copy of the leader's result, DTOs being mutable.
+
+    :param method: The async DAO read method to coalesce
+    :type method: Callable[..., Awaitable[T]]
+    :return: The wrapped method
+    :rtype: Callable[..., Awaitable[T]]
+    """
+
+    @wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+        if not settings.SINGLE_FLIGHT_ENABLED or self.session.info.get(
+            WRITES_PENDING_KEY
+        ):
+            return await method(self, *args, **kwargs)
+
+        replica_ok = bool(self.session.info.get(READ_ONLY_KEY)) and (
+            not primary_required()
+        )
+        key = (
+            replica_ok,
+            type(self).__qualname__,
+            method.__name__,
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        led = False
+
+        async def lead() -> T:
+            nonlocal led
+            led = True
+            return await method(self, *args, **kwargs)
+
+        result: T = await single_flight.do(key, lead)
+        return result if led else deepcopy(result)
+
+    return wrapper
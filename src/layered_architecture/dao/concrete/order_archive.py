@@ -0,0 +1,111 @@
+from datetime import datetime
+from logging import getLogger
+from typing import Sequence, Type
+
+from sqlalchemy import ColumnElement, Insert, delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from layered_architecture.db.models import (
+    ArchivedOrder,
+    ArchivedOrderBeer,
+    ArchivedOrderPizza,
+    Base,
+    Order,
+    OrderBeer,
+    OrderPizza,
+)
+from layered_architecture.enums import OrderStatus
+
+logger = getLogger(__name__)
+
+# Orders that will not change anymore
+FINISHED_STATUSES = (OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+# Hot item tables and their archive
+ITEM_ARCHIVES = (
+    (OrderPizza, ArchivedOrderPizza),
+    (OrderBeer, ArchivedOrderBeer),
+)
+
+
+def _move(
+    hot: Type[Base], cold: Type[Base], condition: ColumnElement[bool]
+) -> Insert:
+    """Build a statement moving rows from a hot table to its archive.
+
+    :param hot: The model of the hot table
+    :type hot: Type[Base]
+    :param cold: The model of the archive table
+    :type cold: Type[Base]
+    :param condition: The rows to move
+    :type condition: ColumnElement[bool]
+    :return: A ``DELETE ... RETURNING`` feeding an ``INSERT``
+    :rtype: Insert
+    """
+    columns = [column.name for column in hot.__table__.columns]
+    moved = (
+        delete(hot)
+        .where(condition)
+        .returning(*hot.__table__.columns)
+        .cte("moved")
+    )
+    return insert(cold).from_select(
+        columns, select(*(moved.c[name] for name in columns))
+    )
+
+
+async def archive_orders(
+    engine: AsyncEngine,
+    before: datetime,
+    batch_size: int = 1000,
+    statuses: Sequence[OrderStatus] = FINISHED_STATUSES,
+) -> int:
+    """Move finished orders and their items to the archive tables.
+
+    Each batch of orders moves in its own short transaction, oldest first,
+    so the job can run next to the application and be stopped any time.
+    Orders locked by a writer are skipped and picked up by a later run.
+    The sales rollups keep counting archived orders.
+
+    :param engine: The engine of the database
+    :type engine: AsyncEngine
+    :param before: Only orders created before this time
+    :type before: datetime
+    :param batch_size: Orders moved per transaction
+    :type batch_size: int
+    :param statuses: Only orders in these statuses
+    :type statuses: Sequence[OrderStatus]
+    :return: The number of orders archived
+    :rtype: int
+    """
+    archived = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                select(Order.id, Order.created_at)
+                .where(Order.status.in_(statuses), Order.created_at < before)
+                .order_by(Order.created_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            keys = [tuple(row) for row in result]
+            if not keys:
+                break
+            # Items first, they reference the orders
+            for hot, cold in ITEM_ARCHIVES:
+                await conn.execute(
+                    _move(
+                        hot,
+                        cold,
+                        tuple_(hot.order_id, hot.order_created_at).in_(keys),
+                    )
+                )
+            await conn.execute(
+                _move(
+                    Order,
+                    ArchivedOrder,
+                    tuple_(Order.id, Order.created_at).in_(keys),
+                )
+            )
+        archived += len(keys)
+        logger.info(f"Archived {archived} orders")
+    return archived
@@ -0,0 +1,321 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from logging import getLogger
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    Table,
+    delete,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from layered_architecture.db.models import (
+    ArchivedOrder,
+    ArchivedOrderBeer,
+    ArchivedOrderPizza,
+    DailyProductSales,
+    DailyServiceTypeSales,
+    HourlyProductSales,
+    HourlyServiceTypeSales,
+    Order,
+    OrderBeer,
+    OrderPizza,
+)
+from layered_architecture.dto import OrderItemDTO
+from layered_architecture.enums import OrderStatus, ReportPeriod, ServiceType
+
+logger = getLogger(__name__)
+
+# Service type and product rollup of each period
+ROLLUPS = {
+    ReportPeriod.HOUR: (HourlyServiceTypeSales, HourlyProductSales),
+    ReportPeriod.DAY: (DailyServiceTypeSales, DailyProductSales),
+}
+MEASURES = ("orders", "quantity", "revenue")
+
+Rows = List[Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class SalesContribution:
+    """What one order adds to the sales rollups.
+
+    Product revenue is valued at the prices of the items as given, the
+    unit prices stored with the order's items, so an order is valued the
+    same way whenever its contribution is computed.
+    """
+
+    service_type: ServiceType
+    created_at: datetime
+    total: Decimal
+    # Quantity and revenue per product type and id
+    products: Dict[Tuple[str, UUID], Tuple[int, Decimal]]
+
+    @classmethod
+    def of(
+        cls,
+        service_type: ServiceType,
+        status: OrderStatus,
+        created_at: datetime,
+        total: Decimal,
+        items: Iterable[OrderItemDTO],
+    ) -> Optional["SalesContribution"]:
+        """Get the contribution of an order.
+
+        :param service_type: The order's service type
+        :type service_type: ServiceType
+        :param status: The order's status
+        :type status: OrderStatus
+        :param created_at: When the order was created
+        :type created_at: datetime
+        :param total: The order's total
+        :type total: Decimal
+        :param items: The order's items
+        :type items: Iterable[OrderItemDTO]
+        :return: The contribution, None for cancelled orders
+        :rtype: Optional[SalesContribution]
+        """
+        if status == OrderStatus.CANCELLED:
+            return None
+        products: Dict[Tuple[str, UUID], Tuple[int, Decimal]] = {}
+        for item in items:
+            quantity, revenue = products.get(
+                (item.type, item.product_id), (0, Decimal("0"))
+            )
+            products[(item.type, item.product_id)] = (
+                quantity + item.quantity,
+                revenue + item.price * item.quantity,
+            )
+        return cls(service_type, created_at, Decimal(total), products)
+
+
+def bucket(moment: datetime, period: ReportPeriod) -> datetime:
+    """Truncate a time to the start of its UTC hour or day.
+
+    :param moment: The time, timezone-aware
+    :type moment: datetime
+    :param period: The bucket size
+    :type period: ReportPeriod
+    :return: The start of the bucket
+    :rtype: datetime
+    """
+    moment = moment.astimezone(timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    if period == ReportPeriod.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def sales_deltas(
+    old: Optional[SalesContribution], new: Optional[SalesContribution]
+) -> Dict[ReportPeriod, Tuple[Rows, Rows]]:
+    """Compute the rollup rows turning one contribution into another.
+
+    Rows are sorted by key, so concurrent writers lock them in the same
+    order, and rows that would not change are left out.
+
+    :param old: The order's contribution before the write, if any
+    :type old: Optional[SalesContribution]
+    :param new: The order's contribution after the write, if any
+    :type new: Optional[SalesContribution]
+    :return: Service type and product rows to add, per period
+    :rtype: Dict[ReportPeriod, Tuple[Rows, Rows]]
+    """
+    deltas = {}
+    for period in ReportPeriod:
+        services: Dict[Tuple[Any, ...], List[Any]] = defaultdict(
+            lambda: [0, 0, Decimal("0")]
+        )
+        products: Dict[Tuple[Any, ...], List[Any]] = defaultdict(
+            lambda: [0, 0, Decimal("0")]
+        )
+        for contribution, sign in ((old, -1), (new, 1)):
+            if contribution is None:
+                continue
+            start = bucket(contribution.created_at, period)
+            service = services[(start, contribution.service_type)]
+            service[0] += sign
+            service[2] += sign * contribution.total
+            for key, (quantity, revenue) in contribution.products.items():
+                service[1] += sign * quantity
+                product = products[(start, *key)]
+                product[0] += sign
+                product[1] += sign * quantity
+                product[2] += sign * revenue
+        deltas[period] = (
+            [
+                dict(
+                    zip(("bucket", "service_type", *MEASURES), key + tuple(v))
+                )
+                for key, v in sorted(services.items(), key=_sort_key)
+                if any(v)
+            ],
+            [
+                dict(
+                    zip(
+                        ("bucket", "product_type", "product_id", *MEASURES),
+                        key + tuple(v),
+                    )
+                )
+                for key, v in sorted(products.items(), key=_sort_key)
+                if any(v)
+            ],
+        )
+    return deltas
+
+
+def _sort_key(row: Tuple[Tuple[Any, ...], Any]) -> Tuple[str, ...]:
+    return tuple(str(part) for part in row[0])
+
+
+async def _upsert(session: AsyncSession, table: Table, rows: Rows) -> None:
+    if not rows:
+        return
+    statement = insert(table).values(rows)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(table.primary_key.columns),
+            set_={
+                name: table.c[name] + statement.excluded[name]
+                for name in MEASURES
+            },
+        )
+    )
+
+
+async def apply_sales_deltas(
+    session: AsyncSession,
+    old: Optional[SalesContribution],
+    new: Optional[SalesContribution],
+) -> None:
+    """Update the rollups in the session's transaction.
+
+    :param session: The session writing the order
+    :type session: AsyncSession
+    :param old: The order's contribution before the write, if any
+    :type old: Optional[SalesContribution]
+    :param new: The order's contribution after the write, if any
+    :type new: Optional[SalesContribution]
+    """
+    for period, (services, products) in sales_deltas(old, new).items():
+        service_model, product_model = ROLLUPS[period]
+        await _upsert(session, service_model.__table__, services)
+        await _upsert(session, product_model.__table__, products)
+
+
+async def rebuild_sales_rollups(engine: AsyncEngine) -> None:
+    """Recompute every rollup from the orders, in one transaction.
+
+    Needed after writes that bypass ``SQLOrderDAO``, such as bulk imports.
+    Archived orders count along with the others.
+    The rollups are locked against writers for the duration, so orders
+    written meanwhile apply their deltas on top of the rebuilt rows.
+
+    :param engine: The engine of the database
+    :type engine: AsyncEngine
+    """
+    orders = union_all(
+        *(
+            select(
+                model.id,
+                model.service_type,
+                model.status,
+                model.total,
+                model.created_at,
+            )
+            for model in (Order, ArchivedOrder)
+        )
+    ).subquery("orders")
+    items = union_all(
+        *(
+            select(
+                order_pizza.order_id,
+                literal("pizza").label("product_type"),
+                order_pizza.pizza_id.label("product_id"),
+                order_pizza.quantity,
+                order_pizza.price,
+            )
+            for order_pizza in (OrderPizza, ArchivedOrderPizza)
+        ),
+        *(
+            select(
+                order_beer.order_id,
+                literal("beer").label("product_type"),
+                order_beer.beer_id.label("product_id"),
+                order_beer.quantity,
+                order_beer.price,
+            )
+            for order_beer in (OrderBeer, ArchivedOrderBeer)
+        ),
+    ).subquery("items")
+    quantities = (
+        select(items.c.order_id, func.sum(items.c.quantity).label("quantity"))
+        .group_by(items.c.order_id)
+        .subquery("quantities")
+    )
+    tables = [
+        model.__table__ for models in ROLLUPS.values() for model in models
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "LOCK TABLE "
+                + ", ".join(table.name for table in tables)
+                + " IN EXCLUSIVE MODE"
+            )
+        )
+        for table in tables:
+            await conn.execute(delete(table))
+        for period, (service_model, product_model) in ROLLUPS.items():
+            # Inlined, so the grouped expression matches the selected one
+            start = func.date_trunc(
+                literal_column(f"'{period.value}'"),
+                orders.c.created_at,
+                literal_column("'UTC'"),
+            )
+            await conn.execute(
+                insert(service_model.__table__).from_select(
+                    ["bucket", "service_type", *MEASURES],
+                    select(
+                        start,
+                        orders.c.service_type,
+                        func.count(),
+                        func.coalesce(func.sum(quantities.c.quantity), 0),
+                        func.sum(orders.c.total),
+                    )
+                    .select_from(orders)
+                    .outerjoin(
+                        quantities, quantities.c.order_id == orders.c.id
+                    )
+                    .where(orders.c.status != OrderStatus.CANCELLED)
+                    .group_by(start, orders.c.service_type),
+                )
+            )
+            await conn.execute(
+                insert(product_model.__table__).from_select(
+                    ["bucket", "product_type", "product_id", *MEASURES],
+                    select(
+                        start,
+                        items.c.product_type,
+                        items.c.product_id,
+                        func.count(func.distinct(items.c.order_id)),
+                        func.sum(items.c.quantity),
+                        func.sum(items.c.quantity * items.c.price),
+                    )
+                    .join(orders, orders.c.id == items.c.order_id)
+                    .where(orders.c.status != OrderStatus.CANCELLED)
+                    .group_by(start, items.c.product_type, items.c.product_id),
+                )
+            )
+    logger.info("Rebuilt the sales rollups")
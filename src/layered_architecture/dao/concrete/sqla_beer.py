@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .coalesce import coalesced
 from layered_architecture.dao.interfaces import BeerDAOInterface
 from layered_architecture.db.models import Beer
 from layered_architecture.dto.beer import BeerDTO
@@ -12,6 +13,7 @@ class SQLBeerDAO(BeerDAOInterface):
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @coalesced
     async def get_by_id(self, beer_id: str) -> Optional[BeerDTO]:
         result = await self.session.execute(
             select(Beer).where(Beer.id == beer_id)
@@ -21,6 +23,7 @@ class SQLBeerDAO(BeerDAOInterface):
             return None
         return BeerDTO.model_validate(beer)
 
+    @coalesced
     async def get_by_name(self, name: str) -> Optional[BeerDTO]:
         result = await self.session.execute(
             select(Beer).where(Beer.name == name)
@@ -30,6 +33,7 @@ class SQLBeerDAO(BeerDAOInterface):
             return None
         return BeerDTO.model_validate(beer)
 
+    @coalesced
     async def get_all(self) -> List[BeerDTO]:
         result = await self.session.execute(select(Beer))
         beers = result.scalars().all()
@@ -1,16 +1,25 @@
+from datetime import datetime, timedelta, timezone
 from typing import Callable, List, Optional
+from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, literal, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .coalesce import coalesced
+from .sales_rollup import SalesContribution, apply_sales_deltas
+from layered_architecture.config.settings import settings
 from layered_architecture.dao.interfaces import OrderDAOInterface
 from layered_architecture.db.models import (
+    ArchivedOrder,
+    ArchivedOrderBeer,
+    ArchivedOrderPizza,
     Beer,
     Order,
     OrderBeer,
     OrderPizza,
     Pizza,
 )
+from layered_architecture.db.models.mixins import uuid7_time
 from layered_architecture.dto import (
     OrderCreateInternalDTO,
     OrderDTO,
@@ -21,7 +30,12 @@ from layered_architecture.enums import OrderStatus
 
 
 class SQLOrderDAO(OrderDAOInterface):
-    """SQLAlchemy implementation of the OrderDAO interface."""
+    """SQLAlchemy implementation of the OrderDAO interface.
+
+    Orders and their items are partitioned by the month the order was
+    created in, so item queries also match on the order's creation time to
+    read a single partition.
+    """
 
     def __init__(self, session: AsyncSession):
         """Initialize the DAO with a database session.
@@ -68,8 +82,10 @@ class SQLOrderDAO(OrderDAOInterface):
 
                 order_pizza = OrderPizza(
                     order_id=order.id,
+                    order_created_at=order.created_at,
                     pizza_id=pizza.id,
                     quantity=item.quantity,
+                    price=pizza.price,
                 )
                 self.session.add(order_pizza)
                 items.append(
@@ -91,8 +107,10 @@ class SQLOrderDAO(OrderDAOInterface):
 
                 order_beer = OrderBeer(
                     order_id=order.id,
+                    order_created_at=order.created_at,
                     beer_id=beer.id,
                     quantity=item.quantity,
+                    price=beer.price,
                 )
                 self.session.add(order_beer)
                 items.append(
@@ -107,6 +125,19 @@ class SQLOrderDAO(OrderDAOInterface):
         # Flush the order items
         await self.session.flush()
 
+        # Roll the order up in the same transaction
+        await apply_sales_deltas(
+            self.session,
+            None,
+            SalesContribution.of(
+                order.service_type,
+                order.status,
+                order.created_at,
+                order.total,
+                items,
+            ),
+        )
+
         return OrderDTO(
             id=order.id,
             service_type=order.service_type,
@@ -121,12 +152,13 @@ class SQLOrderDAO(OrderDAOInterface):
             delivery_address=order.delivery_address,
         )
 
+    @coalesced
     async def get_by_id(
         self,
         order_id: str,
         get_customer_email: Callable[[str], str] | None = None,
     ) -> Optional[OrderDTO]:
-        """Get an order by its ID.
+        """Get an order by its ID, from the archive if it was moved there.
 
         :param order_id: The ID of the order to retrieve
         :type order_id: str
@@ -136,20 +168,24 @@ class SQLOrderDAO(OrderDAOInterface):
         :rtype: Optional[OrderDTO]
         """
         # First get the order
-        order_result = await self.session.execute(
-            select(Order).where(Order.id == order_id)
-        )
-        order = order_result.scalar_one_or_none()
+        order = await self._find(order_id)
         if not order:
-            return None
+            return await self._get_archived(order_id, get_customer_email)
 
         # Then get all items in a single query
         items_result = await self.session.execute(
             select(OrderPizza, Pizza, OrderBeer, Beer)
             .outerjoin(Pizza, OrderPizza.pizza_id == Pizza.id)
-            .outerjoin(OrderBeer, OrderPizza.order_id == OrderBeer.order_id)
+            .outerjoin(
+                OrderBeer,
+                (OrderPizza.order_id == OrderBeer.order_id)
+                & (OrderBeer.order_created_at == order.created_at),
+            )
             .outerjoin(Beer, OrderBeer.beer_id == Beer.id)
-            .where(OrderPizza.order_id == order_id)
+            .where(
+                OrderPizza.order_id == order_id,
+                OrderPizza.order_created_at == order.created_at,
+            )
         )
 
         items: List[OrderItemDTO] = []
@@ -162,7 +198,7 @@ class SQLOrderDAO(OrderDAOInterface):
                     OrderItemDTO(
                         product_id=pizza.id,
                         quantity=order_pizza.quantity,
-                        price=pizza.price,
+                        price=order_pizza.price,
                         type="pizza",
                     )
                 )
@@ -173,7 +209,7 @@ class SQLOrderDAO(OrderDAOInterface):
                     OrderItemDTO(
                         product_id=beer.id,
                         quantity=order_beer.quantity,
-                        price=beer.price,
+                        price=order_beer.price,
                         type="beer",
                     )
                 )
@@ -198,22 +234,40 @@ class SQLOrderDAO(OrderDAOInterface):
         )
 
     async def get_all(
-        self, status: Optional[OrderStatus] = None
+        self,
+        status: Optional[OrderStatus] = None,
+        after: Optional[UUID] = None,
+        limit: Optional[int] = None,
     ) -> List[OrderDTO]:
-        """Get all orders.
+        """Get all orders, or a page of them, by ID.
+
+        IDs are time-ordered, so pages run from the oldest orders to the
+        newest and each one is a range scan of the primary key that starts
+        where the previous page ended, however deep the page.
 
         :param status: Optional status to filter orders by
         :type status: Optional[OrderStatus]
+        :param after: Only orders after this ID, the last of the previous
+            page
+        :type after: Optional[UUID]
+        :param limit: Optional maximum number of orders
+        :type limit: Optional[int]
         :return: List of all orders
         :rtype: List[OrderDTO]
         """
         # Build the base query
-        query = select(Order)
+        query = select(Order).order_by(Order.id)
 
         # Add status filter if provided
         if status is not None:
             query = query.where(Order.status == status)
 
+        # Resume after the previous page
+        if after is not None:
+            query = query.where(Order.id > after)
+        if limit is not None:
+            query = query.limit(limit)
+
         # Execute query
         result = await self.session.execute(query)
         orders = result.scalars().all()
@@ -225,7 +279,10 @@ class SQLOrderDAO(OrderDAOInterface):
             pizza_query = (
                 select(OrderPizza, Pizza)
                 .join(Pizza, OrderPizza.pizza_id == Pizza.id)
-                .where(OrderPizza.order_id == order.id)
+                .where(
+                    OrderPizza.order_id == order.id,
+                    OrderPizza.order_created_at == order.created_at,
+                )
             )
             pizza_result = await self.session.execute(pizza_query)
             pizza_items = []
@@ -234,7 +291,7 @@ class SQLOrderDAO(OrderDAOInterface):
                     OrderItemDTO(
                         product_id=pizza.id,
                         quantity=order_pizza.quantity,
-                        price=pizza.price,
+                        price=order_pizza.price,
                         type="pizza",
                     )
                 )
@@ -243,7 +300,10 @@ class SQLOrderDAO(OrderDAOInterface):
             beer_query = (
                 select(OrderBeer, Beer)
                 .join(Beer, OrderBeer.beer_id == Beer.id)
-                .where(OrderBeer.order_id == order.id)
+                .where(
+                    OrderBeer.order_id == order.id,
+                    OrderBeer.order_created_at == order.created_at,
+                )
             )
             beer_result = await self.session.execute(beer_query)
             beer_items = []
@@ -252,7 +312,7 @@ class SQLOrderDAO(OrderDAOInterface):
                     OrderItemDTO(
                         product_id=beer.id,
                         quantity=order_beer.quantity,
-                        price=beer.price,
+                        price=order_beer.price,
                         type="beer",
                     )
                 )
@@ -278,6 +338,136 @@ class SQLOrderDAO(OrderDAOInterface):
 
         return order_dtos
 
+    async def _find(
+        self, order_id: str, lock: bool = False
+    ) -> Optional[Order]:
+        """Find an order, looking in the likeliest partitions first.
+
+        Time-ordered IDs tell when the order was created, up to clock skew
+        between the application and the database, so the first query reads
+        the partition of that month. Other IDs look in the recent
+        partitions first: most lookups by id are status checks on orders
+        placed moments ago.
+
+        :param order_id: The ID of the order
+        :type order_id: str
+        :param lock: Lock the order's row for update
+        :type lock: bool
+        :return: The order if found, None otherwise
+        :rtype: Optional[Order]
+        """
+        query = select(Order).where(Order.id == order_id)
+        if lock:
+            query = query.with_for_update().execution_options(
+                populate_existing=True
+            )
+        try:
+            generated_at = uuid7_time(UUID(order_id))
+        except ValueError:
+            generated_at = None
+        if generated_at is not None:
+            skew = timedelta(seconds=settings.ORDER_LOOKUP_CLOCK_SKEW_SECONDS)
+            result = await self.session.execute(
+                query.where(
+                    Order.created_at >= generated_at - skew,
+                    Order.created_at <= generated_at + skew,
+                )
+            )
+            order = result.scalar_one_or_none()
+            if order is not None:
+                return order
+
+        recent = datetime.now(timezone.utc) - timedelta(
+            days=settings.ORDER_LOOKUP_RECENT_DAYS
+        )
+        result = await self.session.execute(
+            query.where(Order.created_at >= recent)
+        )
+        order = result.scalar_one_or_none()
+        if order is None:
+            result = await self.session.execute(
+                query.where(Order.created_at < recent)
+            )
+            order = result.scalar_one_or_none()
+        return order
+
+    async def _get_archived(
+        self,
+        order_id: str,
+        get_customer_email: Callable[[str], str] | None = None,
+    ) -> Optional[OrderDTO]:
+        """Get an order moved to the archive tables by its ID.
+
+        :param order_id: The ID of the order to retrieve
+        :type order_id: str
+        :param get_customer_email: Optional function to get customer email by ID
+        :type get_customer_email: Callable[[str], str] | None
+        :return: The order if archived, None otherwise
+        :rtype: Optional[OrderDTO]
+        """
+        order = await self.session.scalar(
+            select(ArchivedOrder).where(ArchivedOrder.id == order_id)
+        )
+        if not order:
+            return None
+        return OrderDTO(
+            id=order.id,
+            service_type=order.service_type,
+            customer_id=order.customer_id,
+            status=order.status,
+            items=await self._items(order_id, order.created_at, True),
+            total=order.total,
+            customer_email=(
+                get_customer_email(str(order.customer_id))
+                if get_customer_email
+                else ""
+            ),
+            notes=order.notes,
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+            delivery_address=order.delivery_address,
+        )
+
+    async def _items(
+        self, order_id: str, created_at: datetime, archived: bool = False
+    ) -> List[OrderItemDTO]:
+        order_pizza, order_beer = (
+            (ArchivedOrderPizza, ArchivedOrderBeer)
+            if archived
+            else (OrderPizza, OrderBeer)
+        )
+        result = await self.session.execute(
+            union_all(
+                select(
+                    order_pizza.pizza_id,
+                    order_pizza.quantity,
+                    order_pizza.price,
+                    literal("pizza").label("type"),
+                ).where(
+                    order_pizza.order_id == order_id,
+                    order_pizza.order_created_at == created_at,
+                ),
+                select(
+                    order_beer.beer_id,
+                    order_beer.quantity,
+                    order_beer.price,
+                    literal("beer").label("type"),
+                ).where(
+                    order_beer.order_id == order_id,
+                    order_beer.order_created_at == created_at,
+                ),
+            )
+        )
+        return [
+            OrderItemDTO(
+                product_id=product_id,
+                quantity=quantity,
+                price=price,
+                type=kind,
+            )
+            for product_id, quantity, price, kind in result
+        ]
+
     async def update(
         self, order_id: str, update_data: OrderUpdateInternalDTO
     ) -> OrderDTO:
@@ -291,12 +481,17 @@ class SQLOrderDAO(OrderDAOInterface):
         :rtype: OrderDTO
         :raises ValueError: If the order is not found
         """
-        result = await self.session.execute(
-            select(Order).where(Order.id == order_id)
-        )
-        order = result.scalar_one_or_none()
+        # Lock the order, so concurrent updates roll up one after another
+        order = await self._find(order_id, lock=True)
         if not order:
             raise ValueError(f"Order {order_id} not found")
+        previous = SalesContribution.of(
+            order.service_type,
+            order.status,
+            order.created_at,
+            order.total,
+            await self._items(order_id, order.created_at),
+        )
 
         # Update order fields
         if update_data.status is not None:
@@ -312,10 +507,16 @@ class SQLOrderDAO(OrderDAOInterface):
 
         # Delete existing items
         await self.session.execute(
-            delete(OrderPizza).where(OrderPizza.order_id == order_id)
+            delete(OrderPizza).where(
+                OrderPizza.order_id == order_id,
+                OrderPizza.order_created_at == order.created_at,
+            )
         )
         await self.session.execute(
-            delete(OrderBeer).where(OrderBeer.order_id == order_id)
+            delete(OrderBeer).where(
+                OrderBeer.order_id == order_id,
+                OrderBeer.order_created_at == order.created_at,
+            )
         )
 
         # Add new items
@@ -332,8 +533,10 @@ class SQLOrderDAO(OrderDAOInterface):
 
                 order_pizza = OrderPizza(
                     order_id=order.id,
+                    order_created_at=order.created_at,
                     pizza_id=pizza.id,
                     quantity=item.quantity,
+                    price=pizza.price,
                 )
                 self.session.add(order_pizza)
                 items.append(
@@ -355,8 +558,10 @@ class SQLOrderDAO(OrderDAOInterface):
 
                 order_beer = OrderBeer(
                     order_id=order.id,
+                    order_created_at=order.created_at,
                     beer_id=beer.id,
                     quantity=item.quantity,
+                    price=beer.price,
                 )
                 self.session.add(order_beer)
                 items.append(
@@ -371,5 +576,18 @@ class SQLOrderDAO(OrderDAOInterface):
         # Flush changes to ensure they are visible in the current session
         await self.session.flush()
 
+        # Replace the order's previous contribution to the rollups
+        await apply_sales_deltas(
+            self.session,
+            previous,
+            SalesContribution.of(
+                order.service_type,
+                order.status,
+                order.created_at,
+                order.total,
+                items,
+            ),
+        )
+
         # Get updated order with items
         return await self.get_by_id(order_id)
@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .coalesce import coalesced
 from layered_architecture.dao.interfaces import PizzaDAOInterface
 from layered_architecture.db.models import Pizza
 from layered_architecture.dto.pizza import PizzaDTO
@@ -12,6 +13,7 @@ class SQLPizzaDAO(PizzaDAOInterface):
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @coalesced
     async def get_by_id(self, pizza_id: str) -> Optional[PizzaDTO]:
         result = await self.session.execute(
             select(Pizza).where(Pizza.id == pizza_id)
@@ -21,6 +23,7 @@ class SQLPizzaDAO(PizzaDAOInterface):
             return None
         return PizzaDTO.model_validate(pizza)
 
+    @coalesced
     async def get_by_name(self, name: str) -> Optional[PizzaDTO]:
         result = await self.session.execute(
             select(Pizza).where(Pizza.name == name)
@@ -30,6 +33,7 @@ class SQLPizzaDAO(PizzaDAOInterface):
             return None
         return PizzaDTO.model_validate(pizza)
 
+    @coalesced
     async def get_all(self) -> List[PizzaDTO]:
         result = await self.session.execute(select(Pizza))
         pizzas = result.scalars().all()
@@ -0,0 +1,116 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .sales_rollup import ROLLUPS
+from layered_architecture.dao.interfaces import ReportDAOInterface
+from layered_architecture.db.models import Beer, Pizza
+from layered_architecture.dto.report import (
+    ProductSalesDTO,
+    ServiceTypeSalesDTO,
+)
+from layered_architecture.enums import ReportPeriod, ServiceType
+
+
+class SQLReportDAO(ReportDAOInterface):
+    """SQLAlchemy implementation of the ReportDAO interface.
+
+    Reads only the rollup tables, so a query costs one primary key range
+    scan over the buckets asked for, however many orders they cover.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """Initialize the DAO with a database session.
+
+        :param session: The SQLAlchemy async session to use
+        :type session: AsyncSession
+        """
+        self.session = session
+
+    async def get_service_type_sales(
+        self,
+        period: ReportPeriod,
+        since: datetime,
+        until: datetime,
+        service_type: Optional[ServiceType] = None,
+    ) -> List[ServiceTypeSalesDTO]:
+        """Get the sales per service type of the buckets in a range.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: datetime
+        :param until: End of the range, exclusive
+        :type until: datetime
+        :param service_type: Optional service type to filter by
+        :type service_type: Optional[ServiceType]
+        :return: The sales, by bucket then service type
+        :rtype: List[ServiceTypeSalesDTO]
+        """
+        model = ROLLUPS[period][0]
+        query = (
+            select(model)
+            .where(model.bucket >= since, model.bucket < until)
+            .order_by(model.bucket, model.service_type)
+        )
+        if service_type is not None:
+            query = query.where(model.service_type == service_type)
+        result = await self.session.execute(query)
+        return [
+            ServiceTypeSalesDTO.model_validate(row) for row in result.scalars()
+        ]
+
+    async def get_product_sales(
+        self,
+        period: ReportPeriod,
+        since: datetime,
+        until: datetime,
+        product_type: Optional[str] = None,
+    ) -> List[ProductSalesDTO]:
+        """Get the sales per product of the buckets in a range.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: datetime
+        :param until: End of the range, exclusive
+        :type until: datetime
+        :param product_type: Optional product type, pizza or beer
+        :type product_type: Optional[str]
+        :return: The sales, by bucket then revenue, highest first
+        :rtype: List[ProductSalesDTO]
+        """
+        model = ROLLUPS[period][1]
+        query = (
+            select(
+                model.bucket,
+                model.product_type,
+                model.product_id,
+                func.coalesce(Pizza.name, Beer.name).label("product_name"),
+                model.orders,
+                model.quantity,
+                model.revenue,
+            )
+            .outerjoin(
+                Pizza,
+                and_(
+                    model.product_type == "pizza",
+                    Pizza.id == model.product_id,
+                ),
+            )
+            .outerjoin(
+                Beer,
+                and_(
+                    model.product_type == "beer",
+                    Beer.id == model.product_id,
+                ),
+            )
+            .where(model.bucket >= since, model.bucket < until)
+            .order_by(model.bucket, model.revenue.desc(), model.product_id)
+        )
+        if product_type is not None:
+            query = query.where(model.product_type == product_type)
+        result = await self.session.execute(query)
+        return [ProductSalesDTO.model_validate(row._mapping) for row in result]
@@ -1,3 +1,4 @@
 from .beer import BeerDAOInterface
 from .order import OrderDAOInterface
 from .pizza import PizzaDAOInterface
+from .report import ReportDAOInterface
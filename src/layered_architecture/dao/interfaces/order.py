@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
+from uuid import UUID
 
 from layered_architecture.dto.order import (
     OrderCreateInternalDTO,
@@ -25,12 +26,20 @@ class OrderDAOInterface(ABC):  # pragma: no cover
 
     @abstractmethod
     async def get_all(
-        self, status: Optional[OrderStatus] = None
+        self,
+        status: Optional[OrderStatus] = None,
+        after: Optional[UUID] = None,
+        limit: Optional[int] = None,
     ) -> List[OrderDTO]:
-        """Get all orders.
+        """Get all orders, or a page of them, by ID.
 
         :param status: Optional status to filter orders by
         :type status: Optional[OrderStatus]
+        :param after: Only orders after this ID, the last of the previous
+            page
+        :type after: Optional[UUID]
+        :param limit: Optional maximum number of orders
+        :type limit: Optional[int]
         :return: List of all orders
         :rtype: List[OrderDTO]
         """
@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from layered_architecture.dto.report import (
+    ProductSalesDTO,
+    ServiceTypeSalesDTO,
+)
+from layered_architecture.enums import ReportPeriod, ServiceType
+
+
+class ReportDAOInterface(ABC):  # pragma: no cover
+    """Interface for sales rollup access."""
+
+    @abstractmethod
+    async def get_service_type_sales(
+        self,
+        period: ReportPeriod,
+        since: datetime,
+        until: datetime,
+        service_type: Optional[ServiceType] = None,
+    ) -> List[ServiceTypeSalesDTO]:
+        """Get the sales per service type of the buckets in a range.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: datetime
+        :param until: End of the range, exclusive
+        :type until: datetime
+        :param service_type: Optional service type to filter by
+        :type service_type: Optional[ServiceType]
+        :return: The sales, by bucket then service type
+        :rtype: List[ServiceTypeSalesDTO]
+        """
+        pass
+
+    @abstractmethod
+    async def get_product_sales(
+        self,
+        period: ReportPeriod,
+        since: datetime,
+        until: datetime,
+        product_type: Optional[str] = None,
+    ) -> List[ProductSalesDTO]:
+        """Get the sales per product of the buckets in a range.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: datetime
+        :param until: End of the range, exclusive
+        :type until: datetime
+        :param product_type: Optional product type, pizza or beer
+        :type product_type: Optional[str]
+        :return: The sales, by bucket then revenue, highest first
+        :rtype: List[ProductSalesDTO]
+        """
+        pass
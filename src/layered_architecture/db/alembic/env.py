@@ -10,6 +10,7 @@ from sqlalchemy.schema import SchemaItem
 
 from layered_architecture.config.settings import settings
 from layered_architecture.db.models import Base  # noqa
+from layered_architecture.db.partitions import partition_month
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -71,6 +72,14 @@ def include_object(
     if type_ == "table" and name in IGNORE_TABLES:
         print(f"Skipping table {name}")
         return False
+    # Partitions are created and detached at runtime, not by migrations
+    if (
+        type_ == "table"
+        and reflected
+        and name is not None
+        and (partition_month(name) is not None or name.endswith("_default"))
+    ):
+        return False
     return True
 
 
@@ -0,0 +1,99 @@
+"""Add sales rollups.
+
+Revision ID: 3603c086926f
+Revises: 43499b887dfc
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3603c086926f"  # pragma: allowlist secret
+down_revision: Union[str, None] = "43499b887dfc"  # pragma: allowlist secret
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PERIODS = {"hourly": "hour", "daily": "day"}
+
+# Items of every order, valued at menu prices
+ITEMS = """
+    SELECT op.order_id, 'pizza' AS product_type, op.pizza_id AS product_id,
+        op.quantity, p.price
+    FROM order_pizza op JOIN pizza p ON p.id = op.pizza_id
+    UNION ALL
+    SELECT ob.order_id, 'beer', ob.beer_id, ob.quantity, b.price
+    FROM order_beer ob JOIN beer b ON b.id = ob.beer_id
+"""
+
+
+def upgrade() -> None:
+    for prefix in PERIODS:
+        op.create_table(
+            f"{prefix}_service_type_sales",
+            sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+            sa.Column(
+                "service_type",
+                postgresql.ENUM(name="servicetype", create_type=False),
+                nullable=False,
+            ),
+            sa.Column("orders", sa.Integer(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column(
+                "revenue", sa.Numeric(precision=12, scale=2), nullable=False
+            ),
+            sa.PrimaryKeyConstraint("bucket", "service_type"),
+        )
+        op.create_table(
+            f"{prefix}_product_sales",
+            sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("product_type", sa.String(length=5), nullable=False),
+            sa.Column("product_id", sa.UUID(), nullable=False),
+            sa.Column("orders", sa.Integer(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column(
+                "revenue", sa.Numeric(precision=12, scale=2), nullable=False
+            ),
+            sa.PrimaryKeyConstraint("bucket", "product_type", "product_id"),
+        )
+
+    # Roll up the existing orders
+    for prefix, period in PERIODS.items():
+        op.execute(
+            f"""
+            INSERT INTO {prefix}_service_type_sales
+                (bucket, service_type, orders, quantity, revenue)
+            SELECT date_trunc('{period}', o.created_at, 'UTC'),
+                o.service_type, count(*), coalesce(sum(q.quantity), 0),
+                sum(o.total)
+            FROM "order" o
+            LEFT JOIN (
+                SELECT order_id, sum(quantity) AS quantity
+                FROM ({ITEMS}) items GROUP BY order_id
+            ) q ON q.order_id = o.id
+            WHERE o.status != 'CANCELLED'
+            GROUP BY 1, 2
+            """
+        )
+        op.execute(
+            f"""
+            INSERT INTO {prefix}_product_sales
+                (bucket, product_type, product_id, orders, quantity, revenue)
+            SELECT date_trunc('{period}', o.created_at, 'UTC'),
+                i.product_type, i.product_id, count(DISTINCT i.order_id),
+                sum(i.quantity), sum(i.quantity * i.price)
+            FROM ({ITEMS}) i JOIN "order" o ON o.id = i.order_id
+            WHERE o.status != 'CANCELLED'
+            GROUP BY 1, 2, 3
+            """
+        )
+
+
+def downgrade() -> None:
+    for prefix in PERIODS:
+        op.drop_table(f"{prefix}_product_sales")
+        op.drop_table(f"{prefix}_service_type_sales")
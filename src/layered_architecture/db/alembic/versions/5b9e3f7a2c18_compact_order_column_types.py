@@ -0,0 +1,97 @@
+"""Compact order column types.
+
+Item quantities become SMALLINT and notes and delivery addresses get
+length bounds. Changing the quantity type rewrites the item tables, and
+the bounds fail on longer existing values, so check those first.
+
+Column order is not changed here: Postgres cannot move columns, only
+tables created from the models get the packed order.
+
+Revision ID: 5b9e3f7a2c18
+Revises: c41e0a9d5b27
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b9e3f7a2c18"  # pragma: allowlist secret
+down_revision: Union[str, None] = "c41e0a9d5b27"  # pragma: allowlist secret
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEM_TABLES = (
+    "order_pizza",
+    "order_beer",
+    "archived_order_pizza",
+    "archived_order_beer",
+)
+ORDER_TABLES = ("order", "archived_order")
+BOUNDS = {"notes": 500, "delivery_address": 255}
+MAX_QUANTITY = 32767  # SMALLINT
+
+
+def upgrade() -> None:
+    # Fail before any change on the values the new types cannot hold
+    conn = op.get_bind()
+    checks = [
+        (table, f"length({column}) > {length}")
+        for table in ORDER_TABLES
+        for column, length in BOUNDS.items()
+    ] + [(table, f"quantity > {MAX_QUANTITY}") for table in ITEM_TABLES]
+    failures = []
+    for table, condition in checks:
+        count = conn.execute(
+            sa.text(f'SELECT count(*) FROM "{table}" WHERE {condition}')
+        ).scalar_one()
+        if count:
+            failures.append(f"{count} rows of {table} with {condition}")
+    if failures:
+        raise RuntimeError(
+            "Cannot compact the order columns, fix these rows first: "
+            + "; ".join(failures)
+        )
+
+    # Partitioned tables pass the change on to their partitions
+    for table in ITEM_TABLES:
+        op.alter_column(
+            table,
+            "quantity",
+            type_=sa.SmallInteger(),
+            existing_type=sa.Numeric(precision=10, scale=0),
+            existing_nullable=False,
+            postgresql_using="quantity::smallint",
+        )
+    for table in ORDER_TABLES:
+        for column, length in BOUNDS.items():
+            op.alter_column(
+                table,
+                column,
+                type_=sa.String(length=length),
+                existing_type=sa.String(),
+                existing_nullable=True,
+            )
+
+
+def downgrade() -> None:
+    for table in ORDER_TABLES:
+        for column, length in BOUNDS.items():
+            op.alter_column(
+                table,
+                column,
+                type_=sa.String(),
+                existing_type=sa.String(length=length),
+                existing_nullable=True,
+            )
+    for table in ITEM_TABLES:
+        op.alter_column(
+            table,
+            "quantity",
+            type_=sa.Numeric(precision=10, scale=0),
+            existing_type=sa.SmallInteger(),
+            existing_nullable=False,
+        )
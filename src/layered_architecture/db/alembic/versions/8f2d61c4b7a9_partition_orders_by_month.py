@@ -0,0 +1,210 @@
+"""Partition orders by month.
+
+Rebuilds the order tables as tables partitioned by the month of the
+order's creation time and copies the orders over, so it rewrites every
+order: run it in a maintenance window, with the application stopped.
+
+Revision ID: 8f2d61c4b7a9
+Revises: 3603c086926f
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2d61c4b7a9"  # pragma: allowlist secret
+down_revision: Union[str, None] = "3603c086926f"  # pragma: allowlist secret
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("order", "order_pizza", "order_beer")
+PRODUCTS = {"order_pizza": "pizza", "order_beer": "beer"}
+ORDER_COLUMNS = (
+    "id, service_type, customer_id, status, subtotal, total, notes, "
+    "delivery_address, created_at, updated_at"
+)
+# Monthly partitions created ahead of the current month
+MONTHS_AHEAD = 3
+
+
+# Copies of the partition helpers as of this revision, so the migration
+# does not change when the application code does
+def month_start(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    month = month_start(month)
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def _rename(suffix: str) -> None:
+    for table in TABLES:
+        old, new = table, f"{table}_{suffix}"
+        op.execute(f'ALTER TABLE "{old}" RENAME TO "{new}"')
+        # The primary key index would clash with the new table's
+        op.execute(f'ALTER INDEX "{old}_pkey" RENAME TO "{new}_pkey"')
+
+
+def _timestamps() -> list:
+    return [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    ]
+
+
+def _order_columns() -> list:
+    return [
+        sa.Column(
+            "service_type",
+            postgresql.ENUM(name="servicetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("customer_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="orderstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "subtotal", sa.Numeric(precision=10, scale=2), nullable=False
+        ),
+        sa.Column("total", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("delivery_address", sa.String(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        *_timestamps(),
+    ]
+
+
+def upgrade() -> None:
+    _rename("unpartitioned")
+
+    op.create_table(
+        "order",
+        *_order_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    for table, product in PRODUCTS.items():
+        op.create_table(
+            table,
+            sa.Column("order_id", sa.UUID(), nullable=False),
+            sa.Column(
+                "order_created_at", sa.DateTime(timezone=True), nullable=False
+            ),
+            sa.Column(f"{product}_id", sa.UUID(), nullable=False),
+            sa.Column(
+                "quantity", sa.Numeric(precision=10, scale=0), nullable=False
+            ),
+            sa.Column("id", sa.UUID(), nullable=False),
+            sa.ForeignKeyConstraint(
+                ["order_id", "order_created_at"],
+                ["order.id", "order.created_at"],
+            ),
+            sa.ForeignKeyConstraint([f"{product}_id"], [f"{product}.id"]),
+            sa.PrimaryKeyConstraint("id", "order_created_at"),
+            postgresql_partition_by="RANGE (order_created_at)",
+        )
+        op.create_index(f"ix_{table}_order_id", table, ["order_id"])
+
+    # A partition for every month with orders, and a few ahead
+    now = datetime.now(timezone.utc)
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT min(created_at), max(created_at) "
+            "FROM order_unpartitioned"
+        )
+    )
+    earliest, latest = result.one()
+    month = month_start(earliest or now)
+    last = add_months(month_start(max(latest or now, now)), MONTHS_AHEAD)
+    while month <= last:
+        for table in TABLES:
+            op.execute(
+                f'CREATE TABLE "{partition_name(table, month)}" '
+                f'PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{add_months(month, 1).isoformat()}')"
+            )
+        month = add_months(month, 1)
+
+    op.execute(
+        f'INSERT INTO "order" ({ORDER_COLUMNS}) '
+        f"SELECT {ORDER_COLUMNS} FROM order_unpartitioned"
+    )
+    for table, product in PRODUCTS.items():
+        op.execute(
+            f"""
+            INSERT INTO {table}
+                (id, order_id, order_created_at, {product}_id, quantity)
+            SELECT i.id, i.order_id, o.created_at, i.{product}_id, i.quantity
+            FROM {table}_unpartitioned i
+            JOIN order_unpartitioned o ON o.id = i.order_id
+            """
+        )
+
+    for table in reversed(TABLES):
+        op.drop_table(f"{table}_unpartitioned")
+
+
+def downgrade() -> None:
+    _rename("partitioned")
+
+    op.create_table("order", *_order_columns(), sa.PrimaryKeyConstraint("id"))
+    for table, product in PRODUCTS.items():
+        op.create_table(
+            table,
+            sa.Column("order_id", sa.UUID(), nullable=False),
+            sa.Column(f"{product}_id", sa.UUID(), nullable=False),
+            sa.Column(
+                "quantity", sa.Numeric(precision=10, scale=0), nullable=False
+            ),
+            sa.Column("id", sa.UUID(), nullable=False),
+            sa.ForeignKeyConstraint(["order_id"], ["order.id"]),
+            sa.ForeignKeyConstraint([f"{product}_id"], [f"{product}.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    # Only the attached partitions are copied back
+    op.execute(
+        f'INSERT INTO "order" ({ORDER_COLUMNS}) '
+        f"SELECT {ORDER_COLUMNS} FROM order_partitioned"
+    )
+    for table, product in PRODUCTS.items():
+        op.execute(
+            f"""
+            INSERT INTO {table} (id, order_id, {product}_id, quantity)
+            SELECT id, order_id, {product}_id, quantity
+            FROM {table}_partitioned
+            """
+        )
+
+    # Dropping a partitioned table drops its partitions
+    for table in reversed(TABLES):
+        op.drop_table(f"{table}_partitioned")
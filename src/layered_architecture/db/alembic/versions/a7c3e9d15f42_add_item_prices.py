@@ -0,0 +1,57 @@
+"""Add item prices.
+
+Items keep the unit price they were ordered at, so the sales rollups value
+an order the same way when it is created, updated and rebuilt. Existing
+items get the current menu price; archived items of products since removed
+from the menu get zero.
+
+Revision ID: a7c3e9d15f42
+Revises: 5b9e3f7a2c18
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9d15f42"  # pragma: allowlist secret
+down_revision: Union[str, None] = "5b9e3f7a2c18"  # pragma: allowlist secret
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Item tables and the product table their prices come from
+ITEM_TABLES = {
+    "order_pizza": "pizza",
+    "order_beer": "beer",
+    "archived_order_pizza": "pizza",
+    "archived_order_beer": "beer",
+}
+
+
+def upgrade() -> None:
+    # Partitioned tables pass the change on to their partitions
+    for table, product in ITEM_TABLES.items():
+        op.add_column(
+            table,
+            sa.Column("price", sa.Numeric(precision=10, scale=2)),
+        )
+        op.execute(
+            f"UPDATE {table} AS item SET price = product.price "
+            f"FROM {product} AS product "
+            f"WHERE product.id = item.{product}_id"
+        )
+        op.execute(f"UPDATE {table} SET price = 0 WHERE price IS NULL")
+        op.alter_column(
+            table,
+            "price",
+            existing_type=sa.Numeric(precision=10, scale=2),
+            nullable=False,
+        )
+
+
+def downgrade() -> None:
+    for table in ITEM_TABLES:
+        op.drop_column(table, "price")
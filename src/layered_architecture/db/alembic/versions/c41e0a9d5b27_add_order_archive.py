@@ -0,0 +1,97 @@
+"""Add order archive.
+
+Revision ID: c41e0a9d5b27
+Revises: 8f2d61c4b7a9
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e0a9d5b27"  # pragma: allowlist secret
+down_revision: Union[str, None] = "8f2d61c4b7a9"  # pragma: allowlist secret
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRODUCTS = {"archived_order_pizza": "pizza", "archived_order_beer": "beer"}
+
+
+def _archived_at() -> sa.Column:
+    return sa.Column(
+        "archived_at",
+        sa.DateTime(timezone=True),
+        server_default=sa.text("now()"),
+        nullable=False,
+    )
+
+
+def upgrade() -> None:
+    # Archival batches take the oldest orders first; without this index each
+    # batch would sort every order of every partition
+    op.create_index("ix_order_created_at", "order", ["created_at"])
+    op.create_table(
+        "archived_order",
+        sa.Column(
+            "service_type",
+            postgresql.ENUM(name="servicetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("customer_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="orderstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "subtotal", sa.Numeric(precision=10, scale=2), nullable=False
+        ),
+        sa.Column("total", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("delivery_address", sa.String(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        _archived_at(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for table, product in PRODUCTS.items():
+        op.create_table(
+            table,
+            sa.Column("order_id", sa.UUID(), nullable=False),
+            sa.Column(
+                "order_created_at", sa.DateTime(timezone=True), nullable=False
+            ),
+            sa.Column(f"{product}_id", sa.UUID(), nullable=False),
+            sa.Column(
+                "quantity", sa.Numeric(precision=10, scale=0), nullable=False
+            ),
+            sa.Column("id", sa.UUID(), nullable=False),
+            _archived_at(),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            op.f(f"ix_{table}_order_id"), table, ["order_id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    for table in PRODUCTS:
+        op.drop_index(op.f(f"ix_{table}_order_id"), table_name=table)
+        op.drop_table(table)
+    op.drop_table("archived_order")
+    op.drop_index("ix_order_created_at", table_name="order")
@@ -0,0 +1,97 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, List, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@asynccontextmanager
+async def driver_connection(engine: AsyncEngine) -> AsyncIterator[Any]:
+    """Borrow a pooled connection as the underlying asyncpg connection.
+
+    Statements sent on it bypass SQLAlchemy and its event listeners, so
+    it is meant for bulk operations the ORM cannot express, such as
+    ``COPY``. The connection goes back to the pool on exit.
+
+    :param engine: The engine to borrow from
+    :type engine: AsyncEngine
+    :yield: The asyncpg connection
+    :rtype: AsyncIterator[Any]
+    """
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        yield raw.driver_connection
+
+
+async def copy_records(
+    driver: Any,
+    table: Table,
+    columns: Sequence[str],
+    records: Iterable[Sequence[Any]],
+) -> int:
+    """Load records into a table with ``COPY ... FROM STDIN``.
+
+    :param driver: An asyncpg connection, from ``driver_connection``
+    :type driver: Any
+    :param table: The table to load
+    :type table: Table
+    :param columns: The columns, in the order of the record values
+    :type columns: Sequence[str]
+    :param records: The records to load
+    :type records: Iterable[Sequence[Any]]
+    :return: The number of rows copied
+    :rtype: int
+    """
+    status = await driver.copy_records_to_table(
+        table.name,
+        records=records,
+        columns=list(columns),
+        schema_name=table.schema,
+    )
+    return int(status.split()[-1])
+
+
+async def copy_new_records(
+    driver: Any,
+    table: Table,
+    columns: Sequence[str],
+    records: Iterable[Sequence[Any]],
+    returning: str = "id",
+) -> List[Any]:
+    """Load records with ``COPY``, skipping those that conflict.
+
+    ``COPY`` cannot skip conflicting rows, so the records are copied into
+    a temporary staging table first and inserted from it with
+    ``ON CONFLICT DO NOTHING``. Must run in a transaction, at whose end the
+    staging table is dropped.
+
+    :param driver: An asyncpg connection, from ``driver_connection``
+    :type driver: Any
+    :param table: The table to load
+    :type table: Table
+    :param columns: The columns, in the order of the record values
+    :type columns: Sequence[str]
+    :param records: The records to load
+    :type records: Iterable[Sequence[Any]]
+    :param returning: The column to return of the inserted rows
+    :type returning: str
+    :return: The ``returning`` values of the rows inserted
+    :rtype: List[Any]
+    """
+    target = f'"{table.name}"'
+    if table.schema:
+        target = f'"{table.schema}".{target}'
+    staging = f"staging_{table.name}"
+    await driver.execute(
+        f'CREATE TEMPORARY TABLE "{staging}" (LIKE {target}) ON COMMIT DROP'
+    )
+    await driver.copy_records_to_table(
+        staging, records=records, columns=list(columns)
+    )
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    rows = await driver.fetch(
+        f"INSERT INTO {target} ({column_list}) "
+        f'SELECT {column_list} FROM "{staging}" '
+        f'ON CONFLICT DO NOTHING RETURNING "{returning}"'
+    )
+    return [row[0] for row in rows]
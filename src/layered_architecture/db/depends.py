@@ -1,7 +1,12 @@
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from layered_architecture.db.session import async_session
 
 
-async def get_db() -> async_session:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    # AsyncSession only checks out a connection on its first statement
     db = async_session()
     try:
         yield db
@@ -1,13 +1,27 @@
+from .archive import ArchivedOrder, ArchivedOrderBeer, ArchivedOrderPizza
 from .base import Base
 from .beer import Beer
 from .order import Order
 from .order_beer import OrderBeer
 from .order_pizza import OrderPizza
 from .pizza import Pizza
+from .sales import (
+    DailyProductSales,
+    DailyServiceTypeSales,
+    HourlyProductSales,
+    HourlyServiceTypeSales,
+)
 
 __all__ = [
+    "ArchivedOrder",
+    "ArchivedOrderBeer",
+    "ArchivedOrderPizza",
     "Base",
     "Beer",
+    "DailyProductSales",
+    "DailyServiceTypeSales",
+    "HourlyProductSales",
+    "HourlyServiceTypeSales",
     "Order",
     "OrderBeer",
     "OrderPizza",
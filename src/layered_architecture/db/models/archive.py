@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum as SQLEnum,
+    Numeric,
+    SmallInteger,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .mixins import CreatedAtMixin, UpdatedAtMixin, UUIDMixin
+from layered_architecture.enums import OrderStatus, ServiceType
+
+
+class ArchivedAtMixin:
+    """When a row was moved to the archive."""
+
+    archived_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),  # pylint: disable=not-callable
+    )
+
+
+class ArchivedOrder(
+    Base, UUIDMixin, CreatedAtMixin, UpdatedAtMixin, ArchivedAtMixin
+):
+    """A finished order moved out of the order table.
+
+    Archive tables are plain tables without foreign keys, written by the
+    archival job and read by order lookups missing the hot tables.
+    """
+
+    # Sorted after the columns of the mixins, like the order table
+    customer_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), nullable=False, sort_order=1
+    )
+    service_type: Mapped[ServiceType] = mapped_column(
+        SQLEnum(ServiceType), nullable=False, sort_order=1
+    )
+    status: Mapped[OrderStatus] = mapped_column(
+        SQLEnum(OrderStatus), nullable=False, sort_order=1
+    )
+    subtotal: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False, sort_order=1
+    )
+    total: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False, sort_order=1
+    )
+    notes: Mapped[str] = mapped_column(
+        String(500), nullable=True, sort_order=1
+    )
+    delivery_address: Mapped[str] = mapped_column(
+        String(255), nullable=True, sort_order=1
+    )
+
+
+class ArchivedOrderPizza(Base, UUIDMixin, ArchivedAtMixin):
+    """A pizza of an archived order."""
+
+    order_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    order_created_at = Column(DateTime(timezone=True), nullable=False)
+    pizza_id = Column(UUID(as_uuid=True), nullable=False)
+    # Last, after the timestamp of the mixin
+    quantity: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, sort_order=1
+    )
+    price: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False, sort_order=1
+    )
+
+
+class ArchivedOrderBeer(Base, UUIDMixin, ArchivedAtMixin):
+    """A beer of an archived order."""
+
+    order_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    order_created_at = Column(DateTime(timezone=True), nullable=False)
+    beer_id = Column(UUID(as_uuid=True), nullable=False)
+    # Last, after the timestamp of the mixin
+    quantity: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, sort_order=1
+    )
+    price: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False, sort_order=1
+    )
@@ -1,6 +1,7 @@
 import re
-from typing import Any
+from typing import Any, ClassVar
 
+from sqlalchemy import DDL, Table, event
 from sqlalchemy.orm import as_declarative, declared_attr
 
 
@@ -8,6 +9,9 @@ from sqlalchemy.orm import as_declarative, declared_attr
 class Base:
     """Base class for all SQLAlchemy models."""
 
+    # Set by the declarative mapping of each model
+    __table__: ClassVar[Table]
+
     @declared_attr  # type: ignore[arg-type]
     def __tablename__(  # pylint: disable=no-self-argument
         cls: Any,
@@ -16,3 +20,23 @@ class Base:
         name: str = cls.__name__
         name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
         return name.lower()
+
+
+def with_default_partition(table: Table) -> None:
+    """Give a partitioned table a default partition when ``create_all``
+    creates it, so databases created without migrations accept any row.
+
+    Migrated databases get monthly partitions instead, see
+    ``layered_architecture.db.partitions``.
+
+    :param table: The partitioned table
+    :type table: Table
+    """
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f'CREATE TABLE "{table.name}_default" '
+            f'PARTITION OF "{table.name}" DEFAULT'
+        ),
+    )
@@ -1,4 +1,4 @@
 from .created_at import CreatedAtMixin
 from .deleted_at import DeletedAtMixin
 from .updated_at import UpdatedAtMixin
-from .uuid_id import UUIDMixin
+from .uuid_id import UUIDMixin, uuid7, uuid7_time
@@ -1,10 +1,66 @@
-from uuid import uuid4
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID as PyUUID
 
 from sqlalchemy import Column
 from sqlalchemy.dialects.postgresql import UUID
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Bits of the random part after the variant
+RANDOM_BITS = 62
+
+
+def uuid7(
+    *, at: Optional[datetime] = None, random: Optional[int] = None
+) -> PyUUID:
+    """Generate a time-ordered UUID, version 7 of RFC 9562.
+
+    The first 48 bits are the Unix time in milliseconds and the next 12
+    the fraction of the millisecond, so keys generated later sort after,
+    and inserts append to the right of the primary key index instead of
+    landing on random pages.
+
+    :param at: Time to embed, defaults to now
+    :type at: Optional[datetime]
+    :param random: Random bits to use, for reproducible keys, defaults to
+        bits from the OS
+    :type random: Optional[int]
+    :return: The UUID
+    :rtype: PyUUID
+    """
+    if at is None:
+        nanoseconds = time.time_ns()
+    else:
+        nanoseconds = (at - EPOCH) // timedelta(microseconds=1) * 1000
+    milliseconds, nanoseconds = divmod(nanoseconds, 1_000_000)
+    fraction = nanoseconds * 4096 // 1_000_000
+    if random is None:
+        random = int.from_bytes(os.urandom(8), "big")
+    return PyUUID(
+        int=(milliseconds & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | fraction << 64
+        | 0b10 << RANDOM_BITS
+        | random & ((1 << RANDOM_BITS) - 1)
+    )
+
+
+def uuid7_time(value: PyUUID) -> Optional[datetime]:
+    """Get the time a version 7 UUID was generated at.
+
+    :param value: The UUID
+    :type value: PyUUID
+    :return: The time, to the millisecond, None for other versions
+    :rtype: Optional[datetime]
+    """
+    if value.version != 7:
+        return None
+    return datetime.fromtimestamp((value.int >> 80) / 1000, timezone.utc)
+
 
 class UUIDMixin:
-    """Mixin to add UUID primary key to models."""
+    """Mixin to add a time-ordered UUID primary key to models."""
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
@@ -1,27 +1,69 @@
 from decimal import Decimal
 
-from sqlalchemy import Enum as SQLEnum, Numeric, String
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum as SQLEnum,
+    Index,
+    Numeric,
+    PrimaryKeyConstraint,
+    String,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from .base import Base
+from .base import Base, with_default_partition
 from .mixins import CreatedAtMixin, UpdatedAtMixin, UUIDMixin
 from layered_architecture.enums import OrderStatus, ServiceType
 
 
 class Order(Base, UUIDMixin, CreatedAtMixin, UpdatedAtMixin):
-    """Order model."""
+    """Order model, partitioned by the month it was created in.
 
-    service_type: Mapped[ServiceType] = mapped_column(
-        SQLEnum(ServiceType), nullable=False
+    The timestamps and ids come first, then the other columns by
+    alignment, so rows pack without padding.
+    """
+
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
+        # Archival reads the oldest orders first
+        Index("ix_order_created_at", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # The partition key must be part of the primary key
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),  # pylint: disable=not-callable
     )
+
+    # Sorted after the columns of the mixins
     customer_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), nullable=False
+        UUID(as_uuid=True), nullable=False, sort_order=1
+    )
+    service_type: Mapped[ServiceType] = mapped_column(
+        SQLEnum(ServiceType), nullable=False, sort_order=1
     )
     status: Mapped[OrderStatus] = mapped_column(
-        SQLEnum(OrderStatus), nullable=False, default=OrderStatus.PENDING
+        SQLEnum(OrderStatus),
+        nullable=False,
+        default=OrderStatus.PENDING,
+        sort_order=1,
     )
-    subtotal: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    total: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    notes: Mapped[str] = mapped_column(String, nullable=True)
-    delivery_address: Mapped[str] = mapped_column(String, nullable=True)
+    subtotal: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False, sort_order=1
+    )
+    total: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False, sort_order=1
+    )
+    notes: Mapped[str] = mapped_column(
+        String(500), nullable=True, sort_order=1
+    )
+    delivery_address: Mapped[str] = mapped_column(
+        String(255), nullable=True, sort_order=1
+    )
+
+
+with_default_partition(Order.__table__)
@@ -1,15 +1,40 @@
-from sqlalchemy import Column, ForeignKey, Numeric
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Numeric,
+    PrimaryKeyConstraint,
+    SmallInteger,
+)
 from sqlalchemy.dialects.postgresql import UUID
 
-from .base import Base
+from .base import Base, with_default_partition
 from layered_architecture.db.models.mixins import UUIDMixin
 
 
 class OrderBeer(Base, UUIDMixin):
-    """Association table for orders and beers."""
+    """Association table for orders and beers.
 
-    order_id = Column(
-        UUID(as_uuid=True), ForeignKey("order.id"), nullable=False
+    Partitioned by month like its orders, on a copy of their creation time.
+    """
+
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "order_created_at"),
+        ForeignKeyConstraint(
+            ["order_id", "order_created_at"], ["order.id", "order.created_at"]
+        ),
+        Index("ix_order_beer_order_id", "order_id"),
+        {"postgresql_partition_by": "RANGE (order_created_at)"},
     )
+
+    order_id = Column(UUID(as_uuid=True), nullable=False)
+    order_created_at = Column(DateTime(timezone=True), primary_key=True)
     beer_id = Column(UUID(as_uuid=True), ForeignKey("beer.id"), nullable=False)
-    quantity = Column(Numeric(10, 0), nullable=False)
+    quantity = Column(SmallInteger, nullable=False)
+    # Unit price when the item was ordered, menu prices change afterwards
+    price = Column(Numeric(10, 2), nullable=False)
+
+
+with_default_partition(OrderBeer.__table__)
@@ -0,0 +1,52 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum as SQLEnum,
+    Integer,
+    Numeric,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from layered_architecture.enums import ServiceType
+
+
+class ServiceTypeSalesMixin:
+    """Sales of a service type within a bucket, cancelled orders excluded."""
+
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    service_type: Mapped[ServiceType] = mapped_column(
+        SQLEnum(ServiceType), primary_key=True
+    )
+    orders = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+
+
+class ProductSalesMixin:
+    """Sales of a product within a bucket, cancelled orders excluded."""
+
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    product_type = Column(String(5), primary_key=True)
+    product_id = Column(UUID(as_uuid=True), primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+
+
+class HourlyServiceTypeSales(Base, ServiceTypeSalesMixin):
+    """Sales per service type and UTC hour."""
+
+
+class DailyServiceTypeSales(Base, ServiceTypeSalesMixin):
+    """Sales per service type and UTC day."""
+
+
+class HourlyProductSales(Base, ProductSalesMixin):
+    """Sales per product and UTC hour."""
+
+
+class DailyProductSales(Base, ProductSalesMixin):
+    """Sales per product and UTC day."""
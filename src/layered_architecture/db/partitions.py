@@ -0,0 +1,313 @@
+import asyncio
+import re
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from layered_architecture.config.settings import settings
+
+logger = getLogger(__name__)
+
+# Monthly partitioned tables and their partition key; the orders come
+# first, their items reference them
+PARTITIONED_TABLES = (
+    ("order", "created_at"),
+    ("order_pizza", "order_created_at"),
+    ("order_beer", "order_created_at"),
+)
+PARTITION_NAME = re.compile(
+    r"^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$"
+)
+
+# Serializes partition changes between processes
+LOCK_KEY = "partition_maintenance"
+
+PARTITIONS = text(
+    """
+    SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = to_regclass(:parent)
+    ORDER BY c.relname
+    """
+)
+
+
+def month_start(moment: datetime) -> datetime:
+    """Get the start of the UTC month of a time.
+
+    :param moment: The time, naive times are taken as UTC
+    :type moment: datetime
+    :return: Midnight UTC on the first day of the month
+    :rtype: datetime
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Move the start of a month by a number of months.
+
+    :param month: The start of a month
+    :type month: datetime
+    :param months: Months to move by, negative to move back
+    :type months: int
+    :return: The start of the other month
+    :rtype: datetime
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Get the name of the partition of a table holding a month.
+
+    :param table: The partitioned table
+    :type table: str
+    :param month: Any time within the month
+    :type month: datetime
+    :return: The partition name, such as ``order_y2024m03``
+    :rtype: str
+    """
+    month = month_start(month)
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[Tuple[str, datetime]]:
+    """Parse the name of a monthly partition.
+
+    :param name: The partition name
+    :type name: str
+    :return: The partitioned table and the month's start, None for other
+        tables
+    :rtype: Optional[Tuple[str, datetime]]
+    """
+    match = PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return match["table"], datetime(
+        int(match["year"]), int(match["month"]), 1, tzinfo=timezone.utc
+    )
+
+
+async def _partitions(conn: AsyncConnection, table: str) -> Dict[str, str]:
+    """Get the partitions of a table and their bounds.
+
+    :param conn: The connection to use
+    :type conn: AsyncConnection
+    :param table: The partitioned table
+    :type table: str
+    :return: Bounds, such as ``DEFAULT``, by partition name
+    :rtype: Dict[str, str]
+    """
+    result = await conn.execute(PARTITIONS, {"parent": f'"{table}"'})
+    return {row.name: row.bound for row in result}
+
+
+async def _is_partitioned(conn: AsyncConnection, table: str) -> bool:
+    return bool(
+        await conn.scalar(
+            text(
+                "SELECT count(*) FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:parent)"
+            ),
+            {"parent": f'"{table}"'},
+        )
+    )
+
+
+async def list_partitions(engine: AsyncEngine) -> List[Tuple[str, str, str]]:
+    """List the partitions of the order tables.
+
+    :param engine: The engine of the database
+    :type engine: AsyncEngine
+    :return: Table, partition and bounds of each partition
+    :rtype: List[Tuple[str, str, str]]
+    """
+    async with engine.connect() as conn:
+        return [
+            (table, name, bound)
+            for table, _ in PARTITIONED_TABLES
+            for name, bound in (await _partitions(conn, table)).items()
+        ]
+
+
+async def ensure_partitions(
+    engine: AsyncEngine,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    months_ahead: Optional[int] = None,
+) -> List[str]:
+    """Create the missing monthly partitions of the order tables.
+
+    Partitions cover the months from ``since`` to ``until``, both default
+    to now, and ``months_ahead`` more months after the later of ``until``
+    and now. Each one is created as a plain table, then attached, which
+    only takes a SHARE UPDATE EXCLUSIVE lock on the parent so orders keep
+    flowing meanwhile. Tables with a default partition, as created by
+    ``create_all``, are left alone.
+
+    :param engine: The engine of the database
+    :type engine: AsyncEngine
+    :param since: Earliest time to cover
+    :type since: Optional[datetime]
+    :param until: Latest time to cover
+    :type until: Optional[datetime]
+    :param months_ahead: Months to create in advance, defaults to the
+        PARTITION_MONTHS_AHEAD setting
+    :type months_ahead: Optional[int]
+    :return: The names of the partitions created
+    :rtype: List[str]
+    """
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    now = datetime.now(timezone.utc)
+    first = month_start(since or now)
+    last = add_months(month_start(max(until or now, now)), months_ahead)
+    months = []
+    month = first
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+
+    async with engine.connect() as conn:
+        missing: List[Tuple[str, datetime]] = []
+        for table, _ in PARTITIONED_TABLES:
+            if not await _is_partitioned(conn, table):
+                continue
+            existing = await _partitions(conn, table)
+            if "DEFAULT" in existing.values():
+                continue
+            missing.extend(
+                (table, month)
+                for month in months
+                if partition_name(table, month) not in existing
+            )
+
+    timeout = settings.PARTITION_LOCK_TIMEOUT
+    created = []
+    for table, month in missing:
+        name = partition_name(table, month)
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{timeout}'"))
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+                {"key": LOCK_KEY},
+            )
+            # Another process may have created it while we waited
+            if name in await _partitions(conn, table):
+                continue
+            await conn.execute(
+                text(
+                    f'CREATE TABLE "{name}" (LIKE "{table}" '
+                    "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                )
+            )
+            await conn.execute(
+                text(
+                    f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+                    f"FOR VALUES FROM ('{month.isoformat()}') "
+                    f"TO ('{add_months(month, 1).isoformat()}')"
+                )
+            )
+        created.append(name)
+        logger.info(f"Created partition {name}")
+    return created
+
+
+async def _detach(
+    conn: AsyncConnection, table: str, before: datetime, concurrently: bool
+) -> List[str]:
+    existing = await _partitions(conn, table)
+    mode = (
+        " CONCURRENTLY"
+        if concurrently and "DEFAULT" not in existing.values()
+        else ""
+    )
+    detached = []
+    for name in existing:
+        parsed = partition_month(name)
+        if parsed is None or parsed[1] >= before:
+            continue
+        await conn.execute(
+            text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"{mode}')
+        )
+        # Detached items would keep referencing the orders
+        foreign_keys = await conn.scalars(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = to_regclass(:name) AND contype = 'f' "
+                "AND confrelid = to_regclass('\"order\"')"
+            ),
+            {"name": f'"{name}"'},
+        )
+        for foreign_key in foreign_keys.all():
+            await conn.execute(
+                text(f'ALTER TABLE "{name}" DROP CONSTRAINT "{foreign_key}"')
+            )
+        detached.append(name)
+        logger.info(f"Detached partition {name}")
+    return detached
+
+
+async def detach_partitions(
+    engine: AsyncEngine, before: datetime, concurrently: bool = True
+) -> List[str]:
+    """Detach the monthly partitions of the months before a time.
+
+    Detached partitions become plain tables, kept with their data, that
+    queries on the order tables no longer see; archive or drop them at
+    leisure. Item partitions are detached first and lose their foreign
+    key to the orders, then the order partitions go.
+
+    :param engine: The engine of the database
+    :type engine: AsyncEngine
+    :param before: Partitions of months starting before this go
+    :type before: datetime
+    :param concurrently: Detach without blocking queries on the parent,
+        impossible when the table has a default partition
+    :type concurrently: bool
+    :return: The names of the partitions detached
+    :rtype: List[str]
+    """
+    before = month_start(before)
+    detached = []
+    async with engine.connect() as conn:
+        # DETACH ... CONCURRENTLY cannot run inside a transaction
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            text(f"SET lock_timeout = '{settings.PARTITION_LOCK_TIMEOUT}'")
+        )
+        try:
+            for table, _ in reversed(PARTITIONED_TABLES):
+                detached += await _detach(conn, table, before, concurrently)
+        finally:
+            # The connection goes back to the pool
+            await conn.execute(text("RESET lock_timeout"))
+    return detached
+
+
+async def run_partition_maintenance(
+    engine: AsyncEngine, interval: float
+) -> None:
+    """Create upcoming partitions now and every ``interval`` seconds until
+    cancelled.
+
+    :param engine: The engine of the database
+    :type engine: AsyncEngine
+    :param interval: Seconds between runs
+    :type interval: float
+    """
+    while True:
+        try:
+            await ensure_partitions(engine)
+        except Exception as e:
+            logger.error(
+                f"Partition maintenance failed: {str(e)}", exc_info=True
+            )
+        await asyncio.sleep(interval)
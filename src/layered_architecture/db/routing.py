@@ -0,0 +1,153 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, SessionTransaction
+
+logger = getLogger(__name__)
+
+# Session.info key marking the session's next transaction as read-only
+READ_ONLY_KEY = "read_only"
+
+
+@dataclass
+class ConsistencyState:
+    """Per-request routing state for read-your-writes consistency."""
+
+    force_primary: bool = False
+    wrote: bool = False
+
+
+_consistency: ContextVar[Optional[ConsistencyState]] = ContextVar(
+    "consistency", default=None
+)
+
+
+def get_consistency() -> Optional[ConsistencyState]:
+    """Get the routing state of the current request, if any.
+
+    :return: The current consistency state
+    :rtype: Optional[ConsistencyState]
+    """
+    return _consistency.get()
+
+
+def primary_required() -> bool:
+    """Check whether reads in the current context must go to the primary.
+
+    :return: True if the current request must read from the primary
+    :rtype: bool
+    """
+    state = _consistency.get()
+    return state is not None and state.force_primary
+
+
+def mark_write() -> None:
+    """Record that the current request committed a write."""
+    state = _consistency.get()
+    if state is not None:
+        state.wrote = True
+
+
+@contextmanager
+def consistency_scope(state: ConsistencyState) -> Iterator[ConsistencyState]:
+    """Bind a consistency state to the current context.
+
+    :param state: The state to bind
+    :type state: ConsistencyState
+    :yield: The bound state
+    :rtype: Iterator[ConsistencyState]
+    """
+    token = _consistency.set(state)
+    try:
+        yield state
+    finally:
+        _consistency.reset(token)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Force reads in the enclosed block to go to the primary."""
+    with consistency_scope(ConsistencyState(force_primary=True)):
+        yield
+
+
+class ReplicaSelector:
+    """Round-robin replica selection that skips unhealthy replicas.
+
+    A replica that fails to connect or drops its connection is taken out of
+    rotation for a cooldown period, after which it is tried again.
+    """
+
+    def __init__(
+        self, replicas: Sequence[AsyncEngine], cooldown: float
+    ) -> None:
+        """Initialize the selector.
+
+        :param replicas: The replica engines to rotate through
+        :type replicas: Sequence[AsyncEngine]
+        :param cooldown: Seconds an unhealthy replica stays out of rotation
+        :type cooldown: float
+        """
+        self.replicas: List[AsyncEngine] = list(replicas)
+        self.cooldown = cooldown
+        self._next = 0
+        self._down_until: Dict[int, float] = {}
+        for replica in self.replicas:
+            self._watch(replica)
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Choose the next healthy replica.
+
+        :return: A healthy replica, or None if none is available
+        :rtype: Optional[AsyncEngine]
+        """
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            index = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+            if self._down_until.get(index, 0.0) <= now:
+                return self.replicas[index]
+        return None
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        """Take a replica out of rotation for the cooldown period.
+
+        :param replica: The unhealthy replica
+        :type replica: AsyncEngine
+        """
+        index = self.replicas.index(replica)
+        logger.warning(
+            f"Replica {replica.url.render_as_string()} marked down "
+            f"for {self.cooldown}s"
+        )
+        self._down_until[index] = time.monotonic() + self.cooldown
+
+    def mark_up(self, replica: AsyncEngine) -> None:
+        """Put a replica back into rotation.
+
+        :param replica: The recovered replica
+        :type replica: AsyncEngine
+        """
+        self._down_until.pop(self.replicas.index(replica), None)
+
+    def _watch(self, replica: AsyncEngine) -> None:
+        def on_error(context: ExceptionContext) -> None:
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(replica)
+
+        event.listen(replica.sync_engine, "handle_error", on_error)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_read_only(
+    session: Session, transaction: SessionTransaction
+) -> None:
+    if transaction.parent is None:
+        session.info.pop(READ_ONLY_KEY, None)
@@ -1,33 +1,220 @@
-from typing import Any
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
 
 from layered_architecture.config.settings import settings
+from layered_architecture.db.routing import (
+    READ_ONLY_KEY,
+    ReplicaSelector,
+    primary_required,
+)
+from layered_architecture.observability import (
+    InstrumentedAsyncAdaptedQueuePool,
+    SlowQueryLog,
+    instrument_engine,
+    monitor_engine,
+)
+
+logger = getLogger(__name__)
+
+# Session.info key holding the engine chosen for the current transaction
+BIND_KEY = "bind"
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    """Connection pool parameters for one kind of workload."""
+
+    name: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+
+
+WEB_PROFILE = PoolProfile(
+    name="web",
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+)
+BATCH_PROFILE = PoolProfile(
+    name="batch",
+    pool_size=settings.DATABASE_BATCH_POOL_SIZE,
+    max_overflow=settings.DATABASE_BATCH_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_BATCH_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+)
+
+
+class EngineRegistry:
+    """Process-wide engines, created on first use and disposed explicitly.
+
+    Engines are shared per pool profile and database, so every session,
+    command or job using the same profile reuses one pool.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._engines: Dict[Tuple[str, str], AsyncEngine] = {}
+        self._selectors: Dict[str, ReplicaSelector] = {}
+
+    def primary(self, profile: PoolProfile = WEB_PROFILE) -> AsyncEngine:
+        """Get the primary database engine for a pool profile.
+
+        :param profile: The pool profile to use
+        :type profile: PoolProfile
+        :return: The shared primary engine
+        :rtype: AsyncEngine
+        """
+        return self._get(profile, "primary", settings.DATABASE_URL)
+
+    def replicas(self, profile: PoolProfile = WEB_PROFILE) -> ReplicaSelector:
+        """Get the replica selector for a pool profile.
+
+        :param profile: The pool profile to use
+        :type profile: PoolProfile
+        :return: The shared replica selector
+        :rtype: ReplicaSelector
+        """
+        if profile.name not in self._selectors:
+            self._selectors[profile.name] = ReplicaSelector(
+                [
+                    self._get(profile, f"replica-{index}", url)
+                    for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+                ],
+                cooldown=settings.DATABASE_REPLICA_COOLDOWN,
+            )
+        return self._selectors[profile.name]
 
-async_session = sessionmaker(  # type: ignore[call-overload]
-    create_async_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_size=50,
-        max_overflow=100,
-        pool_timeout=30,
-        pool_recycle=1800,
-        pool_use_lifo=True,
-    ),
+    def created(self) -> Dict[Tuple[str, str], AsyncEngine]:
+        """Get the engines created so far, keyed by profile and database.
+
+        :return: The created engines
+        :rtype: Dict[Tuple[str, str], AsyncEngine]
+        """
+        return dict(self._engines)
+
+    async def dispose(self) -> None:
+        """Dispose every created engine, closing its pooled connections."""
+        engines = list(self._engines.values())
+        self._engines.clear()
+        self._selectors.clear()
+        for engine in engines:
+            logger.debug(f"Disposing engine {engine.url.render_as_string()}")
+            await engine.dispose()
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator["EngineRegistry"]:
+        """Dispose the engines used within the block on exit.
+
+        :yield: The registry
+        :rtype: AsyncIterator[EngineRegistry]
+        """
+        try:
+            yield self
+        finally:
+            await self.dispose()
+
+    def _get(self, profile: PoolProfile, target: str, url: str) -> AsyncEngine:
+        key = (profile.name, target)
+        if key not in self._engines:
+            engine = create_async_engine(
+                url,
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+                pool_size=profile.pool_size,
+                max_overflow=profile.max_overflow,
+                pool_timeout=profile.pool_timeout,
+                pool_recycle=profile.pool_recycle,
+                pool_use_lifo=True,
+            )
+            monitor_engine(
+                f"{profile.name}:{target}", engine, profile.max_overflow
+            )
+            instrument_engine(engine)
+            if settings.SLOW_QUERY_SECONDS > 0:
+                SlowQueryLog(
+                    engine,
+                    threshold=settings.SLOW_QUERY_SECONDS,
+                    explain=settings.SLOW_QUERY_EXPLAIN,
+                    explain_timeout=settings.SLOW_QUERY_EXPLAIN_TIMEOUT,
+                ).attach()
+            self._engines[key] = engine
+        return self._engines[key]
+
+
+engines = EngineRegistry()
+
+
+class RoutingSession(Session):
+    """Session sending read-only transactions to replicas.
+
+    Transactions begun by a read-only unit of work go to the next healthy
+    replica unless the current request must read its own writes. Everything
+    else, and all reads when no replica is available, goes to the primary.
+    The engine is kept from the start of a transaction to its end, so all
+    of its statements share one connection and snapshot.
+    """
+
+    def get_bind(
+        self,
+        mapper: Optional[Any] = None,
+        clause: Optional[Any] = None,
+        **kw: Any,
+    ) -> Engine:
+        bind: Optional[Engine] = self.info.get(BIND_KEY)
+        if bind is not None:
+            return bind
+        if self.info.get(READ_ONLY_KEY) and not primary_required():
+            replica: Optional[AsyncEngine] = engines.replicas().choose()
+            if replica is not None:
+                return replica.sync_engine
+        return engines.primary().sync_engine
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _keep_bind(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    if transaction.parent is None:
+        session.info.setdefault(BIND_KEY, connection.engine)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _clear_bind(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(BIND_KEY, None)
+
+
+async_session = sessionmaker(
     expire_on_commit=False,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
 )
 
 
 class AsyncDBContextManager:
-    def __init__(self) -> None:
-        session = sessionmaker(  # type: ignore[call-overload]
-            create_async_engine(settings.DATABASE_URL, pool_pre_ping=True),
-            expire_on_commit=False,
-            class_=AsyncSession,
+    """Session for commands and background jobs.
+
+    Sessions share the registry's engine for the given pool profile; run
+    the job inside ``engines.lifespan()`` to dispose it on exit.
+    """
+
+    def __init__(self, profile: PoolProfile = BATCH_PROFILE) -> None:
+        self.db = AsyncSession(
+            bind=engines.primary(profile), expire_on_commit=False
         )
-        self.db = session()
 
     async def __aenter__(self) -> Any:
         return self.db
@@ -1 +1 @@
-from .sqla import SQLAUnitOfWork
+from .sqla import SQLAReadOnlyUnitOfWork, SQLAUnitOfWork
@@ -1,13 +1,27 @@
 from abc import ABC, abstractmethod
+from contextlib import ExitStack
 from logging import getLogger
 from types import TracebackType
 from typing import Any, Optional, Type
 
+from layered_architecture.observability import tracer, track_queries
+
 logger = getLogger(__name__)
 
 
-class BaseUnitOfWork(ABC):  # pragma: no cover
+class BaseUnitOfWork(ABC):
+    # Read-only units of work have nothing to commit and end with a rollback
+    read_only: bool = False
+
     async def __aenter__(self) -> "BaseUnitOfWork":
+        name = type(self).__name__
+        self._scopes = ExitStack()
+        self._span = self._scopes.enter_context(
+            tracer.start_as_current_span(
+                name, attributes={"uow.read_only": self.read_only}
+            )
+        )
+        self._stats = self._scopes.enter_context(track_queries(name))
         return self
 
     async def __aexit__(
@@ -16,9 +30,35 @@ class BaseUnitOfWork(ABC):  # pragma: no cover
         exc: Optional[BaseException],
         tb: Optional[TracebackType],
     ) -> None:
+        error = exc
+        try:
+            await self.end(exc)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._span.set_attribute("db.statements", self._stats.count)
+            if error is None:
+                self._scopes.close()
+            else:
+                # Passing the exception marks the span as failed
+                self._scopes.__exit__(type(error), error, error.__traceback__)
+            logger.debug(
+                f"{self._stats.name} ran {self._stats.count} queries in "
+                f"{self._stats.duration * 1000:.2f}ms"
+            )
+
+    async def end(self, exc: Optional[BaseException]) -> None:
+        """End the unit of work, rolling back on error.
+
+        :param exc: The exception raised within the unit of work, if any
+        :type exc: Optional[BaseException]
+        """
         if exc:
             logger.warning(f"Caught exception {exc}")
             await self.rollback()
+        elif self.read_only:
+            await self.rollback()
         else:
             await self.commit()
 
@@ -1,8 +1,10 @@
 from logging import getLogger
+from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseUnitOfWork
+from layered_architecture.db.routing import READ_ONLY_KEY, mark_write
 
 logger = getLogger(__name__)
 
@@ -18,3 +20,50 @@ class SQLAUnitOfWork(BaseUnitOfWork):
     async def commit(self) -> None:
         logger.debug("Commiting transaction")
         await self.db.commit()
+        mark_write()
+
+
+class SQLAReadOnlyUnitOfWork(SQLAUnitOfWork):
+    """Unit of work for pure reads.
+
+    Runs in a ``READ ONLY`` transaction and ends it with a rollback instead
+    of a commit. A transaction that was already open when the unit of work
+    began is joined and left to its owner to end.
+    """
+
+    read_only = True
+
+    def __init__(self, db: AsyncSession) -> None:
+        super().__init__(db)
+        self._owns_transaction = False
+
+    async def __aenter__(self) -> "SQLAReadOnlyUnitOfWork":
+        await super().__aenter__()
+        await self.begin()
+        return self
+
+    async def end(self, exc: Optional[BaseException]) -> None:
+        if exc or self._owns_transaction:
+            self._owns_transaction = False
+            await super().end(exc)
+
+    async def begin(self) -> None:
+        """Begin a read-only transaction unless one is already open.
+
+        A transaction begun here is ended when the unit of work exits, which
+        lets a caller start it early and have the service finish it. It may
+        be served by a replica.
+        """
+        if self.db.in_transaction():
+            logger.debug("Joining open transaction as read-only unit of work")
+            return
+        logger.debug("Beginning read-only transaction")
+        # Lets a routing session send the transaction to a replica
+        self.db.info[READ_ONLY_KEY] = True
+        await self.db.connection(
+            execution_options={"postgresql_readonly": True}
+        )
+        self._owns_transaction = True
+
+    async def commit(self) -> None:
+        logger.debug("Skipping commit of read-only transaction")
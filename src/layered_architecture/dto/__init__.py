@@ -1,5 +1,11 @@
 from .error import ErrorEnvelope, ErrorResponse
-from .health import HealthResponse
+from .health import (
+    HealthResponse,
+    MethodTimingDTO,
+    MethodTimingsResponse,
+    PoolStatsDTO,
+    PoolStatusResponse,
+)
 from .order import (
     OrderCreateInternalDTO,
     OrderDTO,
@@ -8,4 +14,5 @@ from .order import (
     OrderUpdateDTO,
     OrderUpdateInternalDTO,
 )
+from .report import ProductSalesDTO, ServiceTypeSalesDTO
 from .user import UserReadDTO
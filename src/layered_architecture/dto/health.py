@@ -1,3 +1,5 @@
+from typing import List
+
 from .base import ModelConfigBaseModel
 
 
@@ -5,3 +7,52 @@ class HealthResponse(ModelConfigBaseModel):
     """Health check response model."""
 
     status: str
+
+
+class PoolStatsDTO(ModelConfigBaseModel):
+    """Connection pool gauges and cumulative counters."""
+
+    name: str
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    checkins: int
+    connects: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_avg: float
+    peak_checked_out: int
+    peak_overflow: int
+
+
+class PoolStatusResponse(ModelConfigBaseModel):
+    """Connection pool status response model."""
+
+    pools: List[PoolStatsDTO]
+
+
+class MethodTimingDTO(ModelConfigBaseModel):
+    """Calls, errors, rows and latency of a DAO or service method."""
+
+    layer: str
+    component: str
+    method: str
+    service_type: str
+    calls: int
+    errors: int
+    rows: int
+    seconds_total: float
+    seconds_avg: float
+    seconds_p50: float
+    seconds_p95: float
+    seconds_p99: float
+
+
+class MethodTimingsResponse(ModelConfigBaseModel):
+    """Method timings response model."""
+
+    methods: List[MethodTimingDTO]
@@ -8,6 +8,12 @@ from pydantic import Field
 from .base import ModelConfigBaseModel
 from layered_architecture.enums import OrderStatus, ServiceType
 
+# Bounds of the order columns
+MAX_QUANTITY = 32767  # SMALLINT
+MAX_NOTES_LENGTH = 500
+MAX_ADDRESS_LENGTH = 255
+MAX_AMOUNT = Decimal("99999999.99")  # NUMERIC(10, 2)
+
 
 class OrderItemInputDTO(ModelConfigBaseModel):
     """Input DTO for order items."""
@@ -17,7 +23,9 @@ class OrderItemInputDTO(ModelConfigBaseModel):
         ...,
         description="Name of the product (e.g., 'Margherita' for pizza or 'Heineken' for beer)",
     )
-    quantity: int = Field(..., ge=1, description="Quantity of the item")
+    quantity: int = Field(
+        ..., ge=1, le=MAX_QUANTITY, description="Quantity of the item"
+    )
 
 
 class OrderInputDTO(ModelConfigBaseModel):
@@ -25,8 +33,8 @@ class OrderInputDTO(ModelConfigBaseModel):
 
     service_type: ServiceType
     items: list[OrderItemInputDTO]
-    notes: str | None = None
-    delivery_address: str | None = None
+    notes: str | None = Field(None, max_length=MAX_NOTES_LENGTH)
+    delivery_address: str | None = Field(None, max_length=MAX_ADDRESS_LENGTH)
 
 
 class OrderCreateInternalDTO(ModelConfigBaseModel):
@@ -47,9 +55,9 @@ class OrderUpdateDTO(ModelConfigBaseModel):
 
     service_type: ServiceType
     items: list[OrderItemInputDTO]
-    notes: str | None = None
+    notes: str | None = Field(None, max_length=MAX_NOTES_LENGTH)
     status: OrderStatus
-    delivery_address: str | None = None
+    delivery_address: str | None = Field(None, max_length=MAX_ADDRESS_LENGTH)
 
 
 class OrderUpdateInternalDTO(ModelConfigBaseModel):
@@ -0,0 +1,32 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import Field
+
+from .base import ModelConfigBaseModel
+from layered_architecture.enums import ServiceType
+
+
+class ServiceTypeSalesDTO(ModelConfigBaseModel):
+    """Sales of a service type within an hour or day."""
+
+    bucket: datetime = Field(..., description="Start of the hour or day, UTC")
+    service_type: ServiceType = Field(..., description="Type of service")
+    orders: int = Field(..., description="Orders, cancelled ones excluded")
+    quantity: int = Field(..., description="Products sold")
+    revenue: Decimal = Field(..., description="Sum of the order totals")
+
+
+class ProductSalesDTO(ModelConfigBaseModel):
+    """Sales of a product within an hour or day."""
+
+    bucket: datetime = Field(..., description="Start of the hour or day, UTC")
+    product_type: str = Field(..., description="pizza or beer")
+    product_id: UUID = Field(..., description="ID of the product")
+    product_name: str | None = Field(
+        None, description="Name of the product, None if it was removed"
+    )
+    orders: int = Field(..., description="Orders including the product")
+    quantity: int = Field(..., description="Quantity sold")
+    revenue: Decimal = Field(..., description="Quantity times unit price")
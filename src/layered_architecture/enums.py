@@ -28,3 +28,10 @@ class OrderStatus(str, Enum):
     READY = "ready"
     DELIVERED = "delivered"
     CANCELLED = "cancelled"
+
+
+class ReportPeriod(str, Enum):
+    """Granularity of the sales rollups."""
+
+    HOUR = "hour"
+    DAY = "day"
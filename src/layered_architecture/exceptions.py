@@ -54,3 +54,20 @@ class NotFoundError(LayeredArchitectureException):
             message=message,
             key=key,
         )
+
+
+class QueryBudgetExceededError(LayeredArchitectureException):
+    """Exception raised when a scope runs more queries than its budget."""
+
+    def __init__(self, scope: str, budget: int) -> None:
+        """Initialize the query budget error.
+
+        :param scope: The scope whose budget was exceeded
+        :type scope: str
+        :param budget: The maximum number of queries allowed
+        :type budget: int
+        """
+        super().__init__(
+            code="query_budget_exceeded",
+            details=f"{scope} exceeded its budget of {budget} queries",
+        )
@@ -2,12 +2,14 @@ from logging import getLogger
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from layered_architecture.config.settings import settings
 from layered_architecture.dao.concrete.sqla_beer import SQLBeerDAO
 from layered_architecture.dao.concrete.sqla_order import SQLOrderDAO
 from layered_architecture.dao.concrete.sqla_pizza import SQLPizzaDAO
 from layered_architecture.db.models.order import ServiceType
-from layered_architecture.db.uow import SQLAUnitOfWork
+from layered_architecture.db.uow import SQLAReadOnlyUnitOfWork, SQLAUnitOfWork
 from layered_architecture.exceptions import NotFoundError
+from layered_architecture.observability import instrument
 from layered_architecture.services import (
     DeliveryOrderService,
     DineInOrderService,
@@ -27,17 +29,25 @@ class OrderServiceFactory:
     and service instantiation.
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, read_only: bool = False):
         """Initialize the factory with database session.
 
         :param db: The database session to use
         :type db: AsyncSession
+        :param read_only: Whether the services will only be used for reads,
+            in which case lookups run in a read-only transaction
+        :type read_only: bool
         """
         self.db = db
+        self.read_only = read_only
         self.uow = SQLAUnitOfWork(db)
-        self.pizza_dao = SQLPizzaDAO(db)
-        self.beer_dao = SQLBeerDAO(db)
-        self.order_dao = SQLOrderDAO(db)
+        self.read_uow = SQLAReadOnlyUnitOfWork(db)
+        enabled = self.instrumented = settings.METHOD_TIMING_ENABLED or bool(
+            settings.TRACING_EXPORTER
+        )
+        self.pizza_dao = instrument(SQLPizzaDAO(db), "dao", enabled=enabled)
+        self.beer_dao = instrument(SQLBeerDAO(db), "dao", enabled=enabled)
+        self.order_dao = instrument(SQLOrderDAO(db), "dao", enabled=enabled)
 
     async def get_service_by_order_id(
         self, order_id: str
@@ -50,6 +60,9 @@ class OrderServiceFactory:
         :rtype: OrderServiceInterface
         :raises NotFoundError: If order not found
         """
+        if self.read_only:
+            # The service's read-only unit of work ends this transaction
+            await self.read_uow.begin()
         order = await self.order_dao.get_by_id(order_id)
         if not order:
             raise NotFoundError(
@@ -70,22 +83,45 @@ class OrderServiceFactory:
         :rtype: OrderServiceInterface
         :raises ValueError: If service type is not supported
         """
+        service: OrderServiceInterface
         match service_type:
             case ServiceType.DINE_IN:
-                return DineInOrderService(
-                    self.pizza_dao, self.beer_dao, self.order_dao, self.uow
+                service = DineInOrderService(
+                    self.pizza_dao,
+                    self.beer_dao,
+                    self.order_dao,
+                    self.uow,
+                    self.read_uow,
                 )
             case ServiceType.TAKEAWAY:
-                return TakeawayOrderService(
-                    self.pizza_dao, self.beer_dao, self.order_dao, self.uow
+                service = TakeawayOrderService(
+                    self.pizza_dao,
+                    self.beer_dao,
+                    self.order_dao,
+                    self.uow,
+                    self.read_uow,
                 )
             case ServiceType.DELIVERY:
-                return DeliveryOrderService(
-                    self.pizza_dao, self.beer_dao, self.order_dao, self.uow
+                service = DeliveryOrderService(
+                    self.pizza_dao,
+                    self.beer_dao,
+                    self.order_dao,
+                    self.uow,
+                    self.read_uow,
                 )
             case ServiceType.LATE_NIGHT:
-                return LateNightOrderService(
-                    self.pizza_dao, self.beer_dao, self.order_dao, self.uow
+                service = LateNightOrderService(
+                    self.pizza_dao,
+                    self.beer_dao,
+                    self.order_dao,
+                    self.uow,
+                    self.read_uow,
                 )
             case _:
                 raise ValueError(f"Unsupported service type: {service_type}")
+        return instrument(
+            service,
+            "service",
+            service_type=service_type.value,
+            enabled=self.instrumented,
+        )
@@ -1,3 +1,8 @@
+import asyncio
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from layered_architecture.api.handlers import (
@@ -5,8 +10,87 @@ from layered_architecture.api.handlers import (
     configure_logging,
     configure_middlewares,
     configure_routers,
+    configure_tracing,
 )
 from layered_architecture.config.settings import settings
+from layered_architecture.db.partitions import run_partition_maintenance
+from layered_architecture.db.session import engines
+from layered_architecture.db.warmup import warm_up
+from layered_architecture.observability import method_timings, traffic_recorder
+
+logger = getLogger(__name__)
+
+
+async def _warm_up_pools() -> None:
+    await warm_up(engines.primary(), settings.DATABASE_POOL_PREFILL)
+    for replica in engines.replicas().replicas:
+        await warm_up(replica, settings.DATABASE_POOL_PREFILL)
+
+
+async def _warm_up(app: FastAPI) -> None:
+    """Warm the connection pools, then report ready whatever the outcome.
+
+    :param app: The application to mark ready
+    :type app: FastAPI
+    """
+    try:
+        await asyncio.wait_for(
+            _warm_up_pools(), settings.DATABASE_WARMUP_TIMEOUT
+        )
+    except Exception as e:
+        # The pools still fill lazily, warm-up only saves latency
+        logger.error(f"Database warm-up failed: {e!r}", exc_info=True)
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm the connection pools on startup and dispose them on shutdown.
+
+    Warm-up runs in the background, so the server starts at once and only
+    reports ready once warm-up has finished or timed out.
+    """
+    app.state.ready = False
+    async with engines.lifespan():
+        tasks = [asyncio.create_task(_warm_up(app))]
+        if settings.METHOD_TIMING_DUMP_SECONDS > 0:
+            tasks.append(
+                asyncio.create_task(
+                    method_timings.dump_periodically(
+                        settings.METHOD_TIMING_DUMP_SECONDS
+                    )
+                )
+            )
+        if traffic_recorder.path is not None:
+            tasks.append(
+                asyncio.create_task(
+                    traffic_recorder.run_flusher(
+                        settings.TRAFFIC_CAPTURE_FLUSH_SECONDS
+                    )
+                )
+            )
+        if settings.PARTITION_MAINTENANCE_SECONDS > 0:
+            tasks.append(
+                asyncio.create_task(
+                    run_partition_maintenance(
+                        engines.primary(),
+                        settings.PARTITION_MAINTENANCE_SECONDS,
+                    )
+                )
+            )
+        try:
+            yield
+        finally:
+            app.state.ready = False
+            for task in tasks:
+                task.cancel()
+            # Cancelled tasks may still hold connections until they finish
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if tracer_provider is not None:
+                # Exports the remaining spans and closes the exporter
+                await asyncio.to_thread(tracer_provider.shutdown)
+            await traffic_recorder.flush()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -15,9 +99,11 @@ app = FastAPI(
     debug=settings.DEBUG,
     version=settings.VERSION,
     docs_url="/docs",
+    lifespan=lifespan,
 )
 
 configure_exception_handlers(app)
 configure_middlewares(app)
 configure_routers(app)
 configure_logging()
+tracer_provider = configure_tracing()
@@ -0,0 +1,28 @@
+from .capture import TrafficRecorder, body_shape, traffic_recorder
+from .metrics import Histogram, HTTPMetrics, http_metrics
+from .pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    PoolStats,
+    monitor_engine,
+    pool_stats,
+)
+from .queries import (
+    QueryStats,
+    current_query_stats,
+    instrument_engine,
+    track_queries,
+)
+from .slow_queries import (
+    SlowQueryLog,
+    find_origin,
+    is_plain_select,
+    parameter_shape,
+)
+from .timing import (
+    Instrumented,
+    MethodTimings,
+    instrument,
+    method_timings,
+    service_type_scope,
+)
+from .tracing import FileSpanExporter, create_tracer_provider, tracer
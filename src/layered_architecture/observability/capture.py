@@ -0,0 +1,106 @@
+import asyncio
+import json
+from logging import getLogger
+from typing import Any, Dict, List, Optional
+
+logger = getLogger(__name__)
+
+# Fields with a small set of harmless values, kept as is in body shapes
+KEPT_FIELDS = frozenset({"service_type", "status", "type", "quantity"})
+
+
+def body_shape(value: Any, key: Optional[str] = None) -> Any:
+    """Strip a JSON body down to its structure.
+
+    Strings and numbers are replaced by their type name, except for the
+    fields in ``KEPT_FIELDS``. Lists keep their length, so the number of
+    items of an order survives.
+
+    :param value: The decoded JSON body, or a value within it
+    :type value: Any
+    :param key: The field holding the value, if any
+    :type key: Optional[str]
+    :return: The shape of the value
+    :rtype: Any
+    """
+    if isinstance(value, dict):
+        return {k: body_shape(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [body_shape(v) for v in value]
+    if value is None:
+        return None
+    if key in KEPT_FIELDS and isinstance(value, (str, int)):
+        return value
+    return type(value).__name__
+
+
+class TrafficRecorder:
+    """Append captured requests to a file, one compact JSON line each.
+
+    Like the span exporters, entries are buffered and written off the event
+    loop on flush; entries beyond ``max_buffer`` are dropped and counted.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, max_buffer: int = 10000
+    ) -> None:
+        """Initialize the recorder.
+
+        :param path: The file to append to, None to disable the recorder
+        :type path: Optional[str]
+        :param max_buffer: Entries kept before new ones are dropped
+        :type max_buffer: int
+        """
+        self.path = path
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._buffer: List[str] = []
+
+    def configure(self, path: Optional[str]) -> None:
+        """Replace the file to append to.
+
+        :param path: The file to append to, None to disable the recorder
+        :type path: Optional[str]
+        """
+        self.path = path
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Buffer a captured request.
+
+        :param entry: The request metadata
+        :type entry: Dict[str, Any]
+        """
+        if self.path is None:
+            return
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self._buffer.append(json.dumps(entry, separators=(",", ":")))
+
+    async def flush(self) -> None:
+        """Append the buffered entries to the file."""
+        if not self._buffer or self.path is None:
+            return
+        lines, self._buffer = self._buffer, []
+        try:
+            await asyncio.to_thread(self._append, "\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not store {len(lines)} requests: {e}")
+
+    def _append(self, text: str) -> None:
+        assert self.path is not None
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(text)
+
+    async def run_flusher(self, interval: float) -> None:
+        """Flush every ``interval`` seconds until cancelled.
+
+        :param interval: Seconds between flushes
+        :type interval: float
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+
+traffic_recorder = TrafficRecorder()
@@ -0,0 +1,187 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets.
+
+    Bucket counts are kept per bucket and only made cumulative when
+    rendered, so observing a value is a bisect and two increments.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram.
+
+        :param buckets: Upper bounds of the buckets, ascending
+        :type buckets: Sequence[float]
+        """
+        self.buckets = tuple(buckets)
+        # The last slot counts the values above every bound (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value.
+
+        :param value: The observed value
+        :type value: float
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def count(self) -> int:
+        """Number of observed values."""
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it.
+
+        :param q: The quantile, between 0 and 1
+        :type q: float
+        :return: The estimate, the largest value if above every bound
+        :rtype: float
+        """
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.max
+
+
+class HTTPMetrics:
+    """Request, error, duration and in-flight metrics of the HTTP API.
+
+    Everything runs on the event loop thread, so plain dictionaries are
+    updated without locks and rendered in the Prometheus text format.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """Initialize empty metrics.
+
+        :param buckets: Upper bounds of the latency buckets in seconds
+        :type buckets: Sequence[float]
+        """
+        self.buckets = tuple(buckets)
+        self.requests: DefaultDict[Labels, int] = defaultdict(int)
+        self.errors: DefaultDict[Labels, int] = defaultdict(int)
+        self.durations: Dict[Labels, Histogram] = {}
+        self.in_flight = 0
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        error: str | None = None,
+    ) -> None:
+        """Record a finished request.
+
+        :param method: The HTTP method
+        :type method: str
+        :param route: The route template that handled the request
+        :type route: str
+        :param status: The response status code
+        :type status: int
+        :param duration: Seconds the request took
+        :type duration: float
+        :param error: The error category, if the request failed
+        :type error: str | None
+        """
+        route_labels = (("method", method), ("route", route))
+        self.requests[route_labels + (("status", str(status)),)] += 1
+        if error is not None:
+            self.errors[route_labels + (("category", error),)] += 1
+        histogram = self.durations.get(route_labels)
+        if histogram is None:
+            histogram = self.durations[route_labels] = Histogram(self.buckets)
+        histogram.observe(duration)
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        :return: The metrics
+        :rtype: str
+        """
+        lines: List[str] = [
+            "# HELP http_requests_total Requests handled.",
+            "# TYPE http_requests_total counter",
+        ]
+        for labels, value in list(self.requests.items()):
+            lines.append(
+                f"http_requests_total{_format_labels(labels)} {value}"
+            )
+        lines += [
+            "# HELP http_request_errors_total Failed requests by category.",
+            "# TYPE http_request_errors_total counter",
+        ]
+        for labels, value in list(self.errors.items()):
+            lines.append(
+                f"http_request_errors_total{_format_labels(labels)} {value}"
+            )
+        lines += [
+            "# HELP http_request_duration_seconds Request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for labels, histogram in list(self.durations.items()):
+            lines += self._render_histogram(
+                "http_request_duration_seconds", labels, histogram
+            )
+        lines += [
+            "# HELP http_requests_in_flight Requests being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(
+        name: str, labels: Labels, histogram: Histogram
+    ) -> List[str]:
+        lines = []
+        cumulative = 0
+        bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+        for bound, count in zip(bounds, histogram.counts):
+            cumulative += count
+            bucket_labels = _format_labels(labels + (("le", bound),))
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+http_metrics = HTTPMetrics()
@@ -0,0 +1,121 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+@dataclass
+class PoolStats:
+    """Cumulative connection pool counters."""
+
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    peak_checked_out: int = 0
+    peak_overflow: int = 0
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording checkout wait time and timeouts.
+
+    SQLAlchemy has no event for the start of a checkout, so the wait is
+    timed around ``connect``, which covers queueing, new connections and
+    pre-ping. Everything else is fed from pool events.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        event.listen(self, "checkout", self._on_checkout)
+        event.listen(self, "checkin", self._on_checkin)
+        event.listen(self, "connect", self._on_connect)
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.stats.wait_seconds_total += waited
+            self.stats.wait_seconds_max = max(
+                self.stats.wait_seconds_max, waited
+            )
+
+    def _on_checkout(self, *args: Any) -> None:
+        self.stats.checkouts += 1
+        self.stats.peak_checked_out = max(
+            self.stats.peak_checked_out, self.checkedout()
+        )
+        self.stats.peak_overflow = max(
+            self.stats.peak_overflow, self.overflow()
+        )
+
+    def _on_checkin(self, *args: Any) -> None:
+        self.stats.checkins += 1
+
+    def _on_connect(self, *args: Any) -> None:
+        self.stats.connects += 1
+
+
+# Engines and their configured max overflow, by reported name
+_monitored: Dict[str, Tuple[AsyncEngine, int]] = {}
+
+
+def monitor_engine(name: str, engine: AsyncEngine, max_overflow: int) -> None:
+    """Register an engine whose pool should be reported.
+
+    :param name: The name to report the pool under
+    :type name: str
+    :param engine: The engine to report
+    :type engine: AsyncEngine
+    :param max_overflow: The max overflow the pool was created with
+    :type max_overflow: int
+    """
+    _monitored[name] = (engine, max_overflow)
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Get a snapshot of every monitored pool.
+
+    :return: Gauges and counters for each monitored pool
+    :rtype: List[Dict[str, Any]]
+    """
+    snapshots = []
+    for name, (engine, max_overflow) in _monitored.items():
+        pool = engine.pool
+        if not isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+            continue
+        stats = pool.stats
+        snapshots.append(
+            {
+                "name": name,
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": max_overflow,
+                "checkouts": stats.checkouts,
+                "checkins": stats.checkins,
+                "connects": stats.connects,
+                "timeouts": stats.timeouts,
+                "wait_seconds_total": stats.wait_seconds_total,
+                "wait_seconds_max": stats.wait_seconds_max,
+                "wait_seconds_avg": (
+                    stats.wait_seconds_total / stats.checkouts
+                    if stats.checkouts
+                    else 0.0
+                ),
+                "peak_checked_out": stats.peak_checked_out,
+                "peak_overflow": max(stats.peak_overflow, 0),
+            }
+        )
+    return snapshots
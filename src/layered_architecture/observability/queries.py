@@ -0,0 +1,165 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from layered_architecture.exceptions import QueryBudgetExceededError
+
+
+class QueryStats:
+    """Statements executed and time spent in the database within a scope.
+
+    Scopes nest: a statement is recorded in the current scope and in every
+    enclosing one, so a unit of work's queries also count for its request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["QueryStats"] = None,
+        budget: Optional[int] = None,
+    ) -> None:
+        """Initialize an empty scope.
+
+        :param name: Name of the scope, used in logs and errors
+        :type name: str
+        :param parent: The enclosing scope, if any
+        :type parent: Optional[QueryStats]
+        :param budget: Maximum statements allowed, enforced when set
+        :type budget: Optional[int]
+        """
+        self.name = name
+        self.parent = parent
+        self.budget = budget
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def check_budget(self) -> None:
+        """Fail before a statement that would exceed an enforced budget.
+
+        :raises QueryBudgetExceededError: If any enclosing budget is spent
+        """
+        scope: Optional[QueryStats] = self
+        while scope is not None:
+            if scope.budget is not None and scope.count >= scope.budget:
+                raise QueryBudgetExceededError(scope.name, scope.budget)
+            scope = scope.parent
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record an executed statement in this and every enclosing scope.
+
+        :param statement: The SQL statement
+        :type statement: str
+        :param duration: Seconds the statement took
+        :type duration: float
+        """
+        scope: Optional[QueryStats] = self
+        while scope is not None:
+            scope.count += 1
+            scope.duration += duration
+            scope.statements[statement] += 1
+            scope = scope.parent
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Get statements executed at least ``threshold`` times.
+
+        Identical statements repeated within one request are the signature
+        of an N+1 query pattern.
+
+        :param threshold: Minimum number of executions to report
+        :type threshold: int
+        :return: The repeated statements and their counts
+        :rtype: List[Tuple[str, int]]
+        """
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Get the innermost query tracking scope, if any.
+
+    :return: The current scope
+    :rtype: Optional[QueryStats]
+    """
+    return _current.get()
+
+
+@contextmanager
+def track_queries(
+    name: str, budget: Optional[int] = None
+) -> Iterator[QueryStats]:
+    """Track the statements executed within the block.
+
+    Usable in tests to assert a query budget::
+
+        with track_queries("get_all", budget=2):
+            await dao.get_all()
+
+    :param name: Name of the scope
+    :type name: str
+    :param budget: Maximum statements allowed, enforced when set
+    :type budget: Optional[int]
+    :yield: The scope's statistics
+    :rtype: Iterator[QueryStats]
+    """
+    stats = QueryStats(name, parent=_current.get(), budget=budget)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.check_budget()
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record every statement run by an engine in the current scope.
+
+    :param engine: The engine to instrument
+    :type engine: AsyncEngine
+    """
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+    )
+    event.listen(
+        engine.sync_engine, "after_cursor_execute", _after_cursor_execute
+    )
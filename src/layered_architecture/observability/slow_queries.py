@@ -0,0 +1,210 @@
+import asyncio
+import re
+import sys
+import time
+from contextvars import Context
+from logging import getLogger
+from types import FrameType
+from typing import Any, Iterator, Optional, Set
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = getLogger(__name__)
+
+DAO_PACKAGE = "layered_architecture.dao."
+# Row locking clauses, which EXPLAIN ANALYZE would really take
+LOCKING_CLAUSE = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE
+)
+
+
+def _frames() -> Iterator[FrameType]:
+    # Statements run in a greenlet spawned by the awaiting coroutine, so
+    # the calling DAO method is found on the parent greenlets' stacks
+    current: Optional[greenlet.greenlet] = greenlet.getcurrent()
+    frame: Optional[FrameType] = sys._getframe(1)
+    while current is not None:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent
+        frame = current.gr_frame if current is not None else None
+
+
+def find_origin() -> str:
+    """Get the DAO method running the current statement.
+
+    :return: The module and qualified name of the method, or ``unknown``
+    :rtype: str
+    """
+    for frame in _frames():
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(DAO_PACKAGE):
+            return f"{module}:{frame.f_code.co_qualname}"
+    return "unknown"
+
+
+def is_plain_select(statement: str) -> bool:
+    """Check whether a statement only reads, without locking rows.
+
+    :param statement: The SQL statement
+    :type statement: str
+    :return: True for a SELECT without a row locking clause
+    :rtype: bool
+    """
+    return statement.lstrip().upper().startswith(
+        "SELECT"
+    ) and not LOCKING_CLAUSE.search(statement)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe statement parameters by type, without their values.
+
+    :param parameters: The DBAPI parameters
+    :type parameters: Any
+    :param executemany: Whether the parameters are a batch
+    :type executemany: bool
+    :return: The parameter types
+    :rtype: str
+    """
+    if executemany:
+        batch = list(parameters)
+        first = parameter_shape(batch[0]) if batch else "()"
+        return f"{len(batch)} x {first}"
+    if isinstance(parameters, dict):
+        types = ", ".join(
+            f"{key}: {type(value).__name__}"
+            for key, value in parameters.items()
+        )
+        return f"{{{types}}}"
+    if isinstance(parameters, (list, tuple)):
+        return f"({', '.join(type(value).__name__ for value in parameters)})"
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Log statements slower than a threshold.
+
+    Each slow statement is logged with its SQL, parameter types, duration
+    and the DAO method that ran it. With ``explain``, slow ``SELECT``
+    statements that lock no rows are also run once under ``EXPLAIN
+    (ANALYZE, BUFFERS)`` in a separate read-only transaction, after the
+    query that triggered it, and the plan is logged.
+    """
+
+    MAX_EXPLAINED = 1000
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        threshold: float,
+        explain: bool = False,
+        explain_timeout: float = 5.0,
+    ) -> None:
+        """Initialize the log.
+
+        :param engine: The engine whose statements to watch
+        :type engine: AsyncEngine
+        :param threshold: Seconds above which a statement is slow
+        :type threshold: float
+        :param explain: Whether to capture plans of slow statements
+        :type explain: bool
+        :param explain_timeout: Seconds a plan capture may run for
+        :type explain_timeout: float
+        """
+        self.engine = engine
+        self.threshold = threshold
+        self.explain = explain
+        self.explain_timeout = explain_timeout
+        self._explained: Set[str] = set()
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    def attach(self) -> "SlowQueryLog":
+        """Start watching the engine's statements.
+
+        :return: The log
+        :rtype: SlowQueryLog
+        """
+        sync_engine = self.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before)
+        event.listen(sync_engine, "after_cursor_execute", self._after)
+        return self
+
+    def _before(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("slow_query_start", []).append(
+            time.perf_counter()
+        )
+
+    def _after(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        duration = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if duration < self.threshold:
+            return
+        origin = find_origin()
+        logger.warning(
+            f"Slow query ({duration * 1000:.1f}ms) from {origin}: "
+            f"{statement} params={parameter_shape(parameters, executemany)}"
+        )
+        if self.explain and not executemany:
+            self._schedule_explain(statement, parameters, origin)
+
+    def _schedule_explain(
+        self, statement: str, parameters: Any, origin: str
+    ) -> None:
+        if not is_plain_select(statement):
+            return
+        if statement in self._explained:
+            return
+        if len(self._explained) >= self.MAX_EXPLAINED:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explained.add(statement)
+        # A fresh context keeps the plan's queries out of the request's
+        # query counts and off any replica routing
+        task = loop.create_task(
+            self._log_plan(statement, parameters, origin), context=Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _log_plan(
+        self, statement: str, parameters: Any, origin: str
+    ) -> None:
+        timeout = int(self.explain_timeout * 1000)
+        try:
+            async with self.engine.connect() as conn:
+                # EXPLAIN ANALYZE really runs the statement
+                conn = await conn.execution_options(postgresql_readonly=True)
+                async with conn.begin() as transaction:
+                    await conn.exec_driver_sql(
+                        f"SET LOCAL statement_timeout = {timeout}"
+                    )
+                    result = await conn.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+                    )
+                    plan = "\n".join(row[0] for row in result)
+                    await transaction.rollback()
+        except Exception as e:
+            logger.warning(f"Could not explain slow query from {origin}: {e}")
+            return
+        logger.warning(f"Plan for slow query from {origin}:\n{plan}")
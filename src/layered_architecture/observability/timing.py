@@ -0,0 +1,281 @@
+import asyncio
+import functools
+import inspect
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from .metrics import Histogram
+from .tracing import tracer
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+METHOD_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+_service_type: ContextVar[Optional[str]] = ContextVar(
+    "service_type", default=None
+)
+
+
+def count_rows(result: Any) -> int:
+    """Count the rows a method returned.
+
+    :param result: The method's return value
+    :type result: Any
+    :return: The length of a list, 0 for ``None`` and 1 otherwise
+    :rtype: int
+    """
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+@dataclass
+class MethodStats:
+    """Calls, errors, rows and latency of one method."""
+
+    latency: Histogram
+    errors: int = 0
+    rows: int = 0
+
+
+@dataclass
+class MethodTimings:
+    """Latency of DAO and service methods, per layer and service type.
+
+    Like the HTTP metrics, the statistics are plain dictionaries updated on
+    the event loop thread without locks.
+    """
+
+    buckets: Sequence[float] = METHOD_BUCKETS
+    methods: Dict[Tuple[str, str, str, str], MethodStats] = field(
+        default_factory=dict
+    )
+
+    def observe(
+        self,
+        key: Tuple[str, str, str, str],
+        duration: float,
+        rows: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Record a finished call.
+
+        :param key: Layer, component, method and service type of the call
+        :type key: Tuple[str, str, str, str]
+        :param duration: Seconds the call took
+        :type duration: float
+        :param rows: Rows the call returned
+        :type rows: int
+        :param error: Whether the call raised
+        :type error: bool
+        """
+        stats = self.methods.get(key)
+        if stats is None:
+            stats = self.methods[key] = MethodStats(Histogram(self.buckets))
+        stats.latency.observe(duration)
+        stats.rows += rows
+        stats.errors += error
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Get the statistics of every method called so far.
+
+        :return: One entry per layer, component, method and service type
+        :rtype: List[Dict[str, Any]]
+        """
+        entries = []
+        for (layer, component, method, service_type), stats in list(
+            self.methods.items()
+        ):
+            latency = stats.latency
+            calls = latency.count
+            entries.append(
+                {
+                    "layer": layer,
+                    "component": component,
+                    "method": method,
+                    "service_type": service_type,
+                    "calls": calls,
+                    "errors": stats.errors,
+                    "rows": stats.rows,
+                    "seconds_total": latency.sum,
+                    "seconds_avg": latency.sum / calls if calls else 0.0,
+                    "seconds_p50": latency.quantile(0.5),
+                    "seconds_p95": latency.quantile(0.95),
+                    "seconds_p99": latency.quantile(0.99),
+                }
+            )
+        return entries
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        self.methods.clear()
+
+    async def dump_periodically(self, interval: float) -> None:
+        """Log the snapshot every ``interval`` seconds until cancelled.
+
+        :param interval: Seconds between dumps
+        :type interval: float
+        """
+        while True:
+            await asyncio.sleep(interval)
+            logger.info(f"Method timings: {json.dumps(self.snapshot())}")
+
+
+method_timings = MethodTimings()
+
+
+@contextmanager
+def service_type_scope(service_type: Optional[str]) -> Iterator[None]:
+    """Attribute the calls made within the block to a service type.
+
+    :param service_type: The service type, if any
+    :type service_type: Optional[str]
+    """
+    token = _service_type.set(service_type)
+    try:
+        yield
+    finally:
+        _service_type.reset(token)
+
+
+class Instrumented:
+    """Proxy timing and tracing every coroutine method of the wrapped object.
+
+    Calls are recorded under the proxy's layer and the wrapped class, and
+    run in a span when tracing is enabled. A proxy given a service type
+    attributes every call made within its methods, including those to
+    instrumented DAOs, to that service type.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        layer: str,
+        service_type: Optional[str] = None,
+        timings: MethodTimings = method_timings,
+    ) -> None:
+        """Initialize the proxy.
+
+        :param target: The object to instrument
+        :type target: Any
+        :param layer: The architecture layer, such as ``dao`` or ``service``
+        :type layer: str
+        :param service_type: The service type the object serves, if any
+        :type service_type: Optional[str]
+        :param timings: The registry to record into
+        :type timings: MethodTimings
+        """
+        self._target = target
+        self._layer = layer
+        self._service_type = service_type
+        self._timings = timings
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+        wrapper = self._wrap(name, attribute)
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, wrapper)
+        return wrapper
+
+    def _wrap(
+        self, name: str, method: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        component = type(self._target).__name__
+        span_name = f"{component}.{name}"
+        parameters = list(inspect.signature(method).parameters)
+        order_id_index = (
+            parameters.index("order_id") if "order_id" in parameters else None
+        )
+
+        @functools.wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            service_type = self._service_type or _service_type.get()
+            key = (self._layer, component, name, service_type or "")
+            attributes: Dict[str, Any] = {"layer": self._layer}
+            if service_type:
+                attributes["service.type"] = service_type
+            order_id = kwargs.get("order_id")
+            if order_id is None and order_id_index is not None:
+                if order_id_index < len(args):
+                    order_id = args[order_id_index]
+            if order_id is not None:
+                attributes["order.id"] = str(order_id)
+            start = time.perf_counter()
+            try:
+                with tracer.start_as_current_span(
+                    span_name, attributes=attributes
+                ) as span:
+                    with service_type_scope(service_type):
+                        result = await method(*args, **kwargs)
+                    rows = count_rows(result)
+                    span.set_attribute("db.rows", rows)
+                    items = getattr(result, "items", None)
+                    if isinstance(items, list):
+                        span.set_attribute("order.item_count", len(items))
+            except Exception:
+                self._timings.observe(
+                    key, time.perf_counter() - start, error=True
+                )
+                raise
+            self._timings.observe(key, time.perf_counter() - start, rows=rows)
+            return result
+
+        return wrapper
+
+
+def instrument(
+    target: T,
+    layer: str,
+    service_type: Optional[str] = None,
+    enabled: bool = True,
+) -> T:
+    """Time and trace the coroutine methods of a DAO or service.
+
+    :param target: The object to instrument
+    :type target: T
+    :param layer: The architecture layer, such as ``dao`` or ``service``
+    :type layer: str
+    :param service_type: The service type the object serves, if any
+    :type service_type: Optional[str]
+    :param enabled: Whether to instrument, or return the object as is
+    :type enabled: bool
+    :return: The instrumented object, with the wrapped object's interface
+    :rtype: T
+    """
+    if not enabled:
+        return target
+    return Instrumented(target, layer, service_type)  # type: ignore[return-value]
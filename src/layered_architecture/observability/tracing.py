@@ -0,0 +1,73 @@
+from typing import IO, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+# Spans of the application; they cost nothing until a tracer provider is
+# set with ``trace.set_tracer_provider``
+tracer = trace.get_tracer("layered_architecture")
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the exporter.
+
+        :param path: The file to append to
+        :type path: str
+        """
+        self.path = path
+        self._file: IO[str] = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self._file.writelines(
+            span.to_json(indent=None) + "\n" for span in spans
+        )
+        self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+def create_tracer_provider(
+    exporter: SpanExporter,
+    service_name: str,
+    sample_ratio: float = 1.0,
+    flush_seconds: float = 5.0,
+) -> TracerProvider:
+    """Create a tracer provider batching its spans to an exporter.
+
+    New traces are sampled at ``sample_ratio``, traces continued from a
+    ``traceparent`` header follow the caller's decision. Spans are
+    exported from a background thread, never from the event loop.
+
+    :param exporter: Where to send finished spans
+    :type exporter: SpanExporter
+    :param service_name: The ``service.name`` resource attribute
+    :type service_name: str
+    :param sample_ratio: Share of new traces to record
+    :type sample_ratio: float
+    :param flush_seconds: Seconds between exports of the buffered spans
+    :type flush_seconds: float
+    :return: The tracer provider
+    :rtype: TracerProvider
+    """
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            exporter, schedule_delay_millis=int(flush_seconds * 1000)
+        )
+    )
+    return provider
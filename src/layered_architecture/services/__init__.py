@@ -5,15 +5,22 @@ from .concrete import (
     DineInOrderService,
     FakeAuthService,
     LateNightOrderService,
+    ReportService,
     TakeawayOrderService,
 )
-from .interfaces import AuthServiceInterface, OrderServiceInterface
+from .interfaces import (
+    AuthServiceInterface,
+    OrderServiceInterface,
+    ReportServiceInterface,
+)
 
 __all__ = [
     "DeliveryOrderService",
     "DineInOrderService",
     "LateNightOrderService",
+    "ReportService",
     "TakeawayOrderService",
     "AuthServiceInterface",
     "OrderServiceInterface",
+    "ReportServiceInterface",
 ]
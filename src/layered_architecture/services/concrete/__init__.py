@@ -2,4 +2,5 @@ from .delivery import DeliveryOrderService
 from .dine_in import DineInOrderService
 from .fake_auth import FakeAuthService
 from .late_night import LateNightOrderService
+from .report import ReportService
 from .takeaway import TakeawayOrderService
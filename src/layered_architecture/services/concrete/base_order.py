@@ -28,6 +28,7 @@ class BaseOrderService(OrderServiceInterface):
         beer_dao: BeerDAOInterface,
         order_dao: OrderDAOInterface,
         uow: BaseUnitOfWork,
+        read_uow: Optional[BaseUnitOfWork] = None,
     ):
         """Initialize the base order service.
 
@@ -39,11 +40,15 @@ class BaseOrderService(OrderServiceInterface):
         :type order_dao: OrderDAOInterface
         :param uow: The unit of work
         :type uow: BaseUnitOfWork
+        :param read_uow: Optional read-only unit of work for pure reads,
+            defaults to ``uow``
+        :type read_uow: Optional[BaseUnitOfWork]
         """
         self.pizza_dao = pizza_dao
         self.beer_dao = beer_dao
         self.order_dao = order_dao
         self.uow = uow
+        self.read_uow = read_uow or uow
 
     async def cancel_pending_orders(
         self,
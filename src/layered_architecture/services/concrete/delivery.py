@@ -1,5 +1,6 @@
 from decimal import Decimal
 from logging import getLogger
+from typing import Optional
 from uuid import UUID
 
 from .base_order import BaseOrderService
@@ -35,11 +36,13 @@ class DeliveryOrderService(BaseOrderService):
         beer_dao: BeerDAOInterface,
         order_dao: OrderDAOInterface,
         uow: BaseUnitOfWork,
+        read_uow: Optional[BaseUnitOfWork] = None,
     ):
         self.pizza_dao = pizza_dao
         self.beer_dao = beer_dao
         self.order_dao = order_dao
         self.uow = uow
+        self.read_uow = read_uow or uow
 
     async def create_order(
         self,
@@ -117,7 +120,7 @@ class DeliveryOrderService(BaseOrderService):
         :return: The order with its current status
         :rtype: OrderDTO
         """
-        async with self.uow:
+        async with self.read_uow:
             order = await self.order_dao.get_by_id(str(order_id))
             if not order:
                 raise NotFoundError(
@@ -1,5 +1,6 @@
 from decimal import Decimal
 from logging import getLogger
+from typing import Optional
 from uuid import UUID
 
 from .base_order import BaseOrderService
@@ -34,8 +35,9 @@ class DineInOrderService(BaseOrderService):
         beer_dao: BeerDAOInterface,
         order_dao: OrderDAOInterface,
         uow: BaseUnitOfWork,
+        read_uow: Optional[BaseUnitOfWork] = None,
     ):
-        super().__init__(pizza_dao, beer_dao, order_dao, uow)
+        super().__init__(pizza_dao, beer_dao, order_dao, uow, read_uow)
 
     async def create_order(
         self,
@@ -130,7 +132,7 @@ class DineInOrderService(BaseOrderService):
         :return: The order with its current status
         :rtype: OrderDTO
         """
-        async with self.uow:
+        async with self.read_uow:
             order = await self.order_dao.get_by_id(str(order_id))
             if not order:
                 raise NotFoundError(
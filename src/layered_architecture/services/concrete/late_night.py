@@ -1,6 +1,7 @@
 from datetime import datetime, time
 from decimal import Decimal
 from logging import getLogger
+from typing import Optional
 from uuid import UUID
 
 from .base_order import BaseOrderService
@@ -40,11 +41,13 @@ class LateNightOrderService(BaseOrderService):
         beer_dao: BeerDAOInterface,
         order_dao: OrderDAOInterface,
         uow: BaseUnitOfWork,
+        read_uow: Optional[BaseUnitOfWork] = None,
     ):
         self.pizza_dao = pizza_dao
         self.beer_dao = beer_dao
         self.order_dao = order_dao
         self.uow = uow
+        self.read_uow = read_uow or uow
 
     def _is_late_night(self) -> bool:
         """Check if the current time is within late night hours.
@@ -140,7 +143,7 @@ class LateNightOrderService(BaseOrderService):
         :return: The order with its current status
         :rtype: OrderDTO
         """
-        async with self.uow:
+        async with self.read_uow:
             order = await self.order_dao.get_by_id(str(order_id))
             if not order:
                 raise NotFoundError(
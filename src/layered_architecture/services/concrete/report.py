@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from layered_architecture.dao.interfaces import ReportDAOInterface
+from layered_architecture.db.uow.base import BaseUnitOfWork
+from layered_architecture.dto.report import (
+    ProductSalesDTO,
+    ServiceTypeSalesDTO,
+)
+from layered_architecture.enums import ReportPeriod, ServiceType
+from layered_architecture.services.interfaces.report import (
+    ReportServiceInterface,
+)
+
+PRODUCT_TYPES = ("pizza", "beer")
+# Range reported when no start is given, and the longest range allowed
+DEFAULT_RANGES = {
+    ReportPeriod.HOUR: timedelta(days=1),
+    ReportPeriod.DAY: timedelta(days=30),
+}
+MAX_RANGES = {
+    ReportPeriod.HOUR: timedelta(days=31),
+    ReportPeriod.DAY: timedelta(days=366),
+}
+
+
+def report_range(
+    period: ReportPeriod,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Tuple[datetime, datetime]:
+    """Resolve and check the range of a report.
+
+    :param period: Hourly or daily buckets
+    :type period: ReportPeriod
+    :param since: Start of the range, defaults to a day or a month before
+        its end
+    :type since: Optional[datetime]
+    :param until: End of the range, defaults to now
+    :type until: Optional[datetime]
+    :return: The start and end of the range, timezone-aware
+    :rtype: Tuple[datetime, datetime]
+    :raises ValueError: If the range is empty or too long for the period
+    """
+    until = _aware(until) if until else datetime.now(timezone.utc)
+    since = _aware(since) if since else until - DEFAULT_RANGES[period]
+    if since >= until:
+        raise ValueError("The report range must end after it starts")
+    if until - since > MAX_RANGES[period]:
+        raise ValueError(
+            f"Reports by {period.value} cover at most "
+            f"{MAX_RANGES[period].days} days"
+        )
+    return since, until
+
+
+def _aware(moment: datetime) -> datetime:
+    # Naive times are UTC, like the buckets
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+class ReportService(ReportServiceInterface):
+    """Service reporting sales from the rollup tables."""
+
+    def __init__(
+        self, report_dao: ReportDAOInterface, read_uow: BaseUnitOfWork
+    ):
+        """Initialize the report service.
+
+        :param report_dao: The report DAO
+        :type report_dao: ReportDAOInterface
+        :param read_uow: The read-only unit of work
+        :type read_uow: BaseUnitOfWork
+        """
+        self.report_dao = report_dao
+        self.read_uow = read_uow
+
+    async def service_type_sales(
+        self,
+        period: ReportPeriod,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        service_type: Optional[ServiceType] = None,
+    ) -> List[ServiceTypeSalesDTO]:
+        """Report the sales per service type.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: Optional[datetime]
+        :param until: End of the range, exclusive, defaults to now
+        :type until: Optional[datetime]
+        :param service_type: Optional service type to filter by
+        :type service_type: Optional[ServiceType]
+        :return: The sales, by bucket then service type
+        :rtype: List[ServiceTypeSalesDTO]
+        """
+        since, until = report_range(period, since, until)
+        async with self.read_uow:
+            sales: List[ServiceTypeSalesDTO] = (
+                await self.report_dao.get_service_type_sales(
+                    period, since, until, service_type
+                )
+            )
+        return sales
+
+    async def product_sales(
+        self,
+        period: ReportPeriod,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_type: Optional[str] = None,
+    ) -> List[ProductSalesDTO]:
+        """Report the sales per product.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: Optional[datetime]
+        :param until: End of the range, exclusive, defaults to now
+        :type until: Optional[datetime]
+        :param product_type: Optional product type, pizza or beer
+        :type product_type: Optional[str]
+        :return: The sales, by bucket then revenue, highest first
+        :rtype: List[ProductSalesDTO]
+        """
+        if product_type is not None and product_type not in PRODUCT_TYPES:
+            raise ValueError(
+                f"Invalid product type: {product_type}. Only 'pizza' and "
+                "'beer' are supported"
+            )
+        since, until = report_range(period, since, until)
+        async with self.read_uow:
+            sales: List[ProductSalesDTO] = (
+                await self.report_dao.get_product_sales(
+                    period, since, until, product_type
+                )
+            )
+        return sales
@@ -1,5 +1,6 @@
 from decimal import Decimal
 from logging import getLogger
+from typing import Optional
 from uuid import UUID
 
 from .base_order import BaseOrderService
@@ -33,8 +34,9 @@ class TakeawayOrderService(BaseOrderService):
         beer_dao: BeerDAOInterface,
         order_dao: OrderDAOInterface,
         uow: BaseUnitOfWork,
+        read_uow: Optional[BaseUnitOfWork] = None,
     ):
-        super().__init__(pizza_dao, beer_dao, order_dao, uow)
+        super().__init__(pizza_dao, beer_dao, order_dao, uow, read_uow)
 
     async def create_order(
         self,
@@ -111,7 +113,7 @@ class TakeawayOrderService(BaseOrderService):
         :return: The order with its current status
         :rtype: OrderDTO
         """
-        async with self.uow:
+        async with self.read_uow:
             order = await self.order_dao.get_by_id(str(order_id))
             if not order:
                 raise NotFoundError(
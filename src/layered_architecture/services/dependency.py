@@ -3,14 +3,22 @@ from logging import getLogger
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from layered_architecture.config.settings import settings
+from layered_architecture.dao.concrete.sqla_report import SQLReportDAO
 from layered_architecture.db.depends import get_db
 from layered_architecture.db.models.order import ServiceType
+from layered_architecture.db.uow import SQLAReadOnlyUnitOfWork
 from layered_architecture.factories.order import OrderServiceFactory
+from layered_architecture.observability import instrument
 from layered_architecture.services.concrete.fake_auth import FakeAuthService
+from layered_architecture.services.concrete.report import ReportService
 from layered_architecture.services.interfaces.auth import AuthServiceInterface
 from layered_architecture.services.interfaces.order import (
     OrderServiceInterface,
 )
+from layered_architecture.services.interfaces.report import (
+    ReportServiceInterface,
+)
 
 logger = getLogger(__name__)
 
@@ -39,6 +47,7 @@ class DependencyService:
     async def get_order_service_by_id(
         order_id: str,
         db: AsyncSession = Depends(get_db),
+        read_only: bool = False,
     ) -> OrderServiceInterface:
         """Get an order service based on the order ID.
 
@@ -46,13 +55,38 @@ class DependencyService:
         :type order_id: str
         :param db: The database session to use
         :type db: AsyncSession
+        :param read_only: Whether the service will only be used for reads
+        :type read_only: bool
         :return: An order service instance
         :rtype: OrderServiceInterface
         :raises ValueError: If the order is not found
         """
-        factory = OrderServiceFactory(db)
+        factory = OrderServiceFactory(db, read_only=read_only)
         return await factory.get_service_by_order_id(order_id)
 
+    @staticmethod
+    async def get_report_service(
+        db: AsyncSession = Depends(get_db),
+    ) -> ReportServiceInterface:
+        """Get the sales report service.
+
+        :param db: The database session to use
+        :type db: AsyncSession
+        :return: A report service instance
+        :rtype: ReportServiceInterface
+        """
+        enabled = settings.METHOD_TIMING_ENABLED or bool(
+            settings.TRACING_EXPORTER
+        )
+        return instrument(
+            ReportService(
+                instrument(SQLReportDAO(db), "dao", enabled=enabled),
+                SQLAReadOnlyUnitOfWork(db),
+            ),
+            "service",
+            enabled=enabled,
+        )
+
     @staticmethod
     async def get_auth_service() -> AuthServiceInterface:
         """Get the authentication service.
@@ -1,4 +1,9 @@
 from .auth import AuthServiceInterface
 from .order import OrderServiceInterface
+from .report import ReportServiceInterface
 
-__all__ = ["OrderServiceInterface", "AuthServiceInterface"]
+__all__ = [
+    "OrderServiceInterface",
+    "AuthServiceInterface",
+    "ReportServiceInterface",
+]
@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from layered_architecture.dto.report import (
+    ProductSalesDTO,
+    ServiceTypeSalesDTO,
+)
+from layered_architecture.enums import ReportPeriod, ServiceType
+
+
+class ReportServiceInterface(ABC):  # pragma: no cover
+    """Interface for sales report services."""
+
+    @abstractmethod
+    async def service_type_sales(
+        self,
+        period: ReportPeriod,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        service_type: Optional[ServiceType] = None,
+    ) -> List[ServiceTypeSalesDTO]:
+        """Report the sales per service type.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: Optional[datetime]
+        :param until: End of the range, exclusive, defaults to now
+        :type until: Optional[datetime]
+        :param service_type: Optional service type to filter by
+        :type service_type: Optional[ServiceType]
+        :return: The sales, by bucket then service type
+        :rtype: List[ServiceTypeSalesDTO]
+        """
+        pass
+
+    @abstractmethod
+    async def product_sales(
+        self,
+        period: ReportPeriod,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        product_type: Optional[str] = None,
+    ) -> List[ProductSalesDTO]:
+        """Report the sales per product.
+
+        :param period: Hourly or daily buckets
+        :type period: ReportPeriod
+        :param since: Start of the range, inclusive
+        :type since: Optional[datetime]
+        :param until: End of the range, exclusive, defaults to now
+        :type until: Optional[datetime]
+        :param product_type: Optional product type, pizza or beer
+        :type product_type: Optional[str]
+        :return: The sales, by bucket then revenue, highest first
+        :rtype: List[ProductSalesDTO]
+        """
+        pass
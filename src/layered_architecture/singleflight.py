@@ -0,0 +1,70 @@
+import asyncio
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce identical in-flight async calls into a single awaited call.
+
+    The first caller for a key (the leader) runs the call, every caller that
+    arrives while it is still in flight awaits the leader's outcome. Nothing
+    is kept once the call settles, so results are never served stale.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty group of in-flight calls."""
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call is currently in flight for a key.
+
+        :param key: The key identifying the call
+        :type key: Hashable
+        :return: True if a call for the key has not settled yet
+        :rtype: bool
+        """
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` once for all concurrent callers sharing ``key``.
+
+        :param key: The key identifying identical calls
+        :type key: Hashable
+        :param fn: Factory for the awaitable to run when leading the call
+        :type fn: Callable[[], Awaitable[T]]
+        :return: The result of the shared call
+        :rtype: T
+        """
+        while (future := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not us: retry and maybe lead.
+                if not future.cancelled():
+                    raise
+                logger.debug(f"Leader for {key!r} cancelled, retrying")
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; mark it retrieved for the no-follower case
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+single_flight = SingleFlight()
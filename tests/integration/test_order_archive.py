@@ -0,0 +1,81 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from layered_architecture.dao.concrete import SQLOrderDAO
+from layered_architecture.dao.concrete.order_archive import archive_orders
+from layered_architecture.db.models import ArchivedOrderBeer, Order
+from layered_architecture.dto.order import (
+    OrderCreateInternalDTO,
+    OrderItemInputDTO,
+    OrderStatus,
+    OrderUpdateInternalDTO,
+    ServiceType,
+)
+
+ITEMS = [
+    OrderItemInputDTO(type="pizza", product_name="Margherita", quantity=1),
+    OrderItemInputDTO(type="beer", product_name="Heineken", quantity=2),
+]
+
+
+def order_input() -> OrderCreateInternalDTO:
+    return OrderCreateInternalDTO(
+        service_type=ServiceType.TAKEAWAY,
+        items=ITEMS,
+        customer_id=uuid4(),
+        subtotal=Decimal("24.97"),
+        total=Decimal("24.97"),
+        customer_email="john.doe@example.com",
+    )
+
+
+class TestArchiveOrders:
+    @pytest.mark.asyncio
+    async def test_moves_finished_orders_and_finds_them_by_id(
+        self,
+        db_engine: Any,
+        db: AsyncSession,
+        seed_test_data: None,
+    ) -> None:
+        # Given
+        dao = SQLOrderDAO(db)
+        delivered = await dao.create(order_input())
+        pending = await dao.create(order_input())
+        await dao.update(
+            str(delivered.id),
+            OrderUpdateInternalDTO(
+                service_type=ServiceType.TAKEAWAY,
+                items=ITEMS,
+                status=OrderStatus.DELIVERED,
+                customer_id=delivered.customer_id,
+                subtotal=Decimal("24.97"),
+                total=Decimal("24.97"),
+                customer_email="john.doe@example.com",
+            ),
+        )
+        await db.commit()
+
+        # When
+        archived = await archive_orders(
+            db_engine, delivered.created_at + timedelta(seconds=1)
+        )
+
+        # Then
+        assert archived == 1
+        assert await db.scalar(select(Order.id)) == pending.id
+        assert (
+            await db.scalar(
+                select(func.count()).select_from(ArchivedOrderBeer)
+            )
+            == 1
+        )
+        order = await dao.get_by_id(str(delivered.id))
+        assert order is not None
+        assert order.status == OrderStatus.DELIVERED
+        assert sorted(item.type for item in order.items) == ["beer", "pizza"]
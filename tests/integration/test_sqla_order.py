@@ -237,6 +237,44 @@ class TestSQLOrderDAO:
         # Since customer_email is None in get_all, we can't check for specific emails
         assert all(order.customer_email == "" for order in orders)
 
+    @pytest.mark.asyncio
+    async def test_get_all_pages_in_creation_order(
+        self,
+        db: AsyncSession,
+        seed_test_data: None,
+    ) -> None:
+        # Given
+        dao = SQLOrderDAO(db)
+        items = [
+            OrderItemInputDTO(
+                type="pizza",
+                product_name="Margherita",
+                quantity=1,
+            ),
+        ]
+        created = [
+            await dao.create(
+                OrderCreateInternalDTO(
+                    service_type=ServiceType.TAKEAWAY,
+                    items=items,
+                    customer_id=uuid4(),
+                    subtotal=Decimal("12.99"),
+                    total=Decimal("12.99"),
+                    customer_email="alice@example.com",
+                )
+            )
+            for _ in range(3)
+        ]
+
+        # When
+        first = await dao.get_all(limit=2)
+        second = await dao.get_all(after=first[-1].id, limit=2)
+
+        # Then
+        assert [order.id for order in first + second] == [
+            order.id for order in created
+        ]
+
     @pytest.mark.asyncio
     async def test_update(
         self,
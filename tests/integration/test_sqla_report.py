@@ -0,0 +1,108 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from layered_architecture.dao.concrete import SQLOrderDAO, SQLReportDAO
+from layered_architecture.dao.concrete.sales_rollup import (
+    rebuild_sales_rollups,
+)
+from layered_architecture.dto.order import (
+    OrderCreateInternalDTO,
+    OrderItemInputDTO,
+    OrderStatus,
+    OrderUpdateInternalDTO,
+    ServiceType,
+)
+from layered_architecture.enums import ReportPeriod
+
+ITEMS = [
+    OrderItemInputDTO(type="pizza", product_name="Margherita", quantity=1),
+    OrderItemInputDTO(type="beer", product_name="Heineken", quantity=2),
+]
+
+
+def order_input(customer_id: Any) -> OrderCreateInternalDTO:
+    return OrderCreateInternalDTO(
+        service_type=ServiceType.DINE_IN,
+        items=ITEMS,
+        customer_id=customer_id,
+        subtotal=Decimal("24.97"),
+        total=Decimal("24.97"),
+        customer_email="john.doe@example.com",
+    )
+
+
+class TestSQLReportDAO:
+    @pytest.mark.asyncio
+    async def test_rollups_follow_order_writes(
+        self,
+        db: AsyncSession,
+        seed_test_data: None,
+    ) -> None:
+        # Given
+        dao = SQLOrderDAO(db)
+        reports = SQLReportDAO(db)
+        customer_id = uuid4()
+        created = await dao.create(order_input(customer_id))
+        await dao.create(order_input(customer_id))
+        since = created.created_at - timedelta(days=1)
+        until = created.created_at + timedelta(days=1)
+
+        # When
+        await dao.update(
+            str(created.id),
+            OrderUpdateInternalDTO(
+                service_type=ServiceType.DINE_IN,
+                items=ITEMS,
+                status=OrderStatus.CANCELLED,
+                customer_id=customer_id,
+                subtotal=Decimal("24.97"),
+                total=Decimal("24.97"),
+                customer_email="john.doe@example.com",
+            ),
+        )
+        await db.commit()
+
+        # Then
+        (sales,) = await reports.get_service_type_sales(
+            ReportPeriod.HOUR, since, until
+        )
+        assert (sales.orders, sales.quantity) == (1, 3)
+        assert sales.revenue == Decimal("24.97")
+        products = await reports.get_product_sales(
+            ReportPeriod.DAY, since, until, product_type="beer"
+        )
+        assert [(p.product_name, p.quantity) for p in products] == [
+            ("Heineken", 2)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental_rollups(
+        self,
+        db_engine: Any,
+        db: AsyncSession,
+        seed_test_data: None,
+    ) -> None:
+        # Given
+        reports = SQLReportDAO(db)
+        created = await SQLOrderDAO(db).create(order_input(uuid4()))
+        await db.commit()
+        since = created.created_at - timedelta(days=1)
+        until = created.created_at + timedelta(days=1)
+        expected = await reports.get_product_sales(
+            ReportPeriod.DAY, since, until
+        )
+        await db.commit()
+
+        # When
+        await rebuild_sales_rollups(db_engine)
+
+        # Then
+        assert (
+            await reports.get_product_sales(ReportPeriod.DAY, since, until)
+            == expected
+        )
@@ -0,0 +1,129 @@
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from layered_architecture.analytics import Snapshot, build_report  # noqa: E402
+from layered_architecture.analytics.snapshot import (  # noqa: E402
+    ITEM_COLUMNS,
+    ORDER_COLUMNS,
+    SCHEMA_VERSION,
+)
+
+
+def snapshot() -> Snapshot:
+    # Two orders on June 1st, a cancelled one and one on June 2nd
+    orders = {
+        "created_at": np.array(
+            [
+                "2025-06-01T12:00",
+                "2025-06-01T19:00",
+                "2025-06-01T20:00",
+                "2025-06-02T12:00",
+            ],
+            dtype="datetime64[s]",
+        ),
+        # Codes are positions in the enums: dine in, delivery, takeaway
+        "service_type": np.array([0, 2, 1, 0], dtype="int8"),
+        # Pending, except the cancelled third order
+        "status": np.array([0, 0, 5, 0], dtype="int8"),
+        "subtotal_cents": np.array([2000, 1500, 900, 1000], dtype="int64"),
+        "total_cents": np.array([2000, 2000, 900, 1000], dtype="int64"),
+    }
+    items = {
+        "order_index": np.array([0, 0, 1, 2, 3], dtype="int64"),
+        "product_type": np.array([0, 1, 0, 0, 1], dtype="int8"),
+        "product_index": np.array([0, 0, 1, 1, 0], dtype="int32"),
+        "quantity": np.array([2, 1, 1, 5, 3], dtype="int32"),
+        # The last beers were sold after a price rise
+        "price_cents": np.array([800, 400, 900, 900, 500], dtype="int64"),
+    }
+    products = {
+        "pizza": [
+            {"id": "a", "name": "Margherita", "price_cents": 800},
+            {"id": "b", "name": "Pepperoni", "price_cents": 900},
+        ],
+        "beer": [{"id": "c", "name": "Lager", "price_cents": 400}],
+    }
+    return Snapshot(orders, items, products, {"orders": 4, "items": 5})
+
+
+class TestAnalytics:
+    def test_reports_exclude_cancelled_orders(self) -> None:
+        # When
+        report = build_report(snapshot())
+
+        # Then
+        assert report["revenue"]["total"] == 50.0
+        assert report["revenue"]["by_period"] == [
+            {"period": "2025-06-01", "revenue": 40.0, "orders": 2},
+            {"period": "2025-06-02", "revenue": 10.0, "orders": 1},
+        ]
+        assert report["basket"] == {
+            "avg_lines": round(4 / 3, 3),
+            "avg_quantity": round(7 / 3, 3),
+            "avg_total": round(50 / 3, 2),
+        }
+        assert [
+            (row["name"], row["quantity"], row["revenue"])
+            for row in report["popularity"]
+        ] == [
+            ("Lager", 4, 19.0),
+            ("Margherita", 2, 16.0),
+            ("Pepperoni", 1, 9.0),
+        ]
+        dine_in = report["service_types"][0]
+        assert dine_in["orders"] == 2
+        assert dine_in["avg_total"] == 15.0
+        assert dine_in["share"] == round(2 / 3, 4)
+
+    def test_filters_by_time_range(self) -> None:
+        # When
+        report = build_report(
+            snapshot(),
+            since=datetime(2025, 6, 1, 15, tzinfo=timezone.utc),
+            until=datetime(2025, 6, 2),
+            include_cancelled=True,
+            top=1,
+        )
+
+        # Then
+        assert report["revenue"]["orders"] == 2
+        assert report["revenue"]["total"] == 29.0
+        assert report["popularity"] == [
+            {
+                "type": "pizza",
+                "name": "Pepperoni",
+                "quantity": 6,
+                "revenue": 54.0,
+            }
+        ]
+
+    def test_loads_saved_columns(self, tmp_path: Path) -> None:
+        # Given
+        source = snapshot()
+        for table, columns, names in (
+            ("orders", source.orders, ORDER_COLUMNS),
+            ("items", source.items, ITEM_COLUMNS),
+        ):
+            for name in names:
+                np.save(
+                    os.path.join(tmp_path, f"{table}.{name}"), columns[name]
+                )
+        (tmp_path / "products.json").write_text(json.dumps(source.products))
+        (tmp_path / "meta.json").write_text(
+            json.dumps({"schema_version": SCHEMA_VERSION})
+        )
+
+        # When
+        loaded = Snapshot.load(str(tmp_path))
+
+        # Then
+        assert isinstance(loaded.orders["total_cents"], np.memmap)
+        assert build_report(loaded, period="month") == build_report(
+            source, period="month"
+        )
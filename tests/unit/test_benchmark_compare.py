@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from typer.testing import CliRunner
+
+from benchmarks.compare import app, compare, load_runs, render
+
+
+def result(name: str, samples: List[float], queries: float) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "name": name,
+        "latency_ms": {
+            "mean": sum(samples) / len(samples),
+            "p50": ordered[len(ordered) // 2 - 1],
+            "p95": ordered[int(len(ordered) * 0.95) - 1],
+        },
+        "queries_per_op": queries,
+        "allocated_bytes_per_op": 1000.0,
+        "samples_ms": samples,
+    }
+
+
+def write(path: Path, results: List[Dict[str, Any]]) -> str:
+    path.write_text(json.dumps({"meta": {}, "results": results}))
+    return str(path)
+
+
+class TestCompare:
+    def test_flags_regressions_past_the_threshold(
+        self, tmp_path: Path
+    ) -> None:
+        # Given
+        fast = [1.0 + i / 100 for i in range(100)]
+        slow = [2.0 + i / 100 for i in range(100)]
+        baseline = load_runs(
+            [
+                write(
+                    tmp_path / "base.json",
+                    [result("dao.get", fast, 1), result("dao.list", fast, 1)],
+                )
+            ]
+        )
+        current = load_runs(
+            [
+                write(
+                    tmp_path / "current.json",
+                    [result("dao.get", slow, 1), result("dao.list", fast, 3)],
+                )
+            ]
+        )
+
+        # When
+        comparisons = compare(baseline, current, ["p50", "queries"], 0.1)
+
+        # Then
+        regressed = {(c.name, c.metric) for c in comparisons if c.regressed}
+        assert regressed == {("dao.get", "p50"), ("dao.list", "queries")}
+        assert "2 regression(s) in 4 comparisons" in render(comparisons)
+
+    def test_ignores_noise_within_the_interval(self, tmp_path: Path) -> None:
+        # Given
+        runs = [
+            write(tmp_path / f"{i}.json", [result("dao.get", samples, 1)])
+            for i, samples in enumerate(
+                [[1.0, 1.0, 1.0, 5.0], [1.0, 5.0, 5.0, 5.0]]
+            )
+        ]
+
+        # When
+        comparisons = compare(
+            load_runs(runs[:1]), load_runs(runs[1:]), ["p50"], 0.1
+        )
+
+        # Then
+        assert comparisons[0].ratio > 1.1
+        assert not comparisons[0].regressed
+
+    def test_missing_benchmarks_fail_the_gate(self, tmp_path: Path) -> None:
+        # Given
+        samples = [1.0 + i / 100 for i in range(100)]
+        baseline = write(
+            tmp_path / "base.json",
+            [result("dao.get", samples, 1), result("dao.list", samples, 1)],
+        )
+        current = write(
+            tmp_path / "current.json", [result("dao.get", samples, 1)]
+        )
+        args = ["--baseline", baseline, "--current", current]
+
+        # When
+        strict = CliRunner().invoke(app, args)
+        allowed = CliRunner().invoke(app, args + ["--allow-missing"])
+
+        # Then
+        assert strict.exit_code == 1
+        assert "dao.list" in strict.output
+        assert allowed.exit_code == 0
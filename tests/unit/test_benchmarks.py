@@ -0,0 +1,107 @@
+import asyncio
+import random
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from benchmarks.cases import BenchmarkContext, asgi_client, http_check_status
+from benchmarks.config import BenchmarkConfig
+from benchmarks.harness import measure, percentile
+from benchmarks.seed import Dataset
+
+from layered_architecture.dao.concrete import SQLOrderDAO
+from layered_architecture.dto import OrderDTO
+from layered_architecture.enums import OrderStatus, ServiceType
+from layered_architecture.services.concrete.fake_auth import FakeAuthService
+
+
+class TestPercentile:
+    def test_nearest_rank(self) -> None:
+        # Given
+        samples = [float(value) for value in range(1, 101)]
+
+        # When / Then
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+
+class TestMeasure:
+    @pytest.mark.asyncio
+    async def test_runs_every_iteration_across_workers(self) -> None:
+        # Given
+        calls = 0
+
+        async def operation() -> None:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+
+        # When
+        result = await measure(
+            "noop", "dao", operation, iterations=30, warmup=5, concurrency=4
+        )
+
+        # Then
+        assert len(result.samples_ms) == 30
+        assert calls == 5 + 30 + 20
+        assert result.queries_per_op == 0
+        assert result.latency_ms["p50"] <= result.latency_ms["max"]
+
+
+class TestAsgiClient:
+    @pytest.mark.asyncio
+    async def test_check_status_reads_in_a_plain_session(self) -> None:
+        # Given
+        user = await FakeAuthService.get_current_user()
+        now = datetime.now(timezone.utc)
+        order = OrderDTO(
+            id=uuid.uuid4(),
+            service_type=ServiceType.DELIVERY,
+            customer_id=user.id,
+            status=OrderStatus.PENDING,
+            items=[],
+            total=Decimal("17.99"),
+            customer_email=user.email,
+            notes=None,
+            created_at=now,
+            updated_at=now,
+            delivery_address="123 Main St",
+        )
+        session = Mock(
+            info={},
+            in_transaction=Mock(return_value=False),
+            connection=AsyncMock(),
+            rollback=AsyncMock(),
+        )
+        sessions = MagicMock()
+        sessions.return_value.__aenter__.return_value = session
+        # Any rolled back session would fail on this engine
+        engine = Mock()
+
+        # When
+        with patch.object(
+            SQLOrderDAO, "get_by_id", AsyncMock(return_value=order)
+        ):
+            async with asgi_client(engine, sessions) as client:
+                ctx = BenchmarkContext(
+                    config=BenchmarkConfig(),
+                    engine=engine,
+                    sessions=sessions,
+                    dataset=Dataset(
+                        customer_id=user.id,
+                        orders={ServiceType.DELIVERY: [str(order.id)]},
+                    ),
+                    rng=random.Random(1),
+                    client=client,
+                )
+                await http_check_status(ctx)()
+
+        # Then
+        session.connection.assert_awaited_with(
+            execution_options={"postgresql_readonly": True}
+        )
+        engine.connect.assert_not_called()
@@ -0,0 +1,157 @@
+import json
+import random
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from benchmarks.replay import Replayer, read_capture
+from benchmarks.seed import Dataset
+
+from layered_architecture.api.middlewares import TrafficCaptureMiddleware
+from layered_architecture.enums import ServiceType
+from layered_architecture.observability import TrafficRecorder, body_shape
+
+ORDER = {
+    "service_type": "delivery",
+    "items": [
+        {"type": "pizza", "product_name": "Margherita", "quantity": 2},
+        {"type": "beer", "product_name": "Heineken", "quantity": 1},
+    ],
+    "notes": "Ring twice",
+    "delivery_address": "1 Secret Lane",
+}
+
+
+class TestBodyShape:
+    def test_strips_values_but_keeps_structure(self) -> None:
+        # When
+        shape = body_shape(ORDER)
+
+        # Then
+        assert shape == {
+            "service_type": "delivery",
+            "items": [
+                {"type": "pizza", "product_name": "str", "quantity": 2},
+                {"type": "beer", "product_name": "str", "quantity": 1},
+            ],
+            "notes": "str",
+            "delivery_address": "str",
+        }
+
+
+class TestTrafficCapture:
+    @pytest.mark.asyncio
+    async def test_records_sanitized_requests(self, tmp_path: Path) -> None:
+        # Given
+        path = tmp_path / "traffic.ndjson"
+        recorder = TrafficRecorder(str(path))
+        app = FastAPI()
+        app.add_middleware(TrafficCaptureMiddleware, recorder=recorder)
+        created = str(uuid.uuid4())
+
+        @app.post("/v1/orders/", status_code=201)
+        async def create_order(order: Dict[str, Any]) -> Dict[str, str]:
+            return {"id": created}
+
+        @app.get("/v1/orders/{order_id}/")
+        async def get_order(order_id: str) -> Dict[str, str]:
+            return {"id": order_id}
+
+        # When
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            await client.post("/v1/orders/", json=ORDER)
+            await client.get(f"/v1/orders/{created}/?fields=id")
+            await client.get("/unknown")
+        await recorder.flush()
+
+        # Then
+        text = path.read_text()
+        assert "Secret" not in text and "Margherita" not in text
+        post, get = read_capture(str(path))
+        assert post["r"] == "/v1/orders/" and post["s"] == 201
+        assert post["c"] == created
+        assert post["b"] == body_shape(ORDER)
+        assert get["r"] == "/v1/orders/{order_id}/"
+        assert get["o"] == created and get["q"] == ["fields"]
+
+
+class TestReplayer:
+    @pytest.mark.asyncio
+    async def test_maps_captured_orders_to_target_orders(self) -> None:
+        # Given
+        captured, existing = str(uuid.uuid4()), str(uuid.uuid4())
+        replayed = str(uuid.uuid4())
+        entries = [
+            {
+                "t": 0.0,
+                "m": "POST",
+                "r": "/v1/orders/",
+                "s": 201,
+                "b": body_shape(ORDER),
+                "c": captured,
+            },
+            {
+                "t": 0.01,
+                "m": "GET",
+                "r": "/v1/orders/{order_id}/",
+                "s": 200,
+                "o": existing,
+            },
+            {
+                "t": 0.05,
+                "m": "GET",
+                "r": "/v1/orders/{order_id}/",
+                "s": 200,
+                "o": captured,
+            },
+            {
+                "t": 0.06,
+                "m": "GET",
+                "r": "/v1/reports/sales/service-types/",
+                "s": 200,
+                "q": ["period", "since", "profile"],
+            },
+        ]
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.method == "POST":
+                return httpx.Response(201, json={"id": replayed})
+            return httpx.Response(200, json={})
+
+        dataset = Dataset(
+            customer_id=uuid.uuid4(),
+            pizzas=["Pizza 0000"],
+            beers=["Beer 0000"],
+            orders={ServiceType.DINE_IN: ["seeded"]},
+        )
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://test"
+        ) as client:
+            replayer = Replayer(client, dataset, random.Random(1))
+
+            # When
+            elapsed = await replayer.run(entries, speed=2)
+
+        # Then
+        body = json.loads(requests[0].content)
+        assert body["items"][0]["product_name"] == "Pizza 0000"
+        assert body["delivery_address"] == "221B Baker Street"
+        assert requests[1].url.path == "/v1/orders/seeded/"
+        assert requests[2].url.path == f"/v1/orders/{replayed}/"
+        assert dict(requests[3].url.params) == {
+            "period": "day",
+            "since": "2024-01-01T00:00:00",
+        }
+        assert elapsed >= 0.025
+        assert all(
+            summary["unexpected"] == 0
+            for summary in replayer.report(elapsed).values()
+        )
@@ -0,0 +1,56 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from layered_architecture.commands.generate_data import (
+    DELIVERY_FEE,
+    GenerationSpec,
+    generate_chunk,
+)
+
+END = datetime(2026, 1, 1, 20, tzinfo=timezone.utc)
+
+
+def spec(seed: int = 1) -> GenerationSpec:
+    return GenerationSpec(
+        seed=seed,
+        orders=2500,
+        chunk_size=1000,
+        customers=100,
+        days=30,
+        end=END,
+        pizzas=((uuid.UUID(int=1), Decimal("10.00")),),
+        beers=((uuid.UUID(int=2), Decimal("4.50")),),
+    )
+
+
+class TestGenerateChunk:
+    def test_is_deterministic_per_seed_and_chunk(self) -> None:
+        # When
+        first = generate_chunk(spec(), 0)
+
+        # Then
+        assert generate_chunk(spec(), 0) == first
+        assert generate_chunk(spec(), 1).orders != first.orders
+        assert generate_chunk(spec(seed=2), 0).orders != first.orders
+        assert len(generate_chunk(spec(), 2).orders) == 500
+
+    def test_generates_consistent_orders(self) -> None:
+        # When
+        chunk = generate_chunk(spec(), 0)
+
+        # Then
+        items = chunk.order_pizzas + chunk.order_beers
+        assert {item[1] for item in items} == {o[0] for o in chunk.orders}
+        for order in chunk.orders:
+            assert order[8] <= order[9] <= END
+            if order[1] == "DELIVERY":
+                assert order[5] == order[4] + DELIVERY_FEE
+                assert order[7] is not None
+        service_types = {order[1] for order in chunk.orders}
+        assert service_types == {
+            "DINE_IN",
+            "TAKEAWAY",
+            "DELIVERY",
+            "LATE_NIGHT",
+        }
@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from layered_architecture.config.settings import settings
+from layered_architecture.main import app, lifespan
+
+
+async def get_readiness() -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.get("/ht/ready/")
+
+
+async def wait_until_ready() -> None:
+    while not app.state.ready:
+        await asyncio.sleep(0)
+
+
+class TestLifespan:
+    @pytest.mark.asyncio
+    async def test_ready_only_after_warm_up(self) -> None:
+        # Given
+        release = asyncio.Event()
+        prefills = []
+
+        async def warm_up(engine: Any, connections: int) -> None:
+            prefills.append(connections)
+            await release.wait()
+
+        # When
+        with patch("layered_architecture.main.warm_up", warm_up):
+            async with lifespan(app):
+                not_ready = await get_readiness()
+                release.set()
+                await asyncio.wait_for(wait_until_ready(), 1)
+                ready = await get_readiness()
+
+        # Then
+        assert not_ready.status_code == 503
+        assert not_ready.json() == {"status": "STARTING"}
+        assert ready.status_code == 200
+        assert ready.json() == {"status": "READY"}
+        assert prefills == [settings.DATABASE_POOL_PREFILL]
+        assert app.state.ready is False
+
+    @pytest.mark.asyncio
+    async def test_ready_when_warm_up_fails(self) -> None:
+        # Given
+        warm_up = AsyncMock(side_effect=OSError("connection refused"))
+
+        # When
+        with patch("layered_architecture.main.warm_up", warm_up):
+            async with lifespan(app):
+                await asyncio.wait_for(wait_until_ready(), 1)
+                ready = await get_readiness()
+
+        # Then
+        assert ready.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_ready_when_warm_up_times_out(self) -> None:
+        # Given
+        never = asyncio.Event()
+
+        async def warm_up(engine: Any, connections: int) -> None:
+            await never.wait()
+
+        # When
+        with (
+            patch("layered_architecture.main.warm_up", warm_up),
+            patch.object(settings, "DATABASE_WARMUP_TIMEOUT", 0.01),
+        ):
+            async with lifespan(app):
+                await asyncio.wait_for(wait_until_ready(), 1)
+                ready = await get_readiness()
+
+        # Then
+        assert ready.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_background_tasks_finish_before_shutdown(self) -> None:
+        # Given
+        started = asyncio.Event()
+        tasks = []
+
+        async def warm_up(engine: Any, connections: int) -> None:
+            tasks.append(asyncio.current_task())
+            started.set()
+            await asyncio.Event().wait()
+
+        # When
+        with patch("layered_architecture.main.warm_up", warm_up):
+            async with lifespan(app):
+                await asyncio.wait_for(started.wait(), 1)
+
+        # Then
+        assert len(tasks) == 1
+        assert tasks[0] is not None and tasks[0].done()
@@ -0,0 +1,107 @@
+import random
+import uuid
+from typing import Any, List
+
+import httpx
+import pytest
+
+from benchmarks.load import (
+    LoadGenerator,
+    LoadState,
+    Scenario,
+    _create,
+    _poll,
+    _update,
+    arrival_times,
+)
+from benchmarks.seed import Dataset
+
+from layered_architecture.enums import ServiceType
+
+
+def state() -> LoadState:
+    return LoadState(
+        dataset=Dataset(
+            customer_id=uuid.uuid4(),
+            pizzas=["Pizza 0000"],
+            beers=["Beer 0000"],
+        ),
+        rng=random.Random(1),
+        orders=[(str(uuid.uuid4()), ServiceType.TAKEAWAY)],
+    )
+
+
+class TestArrivalTimes:
+    def test_ramps_up_then_holds_the_rate(self) -> None:
+        # When
+        times = arrival_times(
+            rate=200, duration=20, ramp_up=10, rng=random.Random(7)
+        )
+
+        # Then
+        ramp = sum(at < 10 for at in times)
+        steady = len(times) - ramp
+        assert times == sorted(times) and times[-1] < 20
+        assert 900 < ramp < 1100
+        assert 1850 < steady < 2150
+
+
+class TestUpdate:
+    def test_updates_created_orders_as_their_service_type(self) -> None:
+        # Given
+        load_state = state()
+        skipped = _update(load_state)
+        load_state.add_created("42", ServiceType.DELIVERY)
+
+        # When
+        request = _update(load_state)
+
+        # Then
+        assert skipped is None
+        assert request is not None and request.json is not None
+        assert request.path == "/v1/orders/42/"
+        assert request.json["service_type"] == "delivery"
+        assert request.json["delivery_address"]
+
+
+class TestLoadGenerator:
+    @pytest.mark.asyncio
+    async def test_measures_from_the_scheduled_start(self) -> None:
+        # Given
+        created: List[Any] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                created.append(request)
+                return httpx.Response(
+                    201,
+                    json={"id": str(uuid.uuid4()), "service_type": "dine_in"},
+                )
+            return httpx.Response(200, json={})
+
+        scenarios = [
+            Scenario("burst", 1, _create(ServiceType.DINE_IN), burst=3),
+            Scenario("poll", 1, _poll),
+        ]
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://test"
+        ) as client:
+            generator = LoadGenerator(client, state(), scenarios)
+
+            # When
+            elapsed = await generator.run(rate=200, duration=0.2)
+
+        # Then
+        report = generator.report(elapsed)
+        bursts = report["burst"]["requests"]
+        assert bursts == len(created) and bursts % 3 == 0
+        assert len(generator.state.orders) == 1 + bursts
+        assert report["poll"]["statuses"] == {
+            "200": report["poll"]["requests"]
+        }
+        assert report["burst"]["unexpected"] == 0
+        stats = generator.stats["poll"]
+        assert all(
+            latency >= service
+            for latency, service in zip(stats.latencies, stats.service_times)
+        )
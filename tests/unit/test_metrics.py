@@ -0,0 +1,108 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from layered_architecture.api.handlers import configure_exception_handlers
+from layered_architecture.api.middlewares import MetricsMiddleware
+from layered_architecture.exceptions import NotFoundError
+from layered_architecture.observability import HTTPMetrics
+
+
+@pytest.fixture
+def metrics() -> HTTPMetrics:
+    return HTTPMetrics(buckets=(0.1, 1.0))
+
+
+@pytest.fixture
+def app(metrics: HTTPMetrics) -> FastAPI:
+    app = FastAPI()
+    configure_exception_handlers(app)
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/orders/{order_id}")
+    async def get_order(order_id: str) -> dict[str, str]:
+        if order_id == "missing":
+            raise NotFoundError("order", order_id)
+        if order_id == "broken":
+            raise RuntimeError("boom")
+        return {"id": order_id}
+
+    return app
+
+
+async def get(app: FastAPI, path: str) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://test",
+    ) as client:
+        return await client.get(path)
+
+
+class TestHTTPMetrics:
+    def test_render_cumulative_histogram(self, metrics: HTTPMetrics) -> None:
+        # Given
+        metrics.observe("GET", "/orders/{order_id}", 200, 0.05)
+        metrics.observe("GET", "/orders/{order_id}", 200, 0.5)
+        metrics.observe("GET", "/orders/{order_id}", 200, 5.0)
+
+        # When
+        text = metrics.render()
+
+        # Then
+        labels = 'method="GET",route="/orders/{order_id}"'
+        assert (
+            f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1'
+            in text
+        )
+        assert (
+            f'http_request_duration_seconds_bucket{{{labels},le="1.0"}} 2'
+            in text
+        )
+        assert (
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3'
+            in text
+        )
+        assert f"http_request_duration_seconds_count{{{labels}}} 3" in text
+        assert "http_requests_in_flight 0" in text
+
+
+class TestMetricsMiddleware:
+    @pytest.mark.asyncio
+    async def test_records_by_route_template(
+        self, app: FastAPI, metrics: HTTPMetrics
+    ) -> None:
+        # When
+        await get(app, "/orders/1")
+        await get(app, "/orders/2")
+
+        # Then
+        labels = (
+            ("method", "GET"),
+            ("route", "/orders/{order_id}"),
+            ("status", "200"),
+        )
+        assert metrics.requests[labels] == 2
+        assert not metrics.errors
+
+    @pytest.mark.asyncio
+    async def test_errors_by_handler_category(
+        self, app: FastAPI, metrics: HTTPMetrics
+    ) -> None:
+        # When
+        missing = await get(app, "/orders/missing")
+        broken = await get(app, "/orders/broken")
+        await get(app, "/unknown")
+
+        # Then
+        route = (("method", "GET"), ("route", "/orders/{order_id}"))
+        assert missing.status_code == 404
+        assert broken.status_code == 500
+        assert metrics.errors[route + (("category", "not_found"),)] == 1
+        assert metrics.errors[route + (("category", "server_error"),)] == 1
+        unmatched = (
+            ("method", "GET"),
+            ("route", "unmatched"),
+            ("category", "client_error"),
+        )
+        assert metrics.errors[unmatched] == 1
+        assert metrics.in_flight == 0
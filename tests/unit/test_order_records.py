@@ -0,0 +1,204 @@
+import io
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from layered_architecture.commands.export_orders import orders_query
+from layered_architecture.commands.import_orders import (
+    ProductResolver,
+    Rows,
+    to_rows,
+)
+from layered_architecture.commands.order_records import (
+    InvalidRecord,
+    RecordWriter,
+    read_records,
+)
+from layered_architecture.enums import OrderStatus, ServiceType
+
+MARGHERITA = uuid.uuid4()
+RECORD = {
+    "id": uuid.uuid4(),
+    "service_type": "delivery",
+    "customer_id": uuid.uuid4(),
+    "status": "delivered",
+    "subtotal": Decimal("20.00"),
+    "total": Decimal("25.00"),
+    "notes": None,
+    "delivery_address": "1 Main St",
+    "created_at": datetime(2025, 6, 1, 19, 30, tzinfo=timezone.utc),
+    "updated_at": datetime(2025, 6, 1, 20, 30, tzinfo=timezone.utc),
+    "items": [
+        {
+            "type": "pizza",
+            "product_name": "Margherita",
+            "quantity": 2,
+            "price": Decimal("10.00"),
+        }
+    ],
+}
+
+
+def resolver() -> ProductResolver:
+    resolver = ProductResolver(engine=None)
+    resolver.products["pizza"] = {
+        "Margherita": (MARGHERITA, Decimal("9.00")),
+        "Hawaii": None,
+    }
+    return resolver
+
+
+class TestOrderRecords:
+    @pytest.mark.parametrize("format", ["ndjson", "csv"])
+    def test_round_trips_into_copy_rows(self, format: str) -> None:
+        # Given
+        file = io.StringIO()
+        RecordWriter(file, format).write(RECORD)
+        file.seek(0)
+
+        # When
+        (record,) = read_records(file, format)
+        rows = Rows()
+        to_rows(record, resolver(), rows)
+
+        # Then
+        (order,) = rows.orders
+        assert order[:6] == (
+            RECORD["id"],
+            "DELIVERY",
+            RECORD["customer_id"],
+            "DELIVERED",
+            Decimal("20.00"),
+            Decimal("25.00"),
+        )
+        assert order[6] is None
+        assert order[8:] == (RECORD["created_at"], RECORD["updated_at"])
+        assert [row[2:] for row in rows.order_pizzas] == [
+            (RECORD["created_at"], MARGHERITA, 2, Decimal("10.00"))
+        ]
+        assert rows.order_beers == []
+
+    def test_values_items_without_price_at_the_menu(self) -> None:
+        # Given
+        record = {
+            **RECORD,
+            "created_at": None,
+            "updated_at": None,
+            "items": [
+                {"type": "pizza", "product_name": "Margherita", "quantity": 1}
+            ],
+        }
+        rows = Rows()
+
+        # When
+        to_rows(record, resolver(), rows)
+
+        # Then
+        assert [row[-1] for row in rows.order_pizzas] == [Decimal("9.00")]
+
+    def test_rejects_unknown_products(self) -> None:
+        # Given
+        record = {
+            **RECORD,
+            "created_at": None,
+            "updated_at": None,
+            "items": [
+                {"type": "pizza", "product_name": "Hawaii", "quantity": 1}
+            ],
+        }
+        rows = Rows()
+
+        # When / Then
+        with pytest.raises(ValueError, match="Unknown pizza: Hawaii"):
+            to_rows(record, resolver(), rows)
+        assert rows.orders == []
+
+    def test_rejects_values_out_of_column_bounds(self) -> None:
+        # Given
+        too_many = {
+            **RECORD,
+            "created_at": None,
+            "updated_at": None,
+            "items": [
+                {
+                    "type": "pizza",
+                    "product_name": "Margherita",
+                    "quantity": 40000,
+                }
+            ],
+        }
+        too_long = {
+            **RECORD,
+            "created_at": None,
+            "updated_at": None,
+            "notes": "x" * 501,
+        }
+        too_expensive = {
+            **RECORD,
+            "created_at": None,
+            "updated_at": None,
+            "total": Decimal("100000000.00"),
+        }
+
+        # When / Then
+        with pytest.raises(ValueError, match="Invalid quantity"):
+            to_rows(too_many, resolver(), Rows())
+        with pytest.raises(ValueError, match="notes longer than 500"):
+            to_rows(too_long, resolver(), Rows())
+        with pytest.raises(ValueError, match="total out of bounds"):
+            to_rows(too_expensive, resolver(), Rows())
+
+    def test_reads_undecodable_lines_as_invalid_records(self) -> None:
+        # Given
+        file = io.StringIO('{"id": 1}\n{"id": \n\n[1, 2]\n')
+
+        # When
+        records = list(read_records(file, "ndjson"))
+
+        # Then
+        assert records[0] == {"id": 1}
+        assert isinstance(records[1], InvalidRecord)
+        assert records[1].line == 2
+        assert records[2] == [1, 2]
+
+    @pytest.mark.parametrize(
+        "record, message",
+        [
+            (InvalidRecord(2, "Invalid JSON"), "Line 2: Invalid JSON"),
+            ([1, 2], "Invalid order"),
+            ({**RECORD, "items": "Margherita"}, "Invalid items"),
+            ({**RECORD, "items": ["Margherita"]}, "Invalid item"),
+            ({**RECORD, "items": [{"type": "pizza"}]}, "Invalid item"),
+        ],
+    )
+    def test_rejects_malformed_records(
+        self, record: object, message: str
+    ) -> None:
+        # Given
+        if isinstance(record, dict):
+            record = {**record, "created_at": None, "updated_at": None}
+
+        # When / Then
+        with pytest.raises(ValueError, match=message):
+            to_rows(record, resolver(), Rows())
+
+
+class TestOrdersQuery:
+    def test_filters_by_date_status_and_service_type(self) -> None:
+        # When
+        query = orders_query(
+            since=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            statuses=[OrderStatus.DELIVERED],
+            service_types=[ServiceType.DELIVERY, ServiceType.TAKEAWAY],
+        )
+
+        # Then
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert '"order".created_at >=' in sql
+        assert '"order".status IN' in sql
+        assert '"order".service_type IN' in sql
+        assert "archived_order.created_at >=" in sql
+        assert "ORDER BY" in sql
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+from layered_architecture.db.partitions import (
+    add_months,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+class TestPartitionNames:
+    def test_month_of_a_local_time_is_its_utc_month(self) -> None:
+        # Given
+        moment = datetime(
+            2025, 7, 1, 1, 30, tzinfo=timezone(timedelta(hours=2))
+        )
+
+        # When
+        month = month_start(moment)
+
+        # Then
+        assert month == datetime(2025, 6, 1, tzinfo=timezone.utc)
+        assert partition_name("order", moment) == "order_y2025m06"
+
+    def test_adds_months_across_years(self) -> None:
+        # Given
+        month = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+        # When
+        later, earlier = add_months(month, 3), add_months(month, -11)
+
+        # Then
+        assert later == datetime(2026, 2, 1, tzinfo=timezone.utc)
+        assert earlier == datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+    def test_parses_partition_names(self) -> None:
+        # Given
+        month = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+        # When
+        parsed = partition_month(partition_name("order_pizza", month))
+
+        # Then
+        assert parsed == ("order_pizza", month)
+        assert partition_month("order_pizza_default") is None
@@ -0,0 +1,92 @@
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.util import greenlet_spawn
+
+from layered_architecture.config.settings import (
+    get_max_overflow,
+    get_pool_size,
+)
+from layered_architecture.observability import (
+    InstrumentedAsyncAdaptedQueuePool,
+    monitor_engine,
+    pool_stats,
+)
+from layered_architecture.observability.pool import _monitored
+
+
+class TestPoolSizing:
+    @pytest.mark.parametrize(
+        "max_connections,workers,pool_size,max_overflow",
+        [
+            (100, 1, 50, 50),
+            (100, 8, 6, 6),
+            (10, 8, 1, 1),
+        ],
+    )
+    def test_sizing_stays_within_budget(
+        self,
+        max_connections: int,
+        workers: int,
+        pool_size: int,
+        max_overflow: int,
+    ) -> None:
+        # When
+        size = get_pool_size(max_connections, workers)
+        overflow = get_max_overflow(max_connections, workers)
+
+        # Then
+        assert (size, overflow) == (pool_size, max_overflow)
+
+
+class TestInstrumentedPool:
+    @pytest.mark.asyncio
+    async def test_records_checkouts_and_timeouts(self) -> None:
+        # Given
+        pool = InstrumentedAsyncAdaptedQueuePool(
+            Mock, pool_size=1, max_overflow=0, timeout=0.01
+        )
+
+        def exercise() -> Any:
+            first = pool.connect()
+            with pytest.raises(exc.TimeoutError):
+                pool.connect()
+            first.close()
+            pool.connect().close()
+
+        # When
+        await greenlet_spawn(exercise)
+
+        # Then
+        assert pool.stats.checkouts == 2
+        assert pool.stats.checkins == 2
+        assert pool.stats.connects == 1
+        assert pool.stats.timeouts == 1
+        assert pool.stats.peak_checked_out == 1
+        assert pool.stats.wait_seconds_max >= 0.01
+
+    def test_reports_configured_max_overflow(self) -> None:
+        # Given
+        engine = create_async_engine(
+            "postgresql+asyncpg://primary/db",
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=2,
+            max_overflow=3,
+        )
+        monitor_engine("test:primary", engine, 3)
+
+        # When
+        try:
+            (stats,) = [
+                stats
+                for stats in pool_stats()
+                if stats["name"] == "test:primary"
+            ]
+        finally:
+            del _monitored["test:primary"]
+
+        # Then
+        assert (stats["size"], stats["max_overflow"]) == (2, 3)
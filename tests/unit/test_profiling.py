@@ -0,0 +1,87 @@
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from layered_architecture.api.middlewares import ProfilingMiddleware
+from layered_architecture.commands.aggregate_profiles import (
+    aggregate,
+    find_profiles,
+)
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def app(tmp_path: Path) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        ProfilingMiddleware, directory=str(tmp_path), token=TOKEN
+    )
+
+    @app.post("/v1/orders/")
+    async def create_order() -> dict[str, int]:
+        return {"total": sum(range(1000))}
+
+    return app
+
+
+async def post(
+    app: FastAPI,
+    headers: Optional[dict[str, str]] = None,
+    params: Optional[dict[str, str]] = None,
+) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.post("/v1/orders/", headers=headers, params=params)
+
+
+class TestProfilingMiddleware:
+    @pytest.mark.asyncio
+    async def test_profiles_requests_with_token(
+        self, app: FastAPI, tmp_path: Path
+    ) -> None:
+        # When
+        by_header = await post(app, headers={"x-profile": TOKEN})
+        by_query = await post(app, params={"profile": TOKEN})
+
+        # Then
+        paths = find_profiles(str(tmp_path), "*-POST-v1_orders.prof")
+        assert len(paths) == 2
+        assert by_header.headers["x-profile-id"] in paths[0] + paths[1]
+        assert by_query.headers["x-profile-id"] in paths[0] + paths[1]
+
+    @pytest.mark.asyncio
+    async def test_ignores_requests_without_token(
+        self, app: FastAPI, tmp_path: Path
+    ) -> None:
+        # When
+        response = await post(app, headers={"x-profile": "guess"})
+        non_ascii = await post(app, params={"profile": "é"})
+
+        # Then
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert non_ascii.status_code == 200
+        assert find_profiles(str(tmp_path), "*.prof") == []
+
+    @pytest.mark.asyncio
+    async def test_aggregate_profiles(
+        self, app: FastAPI, tmp_path: Path
+    ) -> None:
+        # Given
+        for _ in range(2):
+            await post(app, headers={"x-profile": TOKEN})
+        merged = tmp_path / "merged.out"
+
+        # When
+        report = aggregate(
+            find_profiles(str(tmp_path), "*.prof"), output=str(merged)
+        )
+
+        # Then
+        assert "create_order" in report
+        assert merged.exists()
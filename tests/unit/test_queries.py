@@ -0,0 +1,117 @@
+import logging
+
+import httpx
+import pytest
+from starlette.types import Receive, Scope, Send
+
+from layered_architecture.api.middlewares import QueryStatsMiddleware
+from layered_architecture.exceptions import QueryBudgetExceededError
+from layered_architecture.observability import (
+    current_query_stats,
+    track_queries,
+)
+
+STATEMENT = "SELECT orders.id FROM orders WHERE orders.id = $1::UUID"
+
+
+async def run_queries(scope: Scope, receive: Receive, send: Send) -> None:
+    stats = current_query_stats()
+    assert stats is not None
+    for _ in range(6):
+        stats.check_budget()
+        stats.record(STATEMENT, 0.001)
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def request(app: QueryStatsMiddleware) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.get("/v1/orders/")
+
+
+class TestTrackQueries:
+    def test_nested_scopes_count_for_parents(self) -> None:
+        # Given
+        with track_queries("request") as outer:
+            with track_queries("unit of work") as inner:
+                # When
+                inner.record(STATEMENT, 0.002)
+            outer.record("SELECT 1", 0.001)
+
+        # Then
+        assert inner.count == 1
+        assert outer.count == 2
+        assert outer.duration == pytest.approx(0.003)
+        assert current_query_stats() is None
+
+    def test_budget_enforced_before_next_query(self) -> None:
+        # Given
+        with track_queries("get_all", budget=2) as stats:
+            for _ in range(2):
+                stats.check_budget()
+                stats.record(STATEMENT, 0.001)
+
+            # When / Then
+            with pytest.raises(QueryBudgetExceededError):
+                stats.check_budget()
+
+    def test_repeated_statements(self) -> None:
+        # Given
+        with track_queries("request") as stats:
+            for _ in range(3):
+                stats.record(STATEMENT, 0.001)
+            stats.record("SELECT 1", 0.001)
+
+        # When
+        repeated = stats.repeated(3)
+
+        # Then
+        assert repeated == [(STATEMENT, 3)]
+
+
+class TestQueryStatsMiddleware:
+    @pytest.mark.asyncio
+    async def test_server_timing_header(self) -> None:
+        # Given
+        app = QueryStatsMiddleware(run_queries)
+
+        # When
+        response = await request(app)
+
+        # Then
+        assert response.headers["server-timing"] == (
+            'db;dur=6.00;desc="6 queries"'
+        )
+
+    @pytest.mark.asyncio
+    async def test_logs_budget_and_n_plus_one(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # Given
+        app = QueryStatsMiddleware(run_queries, budget=4, repeat_threshold=5)
+
+        # When
+        with caplog.at_level(logging.WARNING):
+            response = await request(app)
+
+        # Then
+        assert response.status_code == 200
+        assert "over its budget of 4" in caplog.text
+        assert "Possible N+1 in GET /v1/orders/" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_enforced_budget_fails_request(self) -> None:
+        # Given
+        app = QueryStatsMiddleware(run_queries, budget=4, enforce=True)
+
+        # When / Then
+        with pytest.raises(QueryBudgetExceededError):
+            await request(app)
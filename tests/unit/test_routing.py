@@ -0,0 +1,139 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from layered_architecture.db.routing import (
+    READ_ONLY_KEY,
+    ReplicaSelector,
+    use_primary,
+)
+from layered_architecture.db.session import (
+    RoutingSession,
+    _clear_bind,
+    _keep_bind,
+    engines,
+)
+
+
+@pytest.fixture
+def replicas() -> list[AsyncEngine]:
+    return [
+        create_async_engine(f"postgresql+asyncpg://replica{i}/db")
+        for i in range(3)
+    ]
+
+
+class TestReplicaSelector:
+    def test_round_robin(self, replicas: list[AsyncEngine]) -> None:
+        # Given
+        selector = ReplicaSelector(replicas, cooldown=30)
+
+        # When
+        chosen = [selector.choose() for _ in range(4)]
+
+        # Then
+        assert chosen == [replicas[0], replicas[1], replicas[2], replicas[0]]
+
+    def test_skips_replica_marked_down(
+        self, replicas: list[AsyncEngine]
+    ) -> None:
+        # Given
+        selector = ReplicaSelector(replicas, cooldown=30)
+        selector.mark_down(replicas[1])
+
+        # When
+        chosen = [selector.choose() for _ in range(3)]
+
+        # Then
+        assert replicas[1] not in chosen
+
+    def test_replica_returns_after_cooldown(
+        self, replicas: list[AsyncEngine]
+    ) -> None:
+        # Given
+        selector = ReplicaSelector(replicas[:1], cooldown=0)
+        selector.mark_down(replicas[0])
+
+        # When
+        chosen = selector.choose()
+
+        # Then
+        assert chosen is replicas[0]
+
+    def test_none_when_all_down(self, replicas: list[AsyncEngine]) -> None:
+        # Given
+        selector = ReplicaSelector(replicas, cooldown=30)
+        for replica in replicas:
+            selector.mark_down(replica)
+
+        # When / Then
+        assert selector.choose() is None
+
+
+class TestRoutingSession:
+    def test_writes_go_to_primary(self, replicas: list[AsyncEngine]) -> None:
+        # Given
+        selector = ReplicaSelector(replicas, cooldown=30)
+        session = RoutingSession()
+
+        # When
+        with patch.object(engines, "replicas", return_value=selector):
+            bind = session.get_bind()
+
+        # Then
+        assert bind is engines.primary().sync_engine
+
+    def test_read_only_goes_to_replica(
+        self, replicas: list[AsyncEngine]
+    ) -> None:
+        # Given
+        selector = ReplicaSelector(replicas, cooldown=30)
+        session = RoutingSession()
+        session.info[READ_ONLY_KEY] = True
+
+        # When
+        with patch.object(engines, "replicas", return_value=selector):
+            bind = session.get_bind()
+
+        # Then
+        assert bind is replicas[0].sync_engine
+
+    def test_read_your_writes_goes_to_primary(
+        self, replicas: list[AsyncEngine]
+    ) -> None:
+        # Given
+        selector = ReplicaSelector(replicas, cooldown=30)
+        session = RoutingSession()
+        session.info[READ_ONLY_KEY] = True
+
+        # When
+        with patch.object(engines, "replicas", return_value=selector):
+            with use_primary():
+                bind = session.get_bind()
+
+        # Then
+        assert bind is engines.primary().sync_engine
+
+    def test_transaction_keeps_its_replica(
+        self, replicas: list[AsyncEngine]
+    ) -> None:
+        # Given
+        selector = ReplicaSelector(replicas, cooldown=30)
+        session = RoutingSession()
+        session.info[READ_ONLY_KEY] = True
+        # Mock takes parent as its own argument
+        transaction = Mock()
+        transaction.parent = None
+
+        # When
+        with patch.object(engines, "replicas", return_value=selector):
+            first = session.get_bind()
+            _keep_bind(session, transaction, Mock(engine=first))
+            binds = [session.get_bind() for _ in range(3)]
+            _clear_bind(session, transaction)
+            after = session.get_bind()
+
+        # Then
+        assert binds == [replicas[0].sync_engine] * 3
+        assert after is replicas[1].sync_engine
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from layered_architecture.dao.concrete.sales_rollup import (
+    SalesContribution,
+    sales_deltas,
+)
+from layered_architecture.dto import OrderItemDTO
+from layered_architecture.enums import OrderStatus, ReportPeriod, ServiceType
+from layered_architecture.services.concrete.report import report_range
+
+MARGHERITA = uuid4()
+HEINEKEN = uuid4()
+CREATED_AT = datetime(2025, 6, 1, 23, 30, tzinfo=timezone(timedelta(hours=2)))
+
+
+def contribution(
+    status: OrderStatus, *items: OrderItemDTO
+) -> SalesContribution | None:
+    return SalesContribution.of(
+        ServiceType.DINE_IN,
+        status,
+        CREATED_AT,
+        sum((item.price * item.quantity for item in items), Decimal("0")),
+        items,
+    )
+
+
+def pizza(quantity: int) -> OrderItemDTO:
+    return OrderItemDTO(
+        type="pizza",
+        product_id=MARGHERITA,
+        quantity=quantity,
+        price=Decimal("12.99"),
+    )
+
+
+def beer(quantity: int) -> OrderItemDTO:
+    return OrderItemDTO(
+        type="beer",
+        product_id=HEINEKEN,
+        quantity=quantity,
+        price=Decimal("5.99"),
+    )
+
+
+class TestSalesRollup:
+    def test_create_adds_the_order_to_utc_buckets(self) -> None:
+        # When
+        deltas = sales_deltas(
+            None, contribution(OrderStatus.PENDING, pizza(1), pizza(1))
+        )
+
+        # Then
+        (service,), (product,) = deltas[ReportPeriod.HOUR]
+        assert service == {
+            "bucket": datetime(2025, 6, 1, 21, tzinfo=timezone.utc),
+            "service_type": ServiceType.DINE_IN,
+            "orders": 1,
+            "quantity": 2,
+            "revenue": Decimal("25.98"),
+        }
+        assert product["product_id"] == MARGHERITA
+        assert (product["orders"], product["quantity"]) == (1, 2)
+        (service,), _ = deltas[ReportPeriod.DAY]
+        assert service["bucket"] == datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+    def test_update_applies_only_the_difference(self) -> None:
+        # When
+        services, products = sales_deltas(
+            contribution(OrderStatus.PENDING, pizza(1)),
+            contribution(OrderStatus.CONFIRMED, pizza(1), beer(2)),
+        )[ReportPeriod.DAY]
+
+        # Then
+        assert [(row["orders"], row["quantity"]) for row in services] == [
+            (0, 2)
+        ]
+        assert [row["product_id"] for row in products] == [HEINEKEN]
+        assert products[0]["revenue"] == Decimal("11.98")
+
+    def test_cancel_removes_the_order(self) -> None:
+        # When
+        services, products = sales_deltas(
+            contribution(OrderStatus.PENDING, pizza(3)),
+            contribution(OrderStatus.CANCELLED, pizza(3)),
+        )[ReportPeriod.HOUR]
+
+        # Then
+        assert services[0]["orders"] == -1
+        assert services[0]["revenue"] == Decimal("-38.97")
+        assert products[0]["quantity"] == -3
+
+    def test_report_range_is_bounded(self) -> None:
+        # Given
+        until = datetime(2025, 6, 2)
+
+        # When
+        since, end = report_range(ReportPeriod.HOUR, until=until)
+
+        # Then
+        assert end == until.replace(tzinfo=timezone.utc)
+        assert end - since == timedelta(days=1)
+        with pytest.raises(ValueError):
+            report_range(ReportPeriod.DAY, since=until, until=until)
+        with pytest.raises(ValueError):
+            report_range(
+                ReportPeriod.HOUR,
+                since=until - timedelta(days=60),
+                until=until,
+            )
@@ -0,0 +1,176 @@
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import Mock
+
+import pytest
+
+from layered_architecture.dao.concrete.coalesce import (
+    WRITES_PENDING_KEY,
+    coalesced,
+)
+from layered_architecture.singleflight import SingleFlight
+
+
+class FakeDAO:
+    def __init__(self, info: Dict[str, Any]) -> None:
+        self.session = Mock(info=info)
+        self.calls: List[str] = []
+        self.release = asyncio.Event()
+
+    @coalesced
+    async def get_by_name(self, name: str) -> str:
+        self.calls.append(name)
+        await self.release.wait()
+        return name.upper()
+
+    @coalesced
+    async def get_toppings(self, name: str) -> List[str]:
+        self.calls.append(name)
+        await self.release.wait()
+        return ["tomato", "mozzarella"]
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_call(self) -> None:
+        # Given
+        group = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def load() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        # When
+        tasks = [asyncio.create_task(group.do("key", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        # Then
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert not group.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_settled_calls_are_not_reused(self) -> None:
+        # Given
+        group = SingleFlight()
+        calls = 0
+
+        async def load() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        # When
+        first = await group.do("key", load)
+        second = await group.do("key", load)
+
+        # Then
+        assert (first, second) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared_with_followers(self) -> None:
+        # Given
+        group = SingleFlight()
+        release = asyncio.Event()
+
+        async def load() -> None:
+            await release.wait()
+            raise ValueError("boom")
+
+        # When
+        tasks = [asyncio.create_task(group.do("key", load)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Then
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_follower_retries_when_leader_cancelled(self) -> None:
+        # Given
+        group = SingleFlight()
+        calls = 0
+
+        async def load() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        leader = asyncio.create_task(group.do("key", load))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(group.do("key", load))
+        await asyncio.sleep(0)
+
+        # When
+        leader.cancel()
+        result = await follower
+
+        # Then
+        assert result == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+
+class TestCoalesced:
+    @pytest.mark.asyncio
+    async def test_coalesces_across_dao_instances(self) -> None:
+        # Given
+        first, second = FakeDAO({}), FakeDAO({})
+
+        # When
+        tasks = [
+            asyncio.create_task(first.get_by_name("margherita")),
+            asyncio.create_task(second.get_by_name("margherita")),
+        ]
+        await asyncio.sleep(0)
+        first.release.set()
+        results = await asyncio.gather(*tasks)
+
+        # Then
+        assert results == ["MARGHERITA", "MARGHERITA"]
+        assert first.calls == ["margherita"]
+        assert second.calls == []
+
+    @pytest.mark.asyncio
+    async def test_followers_get_their_own_copy(self) -> None:
+        # Given
+        first, second = FakeDAO({}), FakeDAO({})
+
+        # When
+        tasks = [
+            asyncio.create_task(first.get_toppings("margherita")),
+            asyncio.create_task(second.get_toppings("margherita")),
+        ]
+        await asyncio.sleep(0)
+        first.release.set()
+        leader, follower = await asyncio.gather(*tasks)
+        leader.append("basil")
+
+        # Then
+        assert follower == ["tomato", "mozzarella"]
+        assert second.calls == []
+
+    @pytest.mark.asyncio
+    async def test_session_with_pending_writes_runs_own_query(self) -> None:
+        # Given
+        reader, writer = FakeDAO({}), FakeDAO({WRITES_PENDING_KEY: True})
+        reader.release.set()
+        writer.release.set()
+
+        # When
+        await asyncio.gather(
+            reader.get_by_name("margherita"),
+            writer.get_by_name("margherita"),
+        )
+
+        # Then
+        assert reader.calls == ["margherita"]
+        assert writer.calls == ["margherita"]
@@ -0,0 +1,132 @@
+import logging
+import uuid
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.util import greenlet_spawn
+
+from layered_architecture.dao.concrete import SQLPizzaDAO
+from layered_architecture.observability import (
+    SlowQueryLog,
+    find_origin,
+    is_plain_select,
+    parameter_shape,
+)
+
+STATEMENT = "SELECT pizzas.id FROM pizzas WHERE pizzas.name = $1::VARCHAR"
+
+
+class TestParameterShape:
+    @pytest.mark.parametrize(
+        "parameters,executemany,shape",
+        [
+            (("Margherita", 2), False, "(str, int)"),
+            ({"name": "Margherita"}, False, "{name: str}"),
+            ([("a",), ("b",)], True, "2 x (str)"),
+        ],
+    )
+    def test_shape_hides_values(
+        self, parameters: Any, executemany: bool, shape: str
+    ) -> None:
+        # When / Then
+        assert parameter_shape(parameters, executemany) == shape
+
+
+class TestIsPlainSelect:
+    @pytest.mark.parametrize(
+        "statement,plain",
+        [
+            (STATEMENT, True),
+            (f"{STATEMENT} FOR UPDATE", False),
+            (f"{STATEMENT} FOR NO KEY UPDATE SKIP LOCKED", False),
+            (f"{STATEMENT} for share", False),
+            ("UPDATE pizzas SET name = $1", False),
+        ],
+    )
+    def test_only_selects_without_row_locks(
+        self, statement: str, plain: bool
+    ) -> None:
+        # When / Then
+        assert is_plain_select(statement) is plain
+
+
+class TestFindOrigin:
+    @pytest.mark.asyncio
+    async def test_finds_dao_method_across_greenlets(self) -> None:
+        # Given
+        origins = []
+
+        async def execute(*args: Any, **kwargs: Any) -> Mock:
+            origins.append(await greenlet_spawn(find_origin))
+            return Mock(scalar_one_or_none=Mock(return_value=None))
+
+        session = Mock(info={}, execute=AsyncMock(side_effect=execute))
+
+        # When
+        await SQLPizzaDAO(session).get_by_id(str(uuid.uuid4()))
+
+        # Then
+        assert origins == [
+            "layered_architecture.dao.concrete.sqla_pizza:"
+            "SQLPizzaDAO.get_by_id"
+        ]
+
+
+class TestSlowQueryLog:
+    def fire(self, log: SlowQueryLog) -> None:
+        conn = Mock(info={})
+        args = (conn, None, STATEMENT, ("Margherita",), None, False)
+        log._before(*args)
+        log._after(*args)
+
+    def test_logs_statements_over_threshold(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # Given
+        engine = create_async_engine("postgresql+asyncpg://primary/db")
+        log = SlowQueryLog(engine, threshold=0.0)
+
+        # When
+        with caplog.at_level(logging.WARNING):
+            self.fire(log)
+
+        # Then
+        assert "Slow query" in caplog.text
+        assert f"{STATEMENT} params=(str)" in caplog.text
+        assert "Margherita" not in caplog.text
+
+    def test_ignores_fast_statements(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # Given
+        engine = create_async_engine("postgresql+asyncpg://primary/db")
+        log = SlowQueryLog(engine, threshold=60.0)
+
+        # When
+        with caplog.at_level(logging.WARNING):
+            self.fire(log)
+
+        # Then
+        assert caplog.text == ""
+
+    @pytest.mark.asyncio
+    async def test_explains_each_select_once(self) -> None:
+        # Given
+        engine = create_async_engine("postgresql+asyncpg://primary/db")
+        log = SlowQueryLog(engine, threshold=0.0, explain=True)
+        log._log_plan = AsyncMock()
+
+        # When
+        self.fire(log)
+        self.fire(log)
+        log._schedule_explain("UPDATE pizzas SET name = $1", (), "unknown")
+        log._schedule_explain(f"{STATEMENT} FOR UPDATE", (), "unknown")
+        for task in list(log._tasks):
+            await task
+
+        # Then
+        log._log_plan.assert_awaited_once_with(
+            STATEMENT, ("Margherita",), "unknown"
+        )
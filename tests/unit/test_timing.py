@@ -0,0 +1,72 @@
+from typing import List, Optional
+
+import pytest
+
+from layered_architecture.observability.timing import (
+    Instrumented,
+    MethodTimings,
+)
+
+
+class FakeDAO:
+    async def get_all(self) -> List[str]:
+        return ["margherita", "pepperoni"]
+
+    async def get_by_id(self, pizza_id: str) -> Optional[str]:
+        raise RuntimeError("connection lost")
+
+
+class FakeService:
+    def __init__(self, dao: FakeDAO) -> None:
+        self.dao = dao
+
+    async def list_pizzas(self) -> List[str]:
+        return await self.dao.get_all()
+
+
+@pytest.fixture
+def timings() -> MethodTimings:
+    return MethodTimings()
+
+
+class TestInstrumented:
+    @pytest.mark.asyncio
+    async def test_dao_calls_attributed_to_service_type(
+        self, timings: MethodTimings
+    ) -> None:
+        # Given
+        dao = Instrumented(FakeDAO(), "dao", timings=timings)
+        service = Instrumented(
+            FakeService(dao),
+            "service",
+            service_type="dine_in",
+            timings=timings,
+        )
+
+        # When
+        await service.list_pizzas()
+        await dao.get_all()
+
+        # Then
+        entries = {
+            (entry["layer"], entry["method"], entry["service_type"]): entry
+            for entry in timings.snapshot()
+        }
+        assert entries[("service", "list_pizzas", "dine_in")]["calls"] == 1
+        assert entries[("dao", "get_all", "dine_in")]["rows"] == 2
+        assert entries[("dao", "get_all", "")]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_counted(self, timings: MethodTimings) -> None:
+        # Given
+        dao = Instrumented(FakeDAO(), "dao", timings=timings)
+
+        # When
+        with pytest.raises(RuntimeError):
+            await dao.get_by_id("1")
+
+        # Then
+        [entry] = timings.snapshot()
+        assert entry["component"] == "FakeDAO"
+        assert entry["errors"] == 1
+        assert entry["calls"] == 1
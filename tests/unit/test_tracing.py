@@ -0,0 +1,178 @@
+import json
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import SpanKind, StatusCode
+
+from layered_architecture.api.middlewares import TracingMiddleware
+from layered_architecture.db.uow import SQLAUnitOfWork
+from layered_architecture.observability import (
+    FileSpanExporter,
+    create_tracer_provider,
+    instrument,
+    tracer,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class FakeOrderService:
+    def __init__(self, uow: SQLAUnitOfWork) -> None:
+        self.uow = uow
+
+    async def update_order(self, order_id: str) -> Mock:
+        async with self.uow:
+            if order_id == "0":
+                raise ValueError("invalid order")
+            return Mock(items=[1, 2, 3])
+
+
+@pytest.fixture(scope="session")
+def global_exporter() -> Iterator[InMemorySpanExporter]:
+    # The global provider can only be set once per process
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    yield exporter
+    provider.shutdown()
+
+
+@pytest.fixture
+def exporter(
+    global_exporter: InMemorySpanExporter,
+) -> Iterator[InMemorySpanExporter]:
+    global_exporter.clear()
+    yield global_exporter
+    global_exporter.clear()
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    db = Mock(info={}, commit=AsyncMock(), rollback=AsyncMock())
+    service = instrument(
+        FakeOrderService(SQLAUnitOfWork(db)),
+        "service",
+        service_type="delivery",
+    )
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
+    @app.patch("/orders/{order_id}")
+    async def update_order(order_id: str) -> dict[str, str]:
+        await service.update_order(order_id)
+        return {"id": order_id}
+
+    return app
+
+
+async def patch_order(app: FastAPI, order_id: str) -> httpx.Response:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://test",
+    ) as client:
+        return await client.patch(
+            f"/orders/{order_id}",
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+        )
+
+
+class TestTracerProvider:
+    def test_new_traces_sampled_at_ratio(self) -> None:
+        # Given
+        unsampled, sampled = InMemorySpanExporter(), InMemorySpanExporter()
+        providers = [
+            create_tracer_provider(unsampled, "pizzeria", 0.0),
+            create_tracer_provider(sampled, "pizzeria", 1.0),
+        ]
+
+        # When
+        for provider in providers:
+            with provider.get_tracer("test").start_as_current_span("order"):
+                pass
+            provider.force_flush()
+
+        # Then
+        assert unsampled.get_finished_spans() == ()
+        [span] = sampled.get_finished_spans()
+        assert span.resource.attributes["service.name"] == "pizzeria"
+
+    def test_file_exporter_writes_json_lines(self, tmp_path: Path) -> None:
+        # Given
+        path = tmp_path / "traces.ndjson"
+        provider = create_tracer_provider(
+            FileSpanExporter(str(path)), "pizzeria"
+        )
+
+        # When
+        with provider.get_tracer("test").start_as_current_span("create"):
+            pass
+        provider.shutdown()
+
+        # Then
+        [line] = path.read_text().splitlines()
+        span = json.loads(line)
+        assert span["name"] == "create"
+        assert span["resource"]["attributes"]["service.name"] == "pizzeria"
+
+
+class TestTracingMiddleware:
+    @pytest.mark.asyncio
+    async def test_request_service_and_uow_spans(
+        self, app: FastAPI, exporter: InMemorySpanExporter
+    ) -> None:
+        # When
+        await patch_order(app, "42")
+
+        # Then
+        uow, service, request = exporter.get_finished_spans()
+        assert request.name == "PATCH /orders/{order_id}"
+        assert request.kind == SpanKind.SERVER
+        assert request.parent is not None
+        assert request.parent.span_id == int(PARENT_ID, 16)
+        assert request.attributes is not None
+        assert request.attributes["http.response.status_code"] == 200
+        assert service.name == "FakeOrderService.update_order"
+        assert service.parent == request.context
+        assert service.attributes == {
+            "layer": "service",
+            "service.type": "delivery",
+            "order.id": "42",
+            "db.rows": 1,
+            "order.item_count": 3,
+        }
+        assert uow.name == "SQLAUnitOfWork"
+        assert uow.parent == service.context
+        assert {
+            span.context.trace_id for span in exporter.get_finished_spans()
+        } == {int(TRACE_ID, 16)}
+
+    @pytest.mark.asyncio
+    async def test_failures_mark_spans_as_errors(
+        self, app: FastAPI, exporter: InMemorySpanExporter
+    ) -> None:
+        # When
+        response = await patch_order(app, "0")
+
+        # Then
+        assert response.status_code == 500
+        spans = exporter.get_finished_spans()
+        assert [span.name for span in spans] == [
+            "SQLAUnitOfWork",
+            "FakeOrderService.update_order",
+            "PATCH /orders/{order_id}",
+        ]
+        assert {span.status.status_code for span in spans} == {
+            StatusCode.ERROR
+        }
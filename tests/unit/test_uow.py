@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from layered_architecture.db.uow import SQLAReadOnlyUnitOfWork, SQLAUnitOfWork
+
+
+@pytest.fixture
+def mock_db() -> Mock:
+    db = Mock()
+    db.info = {}
+    db.in_transaction.return_value = False
+    db.connection = AsyncMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    return db
+
+
+class TestSQLAUnitOfWork:
+    @pytest.mark.asyncio
+    async def test_commits_on_success(self, mock_db: Mock) -> None:
+        # When
+        async with SQLAUnitOfWork(mock_db):
+            pass
+
+        # Then
+        mock_db.commit.assert_awaited_once()
+        mock_db.rollback.assert_not_awaited()
+
+
+class TestSQLAReadOnlyUnitOfWork:
+    @pytest.mark.asyncio
+    async def test_begins_read_only_and_rolls_back(
+        self, mock_db: Mock
+    ) -> None:
+        # When
+        async with SQLAReadOnlyUnitOfWork(mock_db):
+            pass
+
+        # Then
+        mock_db.connection.assert_awaited_once_with(
+            execution_options={"postgresql_readonly": True}
+        )
+        mock_db.commit.assert_not_awaited()
+        mock_db.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_joins_open_transaction_without_ending_it(
+        self, mock_db: Mock
+    ) -> None:
+        # Given
+        mock_db.in_transaction.return_value = True
+
+        # When
+        async with SQLAReadOnlyUnitOfWork(mock_db):
+            pass
+
+        # Then
+        mock_db.connection.assert_not_awaited()
+        mock_db.commit.assert_not_awaited()
+        mock_db.rollback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rolls_back_joined_transaction_on_error(
+        self, mock_db: Mock
+    ) -> None:
+        # Given
+        mock_db.in_transaction.return_value = True
+
+        # When
+        with pytest.raises(ValueError):
+            async with SQLAReadOnlyUnitOfWork(mock_db):
+                raise ValueError("boom")
+
+        # Then
+        mock_db.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ends_transaction_begun_ahead_of_entering(
+        self, mock_db: Mock
+    ) -> None:
+        # Given
+        uow = SQLAReadOnlyUnitOfWork(mock_db)
+        await uow.begin()
+        mock_db.in_transaction.return_value = True
+
+        # When
+        async with uow:
+            pass
+
+        # Then
+        mock_db.connection.assert_awaited_once()
+        mock_db.rollback.assert_awaited_once()
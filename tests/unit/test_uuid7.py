@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from layered_architecture.db.models.mixins import uuid7, uuid7_time
+
+MOMENT = datetime(2025, 6, 1, 19, 30, 0, 123456, tzinfo=timezone.utc)
+
+
+class TestUUID7:
+    def test_embeds_the_time_to_the_millisecond(self) -> None:
+        # When
+        value = uuid7(at=MOMENT, random=42)
+
+        # Then
+        assert (value.version, value.variant) == (7, "specified in RFC 4122")
+        assert uuid7_time(value) == MOMENT.replace(microsecond=123000)
+        assert uuid7(at=MOMENT, random=42) == value
+        assert uuid7_time(uuid4()) is None
+
+    def test_sorts_by_time(self) -> None:
+        # Given
+        moments = [MOMENT + timedelta(microseconds=300 * i) for i in range(5)]
+
+        # When
+        values = [uuid7(at=moment) for moment in reversed(moments)]
+
+        # Then
+        assert sorted(values) == values[::-1]